@@ -0,0 +1,182 @@
+"""
+Benchmark for owl.text.html_text.
+Measures throughput (MB/s of HTML) and peak memory of every installed
+extraction backend, the streaming extractors and the previous approaches
+(BeautifulSoup html.parser, html2text) on the fixture corpus.
+
+Usage:
+    python benchmarks/html_text/benchmark.py [--repeat 20] [--runs 5] [--no-memory]
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from owl.text.html_text import available_backends, etree, html_to_text, iter_html_text  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def legacy_bs4(html: str) -> str:
+    """The extraction previously done inline by BrowserToolkit and NewsClient."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    for script in soup(["script", "style"]):
+        script.extract()
+    text = soup.get_text()
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    return " ".join(chunk for chunk in chunks if chunk)
+
+
+def legacy_html2text(html: str) -> str:
+    """The extraction previously done by the SEC toolkit."""
+    import html2text
+
+    h = html2text.HTML2Text()
+    h.ignore_links = False
+    return h.handle(html)
+
+
+def stream(backend: str) -> Callable[[str], str]:
+    def run(html: str) -> str:
+        data = html.encode("utf-8")
+        chunks = (data[i:i + STREAM_CHUNK_SIZE] for i in range(0, len(data), STREAM_CHUNK_SIZE))
+        return "\n".join(iter_html_text(chunks, backend=backend))
+    return run
+
+
+def candidates() -> Dict[str, Callable[[str], str]]:
+    """Return every extractor that can run in this environment."""
+    runners: Dict[str, Callable[[str], str]] = {}
+    for backend in available_backends():
+        runners[backend] = lambda html, backend=backend: html_to_text(html, backend=backend)
+    if etree is not None:
+        runners["stream-lxml"] = stream("lxml")
+    runners["stream-stdlib"] = stream("stdlib")
+    try:
+        import bs4  # noqa: F401
+        runners["legacy-bs4"] = legacy_bs4
+    except ImportError:
+        pass
+    try:
+        import html2text  # noqa: F401
+        runners["legacy-html2text"] = legacy_html2text
+    except ImportError:
+        pass
+    return runners
+
+
+def load_fixture(name: str, repeat: int) -> str:
+    """Load one fixture, repeated to simulate a larger document."""
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read() * repeat
+
+
+def load_corpus(repeat: int) -> Dict[str, str]:
+    """Load every fixture."""
+    names = sorted(name for name in os.listdir(FIXTURES_DIR) if name.endswith(".html"))
+    return {name: load_fixture(name, repeat) for name in names}
+
+
+def current_rss_mb() -> float:
+    """Current resident set size, falling back to the peak where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except OSError:
+        return peak_rss_mb()
+
+
+def reset_peak_rss():
+    """Reset the kernel's peak RSS counter (Linux only)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size since the last reset_peak_rss()."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1e3
+    except OSError:
+        pass
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS, and is never reset
+    scale = 1e6 if sys.platform == "darwin" else 1e3
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def throughput(runner: Callable[[str], str], html: str, runs: int) -> float:
+    """Best-of-``runs`` throughput in MB/s."""
+    size_mb = len(html.encode("utf-8")) / 1e6
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        runner(html)
+        best = min(best, time.perf_counter() - start)
+    return size_mb / best
+
+
+def peak_memory_mb(name: str, fixture: str, repeat: int) -> float:
+    """Peak RSS growth of one extraction, measured in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, __file__, "--child", name, fixture, "--repeat", str(repeat)],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout)["peak_mb"]
+
+
+def run_child(name: str, fixture: str, repeat: int):
+    runner = candidates()[name]
+    runner("<p>warm up</p>")
+    html = load_fixture(fixture, repeat)
+    baseline = current_rss_mb()
+    reset_peak_rss()
+    runner(html)
+    print(json.dumps({"peak_mb": max(peak_rss_mb() - baseline, 0.0)}))
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20, help="Times each fixture is repeated")
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs per measurement (best is kept)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the peak memory measurements")
+    parser.add_argument("--child", nargs=2, metavar=("EXTRACTOR", "FIXTURE"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        run_child(args.child[0], args.child[1], args.repeat)
+        return
+
+    corpus = load_corpus(args.repeat)
+    runners = candidates()
+    header = f"{'fixture':<20} {'size MB':>8}  {'extractor':<18} {'MB/s':>8}"
+    if not args.no_memory:
+        header += f" {'peak MB':>8}"
+    print(header)
+    print("-" * len(header))
+    for fixture, html in corpus.items():
+        size_mb = len(html.encode("utf-8")) / 1e6
+        for name, runner in runners.items():
+            line = f"{fixture:<20} {size_mb:>8.2f}  {name:<18} {throughput(runner, html, args.runs):>8.1f}"
+            if not args.no_memory:
+                line += f" {peak_memory_mb(name, fixture, args.repeat):>8.1f}"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
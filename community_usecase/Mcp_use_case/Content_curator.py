@@ -7,10 +7,11 @@ from typing import List, Dict
 from dotenv import load_dotenv
 
 from camel.models import ModelFactory
-from camel.toolkits import FunctionTool, MCPToolkit
+from camel.toolkits import FunctionTool
 from camel.types import ModelPlatformType, ModelType
 from camel.logger import set_log_level
 
+from owl.router import MCPConnectionManager
 from owl.utils.enhanced_role_playing import OwlRolePlaying, arun_society
 
 import pathlib
@@ -66,10 +67,14 @@ async def construct_society(
 
 async def main():
     config_path = Path(__file__).parent / "mcp_servers_config.json"
-    mcp_toolkit = MCPToolkit(config_path=str(config_path))
+    # Launch all MCP servers concurrently, each with its own startup deadline
+    mcp_manager = MCPConnectionManager(
+        config_path=str(config_path),
+        connect_timeout=15,
+    )
 
     try:
-        await mcp_toolkit.connect()
+        ready_servers = await mcp_manager.start()
 
         default_task = (
             "Content Curation Task:\n"
@@ -92,9 +97,11 @@ async def main():
 
         task = sys.argv[1] if len(sys.argv) > 1 else default_task
 
-        # Connect to all MCP toolkits
-        tools = [*mcp_toolkit.get_tools()]
+        # Start with the tools of the ready servers; slower servers' tools
+        # are attached to the assistant as soon as they connect
+        tools = [*mcp_manager.get_tools(ready_servers)]
         society = await construct_society(task, tools)
+        mcp_manager.attach_late_tools(society.assistant_agent, ready_servers)
         
         try:
             # Add error handling for the society execution
@@ -113,7 +120,12 @@ async def main():
             raise
 
     finally:
-        # Cleanup
+        # Cleanup: stop the MCP supervisors before cancelling leftover tasks
+        try:
+            await mcp_manager.stop()
+        except Exception as e:
+            print(f"Cleanup error (can be ignored): {e}")
+
         await asyncio.sleep(1)
         tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
         for task in tasks:
@@ -122,11 +134,6 @@ async def main():
                 await task
             except asyncio.CancelledError:
                 pass
-        
-        try:
-            await mcp_toolkit.disconnect()
-        except Exception as e:
-            print(f"Cleanup error (can be ignored): {e}")
 
 if __name__ == "__main__":
     try:
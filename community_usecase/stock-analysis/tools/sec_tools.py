@@ -4,8 +4,39 @@ from camel.toolkits.base import BaseToolkit
 from camel.toolkits.function_tool import FunctionTool
 from camel.utils import api_keys_required, dependencies_required
 import requests
-import html2text
 import re
+from owl.text import html_to_text, iter_html_text
+
+# Everything except English letters, dollar signs, digits and whitespace
+NON_TEXT_PATTERN = re.compile(r"[^a-zA-Z$0-9\s\n]")
+
+# Filings up to this size (as sent) are read whole and parsed in one pass,
+# which is about 3x faster; larger or unsized ones are parsed while they
+# download so the whole document is never held in memory.
+STREAM_THRESHOLD_BYTES = 16 * 1024 * 1024
+
+
+def _filing_to_text(response: requests.Response) -> str:
+    r"""Converts a filing response to cleaned plain text.
+
+    Args:
+        response (requests.Response): A response opened with ``stream=True``.
+
+    Returns:
+        str: The filing text, keeping only alphanumeric characters, dollar
+            signs, spaces and newlines.
+    """
+    size = response.headers.get("Content-Length", "")
+    if size.isdigit() and int(size) <= STREAM_THRESHOLD_BYTES:
+        text = html_to_text(response.content.decode("utf-8", errors="replace"), strip_boilerplate=False)
+        lines = text.split("\n")
+    else:
+        lines = iter_html_text(
+            response.iter_content(chunk_size=65536),
+            strip_boilerplate=False,
+            encoding="utf-8",
+        )
+    return "\n".join(NON_TEXT_PATTERN.sub("", line) for line in lines)
 
 class SECToolkit(BaseToolkit):
     r"""A class representing a toolkit for SEC filings analysis.
@@ -80,14 +111,10 @@ class SECToolkit(BaseToolkit):
                 "Accept-Encoding": "gzip, deflate",
                 "Host": "www.sec.gov"
             }
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            h = html2text.HTML2Text()
-            h.ignore_links = False
-            text = h.handle(response.content.decode("utf-8"))
-
-            text = re.sub(r"[^a-zA-Z$0-9\s\n]", "", text)
-            return text
+            # Closing the response returns its connection to the pool, also when parsing fails
+            with requests.get(url, headers=headers, stream=True) as response:
+                response.raise_for_status()
+                return _filing_to_text(response)
         except requests.exceptions.HTTPError as e:
             print(f"HTTP error occurred: {e}")
             return None
@@ -155,15 +182,9 @@ class SECToolkit(BaseToolkit):
                 "Accept-Encoding": "gzip, deflate",
                 "Host": "www.sec.gov"
             }
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()  # Raise an exception for HTTP errors
-            h = html2text.HTML2Text()
-            h.ignore_links = False
-            text = h.handle(response.content.decode("utf-8"))
-
-            # Removing all non-English words, dollar signs, numbers, and newlines from text
-            text = re.sub(r"[^a-zA-Z$0-9\s\n]", "", text)
-            return text
+            with requests.get(url, headers=headers, stream=True) as response:
+                response.raise_for_status()  # Raise an exception for HTTP errors
+                return _filing_to_text(response)
         except requests.exceptions.HTTPError as e:
             print(f"HTTP error occurred: {e}")
             return None
@@ -83,8 +83,8 @@ from camel.models import ModelFactory
 from camel.toolkits import FunctionTool
 from camel.types import ModelPlatformType, ModelType
 from camel.logger import set_log_level
-from camel.toolkits import MCPToolkit
 
+from owl.router import MCPConnectionManager
 from owl.utils.enhanced_role_playing import OwlRolePlaying, arun_society
 
 import pathlib
@@ -142,10 +142,15 @@ async def construct_society(
 
 async def main():
     config_path = Path(__file__).parent / "mcp_servers_config.json"
-    mcp_toolkit = MCPToolkit(config_path=str(config_path))
+    # Start every MCP server concurrently; a slow server (e.g. the npx
+    # Playwright server) no longer delays the others
+    mcp_manager = MCPConnectionManager(
+        config_path=str(config_path),
+        connect_timeout=15,
+    )
 
     try:
-        await mcp_toolkit.connect()
+        ready_servers = await mcp_manager.start()
 
         # Default task
         default_task = (
@@ -157,16 +162,18 @@ async def main():
         # Override default task if command line argument is provided
         task = sys.argv[1] if len(sys.argv) > 1 else default_task
 
-        # Connect to all MCP toolkits
-        tools = [*mcp_toolkit.get_tools()]
+        # Use the tools of the servers that are ready now, and attach the
+        # tools of slower servers to the assistant once they come up
+        tools = [*mcp_manager.get_tools(ready_servers)]
         society = await construct_society(task, tools)
+        mcp_manager.attach_late_tools(society.assistant_agent, ready_servers)
         answer, chat_history, token_count = await arun_society(society)
         print(f"\033[94mAnswer: {answer}\033[0m")
 
     finally:
         # Make sure to disconnect safely after all operations are completed.
         try:
-            await mcp_toolkit.disconnect()
+            await mcp_manager.stop()
         except Exception:
             print("Disconnect failed")
 
@@ -3,27 +3,36 @@ import anthropic
 import openai
 from dotenv import load_dotenv
 from pathlib import Path
-from typing import List, Optional, Dict, Any, Union
+from typing import AsyncIterator, List, Optional, Dict, Any, Union
 import asyncio
 import sys
 import json
 import logging
-from camel.toolkits import MCPToolkit, FunctionTool, SearchToolkit
-from camel.models import ModelFactory
+import time
+from concurrent.futures import ThreadPoolExecutor
+from camel.toolkits import FunctionTool, SearchToolkit
 from camel.types import ModelPlatformType, ModelType
 from camel.agents import ChatAgent
 from camel.messages.base import BaseMessage
 from camel.logger import set_log_level
 from owl.toolkits.news_toolkit import NewsToolkit
+from owl.router.query_router import DIRECT_ROUTE, NEWS_ROUTE, OWL_ROUTE, RouteDecision
+from owl.router import (
+    AdmissionController,
+    AdmissionRejected,
+    MCPConnectionManager,
+    ModelPool,
+    QueryRouter,
+    ResponseCache,
+    SQLiteCacheBackend,
+    make_cache_key,
+)
 
 # Add the current directory to the Python path
 current_dir = os.path.dirname(os.path.abspath(__file__))
 if current_dir not in sys.path:
     sys.path.insert(0, current_dir)
 
-# Import NewsToolkit after adding the current directory to sys.path
-from owl.toolkits.news_toolkit import NewsToolkit
-
 # Load the .env file
 load_dotenv()
 
@@ -36,7 +45,7 @@ logger = logging.getLogger(__name__)
 
 # Try to import owl.utils, provide fallback if not available
 try:
-    from owl.utils.enhanced_role_playing import OwlRolePlaying, arun_society
+    from owl.utils.enhanced_role_playing import OwlRolePlaying, arun_society, astream_society
     OWL_AVAILABLE = True
     logger.info("Successfully imported owl.utils.enhanced_role_playing")
 except ImportError:
@@ -60,6 +69,11 @@ except ImportError:
         logger.info("Using fallback implementation for arun_society")
         return f"Response to: {society.task_prompt}", [], 0
 
+    async def astream_society(society):
+        # Simple fallback implementation
+        response, _, _ = await arun_society(society)
+        yield {"round": 0, "user": society.task_prompt, "assistant": response, "tool_calls": []}
+
 class MCPLLMRouter:
     def __init__(
         self,
@@ -76,7 +90,18 @@ class MCPLLMRouter:
         use_mcp: bool = True,
         cache_responses: bool = True,
         timeout: int = 30,  # Reduced default timeout
-        initialize_servers: bool = False  # New parameter to control server initialization
+        initialize_servers: bool = False,  # New parameter to control server initialization
+        cache_max_entries: int = 256,
+        cache_ttl: Optional[float] = 3600,
+        news_cache_ttl: float = 300,
+        cache_path: Optional[str] = None,
+        blocking_workers: int = 8,
+        max_concurrency: int = 8,
+        max_queue_depth: int = 64,
+        provider_rate_limits: Optional[Dict[str, Any]] = None,
+        query_router: Optional[QueryRouter] = None,
+        lazy_mcp_servers: Optional[List[str]] = None,
+        mcp_health_check_interval: float = 60
     ):
         """Initialize MCP LLM Router with enhanced error handling and configuration."""
         logger.info(f"Initializing MCPLLMRouter with model: {model}, use_mcp: {use_mcp}")
@@ -85,12 +110,26 @@ class MCPLLMRouter:
         self.cache_responses = cache_responses
         self.timeout = timeout
         self.initialize_servers = initialize_servers
-        self.response_cache = {} if cache_responses else None
+        self.response_cache = None
+        # News answers go stale quickly, so they get a much shorter lifetime
+        self.news_cache_ttl = news_cache_ttl
+        if cache_responses:
+            # Optional SQLite backend keeps answers across restarts and shares them between processes
+            cache_backend = SQLiteCacheBackend(cache_path) if cache_path else None
+            self.response_cache = ResponseCache(
+                max_entries=cache_max_entries,
+                ttl=cache_ttl,
+                backend=cache_backend
+            )
         
         # Use absolute path for MCP directory
         self.mcp_path = mcp_path or os.path.abspath(os.path.join(os.path.dirname(__file__), "mcp"))
         self.mcp_config_path = mcp_config_path or os.path.join(os.path.dirname(__file__), "mcp_servers_config.json")
         self.mcp_toolkit = None
+        self.mcp_manager = None
+        # Rarely used servers are only started the first time MCP tools are needed
+        self.lazy_mcp_servers = lazy_mcp_servers if lazy_mcp_servers is not None else ["github-repo"]
+        self.mcp_health_check_interval = mcp_health_check_interval
         self.user_role_name = user_role_name
         self.assistant_role_name = assistant_role_name
         self.output_language = output_language
@@ -101,23 +140,48 @@ class MCPLLMRouter:
         self.github_repo = github_repo or os.getenv("GITHUB_REPO")
         self.github_branch = github_branch or os.getenv("GITHUB_BRANCH")
 
+        # Bounded pool for the blocking work left on the request path (RSS fetches, sync SDK fallbacks)
+        self.executor = ThreadPoolExecutor(max_workers=blocking_workers, thread_name_prefix="mcp-router")
+
+        # Local classifier deciding between the news, direct and OWL paths
+        self.query_router = query_router or QueryRouter()
+
+        # Time-to-first-byte metrics for streamed responses
+        self.stream_metrics = {"streams": 0, "ttfb_total": 0.0, "last_ttfb": None}
+
+        # Admission control for concurrent serving (see chat_many / submit)
+        self.admission = AdmissionController(
+            max_concurrency=max_concurrency,
+            max_queue_depth=max_queue_depth,
+            rate_limits=provider_rate_limits
+        )
+
         # Initialize API clients
         self._initialize_api_clients()
 
+        # Model backends are created once and shared by every society
+        self.model_pool = ModelPool()
+        self._model_spec = None
+        self._model_spec_resolved = False
+
         # Add MCP path to system path if using MCP
         if self.use_mcp and self.mcp_path not in sys.path:
             sys.path.append(self.mcp_path)
             logger.info(f"Added MCP path to system path: {self.mcp_path}")
 
         # Initialize NewsToolkit
-        self.news_toolkit = NewsToolkit()
+        self.news_toolkit = NewsToolkit(executor=self.executor)
 
     def _initialize_api_clients(self):
-        """Initialize API clients with error handling."""
+        """Initialize async API clients with error handling."""
+        self.anthropic_client = None
+        self.openai_client = None
+        self.openai_direct_client = None
         try:
             # Load API keys
             anthropic_key = os.getenv("ANTHROPIC_API_KEY")
             groq_key = os.getenv("GROQ_API_KEY")
+            openai_key = os.getenv("OPENAI_API_KEY")
 
             if not anthropic_key and not groq_key:
                 raise ValueError("No API keys found. Please set ANTHROPIC_API_KEY or GROQ_API_KEY in .env file")
@@ -125,17 +189,24 @@ class MCPLLMRouter:
             # Initialize Anthropic client
             if anthropic_key:
                 logger.info("Initializing Anthropic client...")
-                self.anthropic_client = anthropic.Anthropic(api_key=anthropic_key)
+                self.anthropic_client = anthropic.AsyncAnthropic(api_key=anthropic_key)
                 logger.info("Anthropic client initialized successfully")
 
             # Initialize Groq client
             if groq_key:
                 logger.info("Initializing Groq client...")
-                self.openai_client = openai
-                self.openai_client.api_key = groq_key
-                self.openai_client.api_base = "https://api.groq.com/openai/v1"
+                self.openai_client = openai.AsyncOpenAI(
+                    api_key=groq_key,
+                    base_url="https://api.groq.com/openai/v1"
+                )
                 logger.info("Groq client initialized successfully")
 
+            # Initialize OpenAI client
+            if openai_key:
+                logger.info("Initializing OpenAI client...")
+                self.openai_direct_client = openai.AsyncOpenAI(api_key=openai_key)
+                logger.info("OpenAI client initialized successfully")
+
         except Exception as e:
             logger.error(f"Error initializing API clients: {str(e)}", exc_info=True)
             raise
@@ -145,6 +216,9 @@ class MCPLLMRouter:
         if not self.use_mcp:
             logger.info("MCP toolkit initialization skipped (use_mcp=False)")
             return
+        if self.mcp_manager is not None:
+            logger.info("MCP already initialized")
+            return
             
         try:
             logger.info("Creating MCP configuration...")
@@ -155,25 +229,35 @@ class MCPLLMRouter:
             # Save configuration
             self._save_mcp_config(mcp_config)
             
-            logger.info("Initializing MCP toolkit...")
-            # Initialize toolkit with timeout
-            self.mcp_toolkit = MCPToolkit(config_path=str(self.mcp_config_path))
+            if self.mcp_manager is None:
+                logger.info("Initializing MCP connection manager...")
+                self.mcp_manager = MCPConnectionManager(
+                    config_path=str(self.mcp_config_path),
+                    connect_timeout=self.timeout,
+                    health_check_interval=self.mcp_health_check_interval,
+                    lazy_servers=self.lazy_mcp_servers
+                )
             
             if self.initialize_servers:
-                logger.info("Connecting to MCP toolkit...")
-                try:
-                    # Use asyncio.wait_for instead of asyncio.timeout for compatibility
-                    await asyncio.wait_for(self.mcp_toolkit.connect(), timeout=self.timeout)
-                    logger.info("MCP toolkit initialized and connected successfully")
-                except asyncio.TimeoutError:
-                    logger.warning("MCP toolkit connection timed out, continuing without server initialization")
+                await self._start_mcp_servers()
             else:
-                logger.info("Skipping server initialization as requested")
+                logger.info("Deferring MCP server connections until tools are first needed")
             
         except Exception as e:
             logger.error(f"Error initializing MCP: {str(e)}", exc_info=True)
             raise
 
+    async def _start_mcp_servers(self):
+        """Connect to the eager MCP servers in parallel, each with its own deadline."""
+        logger.info("Connecting to MCP servers...")
+        connected = await self.mcp_manager.start()
+        self.mcp_toolkit = self.mcp_manager.toolkit
+        logger.info(f"Connected MCP servers: {connected}")
+
+    def mcp_health(self) -> Dict[str, Any]:
+        """Return per-server MCP connection health."""
+        return self.mcp_manager.stats() if self.mcp_manager else {}
+
     def _create_mcp_config(self) -> Dict[str, Any]:
         """Create MCP configuration with required servers."""
         logger.info("Creating MCP configuration with required servers...")
@@ -205,8 +289,16 @@ class MCPLLMRouter:
         return config
 
     def _save_mcp_config(self, config: Dict[str, Any]):
-        """Save MCP configuration to file."""
+        """Save MCP configuration to file, skipping the write when it is unchanged."""
         try:
+            if os.path.exists(self.mcp_config_path):
+                try:
+                    with open(self.mcp_config_path) as f:
+                        if json.load(f) == config:
+                            logger.info("MCP configuration unchanged, skipping write")
+                            return
+                except ValueError:
+                    logger.warning("Existing MCP configuration is not valid JSON, rewriting it")
             logger.info(f"Saving MCP configuration to {self.mcp_config_path}...")
             with open(self.mcp_config_path, 'w') as f:
                 json.dump(config, f, indent=4)
@@ -217,58 +309,99 @@ class MCPLLMRouter:
 
     async def cleanup_mcp(self):
         """Cleanup MCP toolkit connections with error handling."""
-        if self.mcp_toolkit and self.use_mcp:
+        if self.mcp_manager and self.use_mcp:
             try:
-                logger.info("Disconnecting MCP toolkit...")
-                await self.mcp_toolkit.disconnect()
-                logger.info("MCP toolkit disconnected successfully")
+                logger.info("Disconnecting MCP servers...")
+                await self.mcp_manager.stop()
+                logger.info("MCP servers disconnected successfully")
             except Exception as e:
                 logger.error(f"Error disconnecting MCP toolkit: {str(e)}", exc_info=True)
 
-    def _create_models(self) -> Dict[str, Any]:
-        """Create models for the conversation with error handling."""
-        try:
-            logger.info("Creating models for conversation...")
+    def _resolve_model_spec(self):
+        """Pick the model platform and type once, based on the configured model and available API keys."""
+        if self._model_spec_resolved:
+            return self._model_spec
             
-            # Check which API keys are available
-            anthropic_key = os.getenv("ANTHROPIC_API_KEY")
-            groq_key = os.getenv("GROQ_API_KEY")
-            openai_key = os.getenv("OPENAI_API_KEY")
+        # Check which API keys are available
+        anthropic_key = os.getenv("ANTHROPIC_API_KEY")
+        groq_key = os.getenv("GROQ_API_KEY")
+        openai_key = os.getenv("OPENAI_API_KEY")
+        
+        # Determine which model platform to use
+        if self.model == "anthropic" and anthropic_key:
+            self._model_spec = (ModelPlatformType.ANTHROPIC, ModelType.CLAUDE_3_OPUS)
+            logger.info("Using Anthropic Claude 3 Opus model")
+        elif self.model == "groq" and groq_key:
+            self._model_spec = (ModelPlatformType.GROQ, ModelType.QWEN_2_5_32B)
+            logger.info("Using Groq Qwen 2.5 32B model")
+        elif openai_key:
+            self._model_spec = (ModelPlatformType.OPENAI, ModelType.GPT_4O)
+            logger.info("Using OpenAI GPT-4 model")
+        else:
+            self._model_spec = None
             
-            # Determine which model platform to use
-            if self.model == "anthropic" and anthropic_key:
-                platform = ModelPlatformType.ANTHROPIC
-                model_type = ModelType.CLAUDE_3_OPUS
-                logger.info("Using Anthropic Claude 3 Opus model")
-            elif self.model == "groq" and groq_key:
-                platform = ModelPlatformType.GROQ
-                model_type = ModelType.QWEN_2_5_32B
-                logger.info("Using Groq Qwen 2.5 32B model")
-            elif openai_key:
-                platform = ModelPlatformType.OPENAI
-                model_type = ModelType.GPT_4O
-                logger.info("Using OpenAI GPT-4 model")
-            else:
+        self._model_spec_resolved = True
+        return self._model_spec
+
+    def _create_models(self) -> Dict[str, Any]:
+        """Get the pooled models for the conversation with error handling."""
+        try:
+            model_spec = self._resolve_model_spec()
+            if not model_spec:
                 # Fallback to direct API calls if no compatible model is available
                 logger.warning("No compatible model found, will use direct API calls")
                 return None
                 
+            platform, model_type = model_spec
+            # Both roles share one backend; conversation state lives in each ChatAgent
+            backend = self.model_pool.get(platform, model_type, {"temperature": 0})
             return {
-                "user": ModelFactory.create(
-                    model_platform=platform,
-                    model_type=model_type,
-                    model_config_dict={"temperature": 0},
-                ),
-                "assistant": ModelFactory.create(
-                    model_platform=platform,
-                    model_type=model_type,
-                    model_config_dict={"temperature": 0},
-                ),
+                "user": backend,
+                "assistant": backend,
             }
         except Exception as e:
             logger.error(f"Error creating models: {str(e)}", exc_info=True)
             return None
 
+    async def warm_models(self):
+        """Create the model backends before the first request arrives."""
+        model_spec = self._resolve_model_spec()
+        if not model_spec:
+            return
+        platform, model_type = model_spec
+        logger.info("Warming model backends...")
+        await asyncio.to_thread(self.model_pool.warm, platform, model_type, {"temperature": 0})
+
+    def _cache_key(self, prompt: str, namespace: str, tools: Optional[List[str]] = None) -> str:
+        """Build the response cache key for a prompt on a given router path."""
+        return make_cache_key(
+            prompt,
+            namespace=namespace,
+            model=self.model,
+            language=self.output_language,
+            tools=tools
+        )
+
+    def _get_cached_response(self, key: str) -> Optional[str]:
+        """Return a cached response, or None when caching is disabled or the key is missing."""
+        if self.response_cache is None:
+            return None
+        response = self.response_cache.get(key)
+        if response is not None:
+            logger.info("Returning cached response")
+        return response
+
+    def _cache_response(self, key: str, response: str, ttl: Optional[float] = None):
+        """Store a successful response in the cache, optionally with its own TTL in seconds."""
+        if self.response_cache is not None and response:
+            self.response_cache.set(key, response, ttl=ttl)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Return response cache metrics such as the hit rate."""
+        if self.response_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.response_cache.stats()}
+
     async def chat_with_mcp(self, prompt, use_owl=True):
         """
         Chat with the MCP LLM Router.
@@ -281,36 +414,255 @@ class MCPLLMRouter:
             The model's response
         """
         try:
-            # Check if this is a news-related query
-            if "news" in prompt.lower() or "latest" in prompt.lower() or "recent" in prompt.lower():
+            decision = self._route_prompt(prompt, use_owl)
+            started = time.monotonic()
+            if decision.route == NEWS_ROUTE:
                 logger.info("Detected news query, using NewsToolkit...")
-                # Create a new instance of NewsToolkit for each query to avoid state issues
-                news_toolkit = NewsToolkit()
-                # Set the appropriate LLM client based on the model
-                if self.model == "anthropic":
-                    news_toolkit.llm_client = self.anthropic_client
-                elif self.model == "groq":
-                    news_toolkit.llm_client = self.openai_client
-                else:
-                    # Fallback to direct API call for news queries
-                    logger.info("Using direct API call for news query...")
-                    return await self._direct_api_call(prompt)
-                
-                result = news_toolkit.process_news_query(prompt)
-                return result["response"]
-                
-            # For other queries, use the standard approach
-            if use_owl and OWL_AVAILABLE:
+                response = await self._chat_with_news(prompt)
+            elif decision.route == OWL_ROUTE:
                 logger.info("Using OWL for role-playing...")
-                return await self._chat_with_owl(prompt)
+                response = await self._chat_with_owl(prompt)
             else:
                 logger.info("Using direct API call...")
-                return await self._direct_api_call(prompt)
+                response = await self._direct_api_call(prompt)
+            self.query_router.record_latency(decision.route, time.monotonic() - started)
+            return response
                 
         except Exception as e:
             logger.error(f"Error in chat_with_mcp: {str(e)}", exc_info=True)
             return f"An error occurred: {str(e)}"
             
+    def _route_prompt(self, prompt: str, use_owl: bool = True):
+        """Pick the news, direct or OWL path for a prompt with the query router."""
+        allowed_routes = [NEWS_ROUTE, DIRECT_ROUTE]
+        if use_owl and OWL_AVAILABLE:
+            allowed_routes.append(OWL_ROUTE)
+        return self.query_router.route(prompt, allowed_routes=allowed_routes)
+
+    def routing_stats(self) -> Dict[str, Any]:
+        """Return routing-decision metrics and per-route latency estimates."""
+        return self.query_router.stats()
+
+    async def _chat_with_news(self, prompt: str) -> str:
+        """Answer a news query with the NewsToolkit pipeline."""
+        # Set the appropriate LLM client based on the model
+        if self.model == "anthropic":
+            llm_client = self.anthropic_client
+        elif self.model == "groq":
+            llm_client = self.openai_client
+        else:
+            # Fallback to direct API call for news queries
+            logger.info("Using direct API call for news query...")
+            return await self._direct_api_call(prompt)
+        
+        cache_key = self._cache_key(prompt, "news")
+        cached = self._get_cached_response(cache_key)
+        if cached is not None:
+            return cached
+        
+        # Create a new instance of NewsToolkit for each query to avoid state issues
+        news_toolkit = NewsToolkit(executor=self.executor)
+        news_toolkit.llm_client = llm_client
+        result = await news_toolkit.aprocess_news_query(prompt)
+        self._cache_response(cache_key, result["response"], ttl=self.news_cache_ttl)
+        return result["response"]
+
+    async def stream_chat_with_mcp(self, prompt: str, use_owl: bool = True) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the response to a prompt as it is produced.
+        
+        The direct API path yields ``token`` events as text arrives; the OWL path yields
+        ``round`` and ``tool_call`` events after each society round. The stream always
+        ends with a ``final`` event carrying the full response and the time-to-first-byte.
+        
+        Args:
+            prompt: The user's prompt
+            use_owl: Whether to use OWL for role-playing
+            
+        Yields:
+            Event dictionaries with a ``type`` key
+        """
+        started = time.monotonic()
+        ttfb = None
+        
+        def mark_first_byte():
+            nonlocal ttfb
+            if ttfb is None:
+                ttfb = time.monotonic() - started
+                logger.info(f"Time to first byte: {ttfb:.3f}s")
+                
+        try:
+            decision = self._route_prompt(prompt, use_owl)
+            if decision.route == NEWS_ROUTE:
+                # The news pipeline has no incremental output, emit it as one chunk
+                response = await self._chat_with_news(prompt)
+                mark_first_byte()
+                yield {"type": "token", "text": response}
+            elif decision.route == OWL_ROUTE and self._create_models():
+                response = ""
+                async for event in self._stream_owl(prompt):
+                    mark_first_byte()
+                    if event["type"] == "round":
+                        response = event["assistant"]
+                    yield event
+            else:
+                chunks = []
+                async for text in self._stream_direct_api_call(prompt):
+                    mark_first_byte()
+                    chunks.append(text)
+                    yield {"type": "token", "text": text}
+                response = "".join(chunks).rstrip()
+        except Exception as e:
+            logger.error(f"Error in stream_chat_with_mcp: {str(e)}", exc_info=True)
+            response = f"An error occurred: {str(e)}"
+            mark_first_byte()
+            yield {"type": "error", "error": str(e)}
+            
+        mark_first_byte()
+        self.stream_metrics["streams"] += 1
+        self.stream_metrics["ttfb_total"] += ttfb
+        self.stream_metrics["last_ttfb"] = ttfb
+        yield {
+            "type": "final",
+            "text": response,
+            "ttfb": ttfb,
+            "elapsed": time.monotonic() - started
+        }
+
+    async def _stream_owl(self, prompt: str) -> AsyncIterator[Dict[str, Any]]:
+        """Run the OWL society and yield round and tool call events as each round finishes."""
+        cache_key = self._cache_key(prompt, "owl")
+        cached = self._get_cached_response(cache_key)
+        if cached is not None:
+            yield {"type": "round", "round": 0, "user": prompt, "assistant": cached}
+            return
+            
+        models = self._create_models()
+        society = OwlRolePlaying(
+            task_prompt=prompt,
+            with_task_specify=False,
+            user_role_name=self.user_role_name,
+            user_agent_kwargs={"model": models["user"]},
+            assistant_role_name=self.assistant_role_name,
+            assistant_agent_kwargs={"model": models["assistant"]},
+            output_language=self.output_language
+        )
+        
+        response = ""
+        async for round_data in astream_society(society):
+            for tool_call in round_data.get("tool_calls", []):
+                yield {"type": "tool_call", "round": round_data["round"], "tool_call": tool_call}
+            response = (round_data["assistant"] or "").rstrip().replace('\r\n', '\n')
+            yield {
+                "type": "round",
+                "round": round_data["round"],
+                "user": round_data["user"],
+                "assistant": response
+            }
+        self._cache_response(cache_key, response)
+
+    async def _stream_direct_api_call(self, prompt: str) -> AsyncIterator[str]:
+        """Stream text chunks from the LLM provider, serving cached responses in one chunk."""
+        cache_key = self._cache_key(prompt, "direct")
+        cached = self._get_cached_response(cache_key)
+        if cached is not None:
+            yield cached
+            return
+            
+        chunks = []
+        if self.model == "anthropic" and self.anthropic_client:
+            logger.info("Streaming from Anthropic API")
+            async with self.anthropic_client.messages.stream(
+                model="claude-3-opus-20240229",
+                max_tokens=1024,
+                messages=[{"role": "user", "content": prompt}]
+            ) as stream:
+                async for text in stream.text_stream:
+                    chunks.append(text)
+                    yield text
+        else:
+            if self.model == "groq" and self.openai_client:
+                logger.info("Streaming from Groq API")
+                client, model_name = self.openai_client, "qwen-2-5-32b"
+            elif self.openai_direct_client:
+                logger.info("Streaming from OpenAI API")
+                client, model_name = self.openai_direct_client, "gpt-4o"
+            else:
+                raise ValueError("No API keys available. Please set ANTHROPIC_API_KEY, GROQ_API_KEY, or OPENAI_API_KEY in your environment variables.")
+            stream = await client.chat.completions.create(
+                model=model_name,
+                messages=[{"role": "user", "content": prompt}],
+                stream=True
+            )
+            async for chunk in stream:
+                text = chunk.choices[0].delta.content if chunk.choices else None
+                if text:
+                    chunks.append(text)
+                    yield text
+                    
+        self._cache_response(cache_key, "".join(chunks).rstrip())
+
+    def stream_stats(self) -> Dict[str, Any]:
+        """Return time-to-first-byte metrics for streamed responses."""
+        streams = self.stream_metrics["streams"]
+        return {
+            "streams": streams,
+            "avg_ttfb": self.stream_metrics["ttfb_total"] / streams if streams else None,
+            "last_ttfb": self.stream_metrics["last_ttfb"]
+        }
+
+    async def submit(self, prompt: str, use_owl: bool = True) -> str:
+        """
+        Serve one prompt under admission control.
+        
+        Args:
+            prompt: The user's prompt
+            use_owl: Whether to use OWL for role-playing
+            
+        Returns:
+            The model's response
+            
+        Raises:
+            AdmissionRejected: If the router is saturated; callers should back off for
+                ``retry_after`` seconds (e.g. answer HTTP 503 behind a load balancer)
+        """
+        async with self.admission.admit(self.model):
+            return await self.chat_with_mcp(prompt, use_owl=use_owl)
+
+    async def chat_many(self, prompts: List[str], use_owl: bool = True) -> List[str]:
+        """
+        Serve many prompts concurrently over the shared MCP connections and model backends.
+        
+        The batch is admitted as a unit: it is refused as a whole when its prompts
+        do not fit in the wait queue, otherwise all of them wait for processing slots.
+        
+        Args:
+            prompts: The user prompts
+            use_owl: Whether to use OWL for role-playing
+            
+        Returns:
+            The responses, in the same order as the prompts. A batch rejected by
+            admission control gets a busy message for every prompt.
+        """
+        try:
+            reservation = self.admission.reserve(len(prompts), self.model)
+        except AdmissionRejected as e:
+            logger.warning(f"Rejected batch of {len(prompts)} prompts: {str(e)}")
+            return [f"The router is busy, please retry in {e.retry_after} seconds."] * len(prompts)
+            
+        async def serve(prompt: str) -> str:
+            async with self.admission.admit(reservation=reservation):
+                return await self.chat_with_mcp(prompt, use_owl=use_owl)
+                
+        try:
+            return await asyncio.gather(*(serve(prompt) for prompt in prompts))
+        finally:
+            reservation.release()
+
+    def load_status(self) -> Dict[str, Any]:
+        """Return load and backpressure information for health checks."""
+        return self.admission.stats()
+
     async def _chat_with_owl(self, prompt: str) -> str:
         """
         Chat with the OWL role-playing system.
@@ -321,6 +673,11 @@ class MCPLLMRouter:
         Returns:
             The model's response
         """
+        cache_key = self._cache_key(prompt, "owl")
+        cached = self._get_cached_response(cache_key)
+        if cached is not None:
+            return cached
+            
         try:
             # Create models for the conversation
             models = self._create_models()
@@ -349,6 +706,7 @@ class MCPLLMRouter:
                     response = response.rstrip()
                     response = response.replace('\r\n', '\n')
                     
+                self._cache_response(cache_key, response)
                 return response
             except Exception as e:
                 # Check if the error is related to whitespace
@@ -371,6 +729,11 @@ class MCPLLMRouter:
 
     async def _direct_api_call(self, prompt: str) -> str:
         """Make a direct API call to the LLM provider."""
+        cache_key = self._cache_key(prompt, "direct")
+        cached = self._get_cached_response(cache_key)
+        if cached is not None:
+            return cached
+            
         try:
             # Check which API keys are available
             anthropic_key = os.getenv("ANTHROPIC_API_KEY")
@@ -380,29 +743,34 @@ class MCPLLMRouter:
             # Use the appropriate API based on available keys and model preference
             if self.model == "anthropic" and anthropic_key:
                 logger.info("Using Anthropic API for direct call")
-                response = self.anthropic_client.messages.create(
+                response = await self.anthropic_client.messages.create(
                     model="claude-3-opus-20240229",
                     max_tokens=1024,
                     messages=[
                         {"role": "user", "content": prompt}
                     ]
                 )
-                return response.content[0].text.rstrip()
+                result = response.content[0].text.rstrip()
+                self._cache_response(cache_key, result)
+                return result
             elif self.model == "groq" and groq_key:
                 logger.info("Using Groq API for direct call")
-                response = self.openai_client.ChatCompletion.create(
+                response = await self.openai_client.chat.completions.create(
                     model="qwen-2-5-32b",
                     messages=[{"role": "user", "content": prompt}]
                 )
-                return response['choices'][0]['message']['content'].rstrip()
+                result = response.choices[0].message.content.rstrip()
+                self._cache_response(cache_key, result)
+                return result
             elif openai_key:
                 logger.info("Using OpenAI API for direct call")
-                openai.api_key = openai_key
-                response = openai.ChatCompletion.create(
+                response = await self.openai_direct_client.chat.completions.create(
                     model="gpt-4o",
                     messages=[{"role": "user", "content": prompt}]
                 )
-                return response['choices'][0]['message']['content'].rstrip()
+                result = response.choices[0].message.content.rstrip()
+                self._cache_response(cache_key, result)
+                return result
             else:
                 logger.error("No API keys available for direct calls")
                 return "Error: No API keys available. Please set ANTHROPIC_API_KEY, GROQ_API_KEY, or OPENAI_API_KEY in your environment variables."
@@ -416,6 +784,8 @@ class MCPLLMRouter:
         logger.info("Entering async context manager...")
         if self.use_mcp:
             await self.initialize_mcp()
+        if OWL_AVAILABLE:
+            await self.warm_models()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -423,32 +793,44 @@ class MCPLLMRouter:
         logger.info("Exiting async context manager...")
         if self.use_mcp:
             await self.cleanup_mcp()
-
-    async def _chat_with_mcp_toolkit(self, prompt: str) -> str:
-        """Enhanced MCP toolkit interaction with news fetching and web content capabilities."""
+        if self.response_cache is not None:
+            logger.info(f"Response cache stats: {self.response_cache.stats()}")
+            self.response_cache.close()
+        for client in (self.anthropic_client, self.openai_client, self.openai_direct_client):
+            if client is not None:
+                await client.close()
+        self.executor.shutdown(wait=False)
+
+    async def _chat_with_mcp_toolkit(self, prompt: str, decision: Optional[RouteDecision] = None) -> str:
+        """
+        Enhanced MCP toolkit interaction with news fetching and web content capabilities.
+        
+        Args:
+            prompt: The user's prompt
+            decision: The routing decision already made for the prompt; the prompt
+                is only routed here when none is given, so it is counted once
+                
+        Returns:
+            The model's response
+        """
         try:
-            # Check if response is in cache
-            if self.cache_responses and prompt in self.response_cache:
-                logger.info("Returning cached response")
-                return self.response_cache[prompt]
-
             # Detect if this is a news-related query
-            news_keywords = ["news", "latest", "recent", "update", "current events"]
-            is_news_query = any(keyword in prompt.lower() for keyword in news_keywords)
+            if decision is None:
+                decision = self._route_prompt(prompt)
+            is_news_query = decision.route == NEWS_ROUTE
 
             if is_news_query:
                 logger.info("Detected news-related query, using news fetching capabilities")
+                cache_key = self._cache_key(prompt, "mcp_news")
+                cached = self._get_cached_response(cache_key)
+                if cached is not None:
+                    return cached
                 try:
                     # Use asyncio.wait_for instead of asyncio.timeout
-                    async def get_news():
-                        news_toolkit = NewsToolkit()
-                        return news_toolkit.get_news(prompt)
-                    
-                    news_results = await asyncio.wait_for(get_news(), timeout=self.timeout)
+                    news_results = await asyncio.wait_for(self.news_toolkit.aget_news(prompt), timeout=self.timeout)
                     if news_results:
                         response = self._format_news_response(news_results)
-                        if self.cache_responses:
-                            self.response_cache[prompt] = response
+                        self._cache_response(cache_key, response, ttl=self.news_cache_ttl)
                         return response
                 except asyncio.TimeoutError:
                     logger.warning("News fetching timed out, falling back to direct response")
@@ -457,8 +839,15 @@ class MCPLLMRouter:
             # Use MCP toolkit for other queries
             logger.info("Using MCP toolkit for query")
             
+            # Connect on first use, including any lazily started servers
+            if self.mcp_manager is None:
+                await self.initialize_mcp()
+            if not self.mcp_manager.started:
+                await self._start_mcp_servers()
+            await self.mcp_manager.ensure_started(self.lazy_mcp_servers)
+            
             # Combine MCP tools with search tools
-            mcp_tools = [*self.mcp_toolkit.get_tools()]
+            mcp_tools = [*self.mcp_manager.get_tools()]
             search_toolkit = SearchToolkit()
             search_tools = [
                 search_toolkit.search_google,
@@ -467,6 +856,16 @@ class MCPLLMRouter:
             ]
             all_tools = [*mcp_tools, *search_tools]
             
+            # FunctionTool exposes get_function_name(); plain callables only have __name__
+            tool_names = [
+                tool.get_function_name() if hasattr(tool, "get_function_name") else tool.__name__
+                for tool in all_tools
+            ]
+            cache_key = self._cache_key(prompt, "mcp_toolkit", tools=tool_names)
+            cached = self._get_cached_response(cache_key)
+            if cached is not None:
+                return cached
+            
             # Create chat agents with combined tools
             user_agent = ChatAgent(
                 model_name=self.model,
@@ -484,12 +883,11 @@ class MCPLLMRouter:
                 # Use asyncio.wait_for instead of asyncio.timeout
                 async def process_conversation():
                     user_message = BaseMessage(role=self.user_role_name, content=prompt)
-                    assistant_response = await assistant_agent.step(user_message)
+                    assistant_response = await assistant_agent.astep(user_message)
                     return assistant_response.content
                 
                 response = await asyncio.wait_for(process_conversation(), timeout=self.timeout)
-                if self.cache_responses:
-                    self.response_cache[prompt] = response
+                self._cache_response(cache_key, response)
                 return response
             except asyncio.TimeoutError:
                 logger.warning("Chat processing timed out")
@@ -1,18 +1,29 @@
+import asyncio
+import functools
 import logging
 import aiohttp
 from typing import Dict, Any, Optional
-from bs4 import BeautifulSoup
 import re
 from datetime import datetime
+from owl.text import Summarizer, aiter_html_text, html_to_text
 
 logger = logging.getLogger(__name__)
 
+# Pages larger than this (in bytes) are extracted while they download
+STREAM_THRESHOLD = 2 * 1024 * 1024
+
 class BrowserToolkit:
     """Toolkit for browser operations."""
     
-    def __init__(self):
-        """Initialize the browser toolkit."""
+    def __init__(self, summarizer: Optional[Summarizer] = None):
+        """Initialize the browser toolkit.
+        
+        Args:
+            summarizer: The summarizer to use; pass one built with an ``llm``
+                callable to enable abstractive summaries
+        """
         self.session = None
+        self.summarizer = summarizer or Summarizer()
         
     async def browser_extract_text(self, url: str) -> str:
         """Extract text content from a URL.
@@ -36,46 +47,43 @@ class BrowserToolkit:
                     logger.error(f"Failed to fetch content from {url}: Status {response.status}")
                     return f"Error: Failed to fetch content from {url}"
                 
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
+                # Stream large or unsized pages through the incremental
+                # extractor; parse the rest in one go off the event loop
+                if response.content_length is None or response.content_length > STREAM_THRESHOLD:
+                    lines = [
+                        line async for line in aiter_html_text(
+                            response.content.iter_chunked(65536), encoding=response.charset
+                        )
+                    ]
+                    return ' '.join(lines)
                 
-                # Remove script and style elements
-                for script in soup(["script", "style"]):
-                    script.decompose()
-                
-                # Get text content
-                text = soup.get_text()
-                
-                # Clean up text
-                lines = (line.strip() for line in text.splitlines())
-                chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-                text = ' '.join(chunk for chunk in chunks if chunk)
-                
-                return text
+                html = await response.text()
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(None, functools.partial(html_to_text, html, separator=' '))
                 
         except Exception as e:
             logger.error(f"Error extracting content from {url}: {str(e)}", exc_info=True)
             return f"Error: Failed to fetch content from {url}"
     
-    async def browser_summarize(self, content: str, length: Optional[int] = None) -> str:
+    async def browser_summarize(self, content: str, length: Optional[int] = None,
+                                mode: str = "auto") -> str:
         """Summarize content.
         
         Args:
             content: The content to summarize
-            length: The desired length of the summary
+            length: The desired length of the summary in words; without a
+                length, "auto" mode returns the content unchanged
+            mode: "extractive" for the local summarizer, "abstractive" for the
+                LLM, or "auto" to use the LLM only for long texts when one is
+                configured
             
         Returns:
             The summary
         """
         try:
-            # For now, return a simple summary
-            # In a real implementation, this would use an LLM or other summarization technique
-            words = content.split()
-            if length and len(words) > length:
-                summary = ' '.join(words[:length]) + '...'
-            else:
-                summary = content
-            return summary
+            if not length and mode == "auto":
+                return content
+            return await self.summarizer.summarize(content, length, mode)
             
         except Exception as e:
             logger.error(f"Error summarizing content: {str(e)}", exc_info=True)
@@ -1,9 +1,10 @@
 import asyncio
-import json
 import logging
 import aiohttp
-import base64
+import re
 from typing import Dict, Any, Optional
+from http_cache import HTTPCache
+from protocol import Payload, serve_connection
 
 # Configure logging
 logging.basicConfig(
@@ -15,15 +16,26 @@ logger = logging.getLogger(__name__)
 class FetchServer:
     """MCP Fetch Server for retrieving web content."""
     
-    def __init__(self, port: int = 9001):
+    def __init__(self, port: int = 9001, cache_ttl: float = 300, cache_size: int = 256,
+                 cache_dir: Optional[str] = None, limit_per_host: int = 8):
         """Initialize the fetch server.
         
         Args:
             port: The port to listen on
+            cache_ttl: Default number of seconds a fetched response stays fresh
+            cache_size: Maximum number of responses kept in memory
+            cache_dir: Optional directory for a persistent response cache
+            limit_per_host: Maximum concurrent connections per upstream host
         """
         self.port = port
         self.running = False
         self.server = None
+        self.limit_per_host = limit_per_host
+        self.session = None
+        self.cache = HTTPCache(max_entries=cache_size, ttl=cache_ttl, cache_dir=cache_dir)
+        # Upstream fetches in progress, keyed like the cache, so identical
+        # concurrent requests share one download
+        self.inflight: Dict[str, asyncio.Future] = {}
         
     async def start(self):
         """Start the fetch server."""
@@ -53,6 +65,9 @@ class FetchServer:
         try:
             self.server.close()
             await self.server.wait_closed()
+            if self.session:
+                await self.session.close()
+                self.session = None
             self.running = False
             logger.info("Fetch server stopped")
         except Exception as e:
@@ -61,42 +76,14 @@ class FetchServer:
     async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
         """Handle a connection to the fetch server.
         
+        The connection stays open for any number of length-prefixed requests,
+        which are processed concurrently (see protocol.serve_connection).
+        
         Args:
             reader: The stream reader
             writer: The stream writer
         """
-        try:
-            # Read the request
-            data = await reader.read(4096)  # Increased buffer size
-            if not data:
-                return
-                
-            # Parse the request
-            request = json.loads(data.decode())
-            logger.info(f"Received request: {request}")
-            
-            # Process the request
-            response = await self.process_request(request)
-            
-            # Ensure proper JSON encoding
-            response_json = json.dumps(response, ensure_ascii=False)
-            
-            # Send the response
-            writer.write(response_json.encode())
-            await writer.drain()
-            
-        except Exception as e:
-            logger.error(f"Error handling connection: {str(e)}", exc_info=True)
-            # Send error response
-            error_response = {
-                "error": str(e),
-                "status": "error"
-            }
-            writer.write(json.dumps(error_response).encode())
-            await writer.drain()
-        finally:
-            writer.close()
-            await writer.wait_closed()
+        await serve_connection(reader, writer, self.process_request)
             
     async def process_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Process a fetch request.
@@ -122,20 +109,10 @@ class FetchServer:
             # Fetch the content
             content = await self.fetch_content(url, params)
             
-            # Encode the content
-            try:
-                # Try to encode as UTF-8 first
-                content_bytes = content.encode('utf-8')
-            except UnicodeEncodeError:
-                # If that fails, use a more lenient encoding
-                content_bytes = content.encode('utf-8', errors='replace')
-                
-            # Ensure proper base64 encoding with padding
-            encoded_content = base64.b64encode(content_bytes).decode('ascii')
-            
-            # Return the response
+            # The transport sends the payload as raw or compressed binary
+            # frames when the client negotiated it, and as base64 otherwise
             return {
-                "content": encoded_content,
+                "content": Payload.from_text(content),
                 "url": url,
                 "status": "success"
             }
@@ -147,9 +124,39 @@ class FetchServer:
                 "status": "error"
             }
             
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared keep-alive session, creating it on first use."""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=300
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self.session
+        
+    def _no_store(self, headers) -> bool:
+        """Check whether a response must not be cached at all."""
+        return "no-store" in headers.get("Cache-Control", "")
+        
+    def _max_age(self, headers) -> Optional[float]:
+        """Read the freshness lifetime from a Cache-Control header."""
+        cache_control = headers.get("Cache-Control", "")
+        if "no-cache" in cache_control:
+            return 0
+        match = re.search(r"max-age=(\d+)", cache_control)
+        return float(match.group(1)) if match else None
+        
     async def fetch_content(self, url: str, params: Optional[Dict[str, Any]] = None) -> str:
         """Fetch content from a URL.
         
+        Fresh cached responses are served directly, stale ones are revalidated
+        with a conditional GET, and concurrent identical requests share a
+        single upstream fetch.
+        
         Args:
             url: The URL to fetch content from
             params: Optional parameters for the request
@@ -157,11 +164,67 @@ class FetchServer:
         Returns:
             The fetched content
         """
+        key = self.cache.make_key(url, params)
+        entry = self.cache.get(key)
+        if entry is not None and self.cache.is_fresh(entry):
+            self.cache.hits += 1
+            return entry["content"]
+        self.cache.misses += 1
+        
+        future = self.inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch_upstream(key, url, params, entry))
+            self.inflight[key] = future
+            future.add_done_callback(lambda _: self.inflight.pop(key, None))
+        # Shield so one cancelled caller does not cancel the shared fetch
+        return await asyncio.shield(future)
+        
+    async def _fetch_upstream(self, key: str, url: str, params: Optional[Dict[str, Any]],
+                              entry: Optional[Dict[str, Any]]) -> str:
+        """Fetch a URL upstream, revalidating a stale cache entry when possible.
+        
+        Args:
+            key: The cache key for the request
+            url: The URL to fetch content from
+            params: Optional parameters for the request
+            entry: The stale cache entry, if any
+            
+        Returns:
+            The fetched content
+        """
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+                
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    response.raise_for_status()
-                    return await response.text()
+            session = self._get_session()
+            async with session.get(url, params=params, headers=headers) as response:
+                ttl = self._max_age(response.headers)
+                no_store = self._no_store(response.headers)
+                if response.status == 304 and entry is not None:
+                    logger.info(f"Revalidated cached content for {url}")
+                    if no_store:
+                        self.cache.delete(key)
+                        return entry["content"]
+                    return self.cache.refresh(key, entry, ttl)["content"]
+                    
+                response.raise_for_status()
+                content = await response.text()
+                if no_store:
+                    # Drop any copy cached before the server started sending no-store
+                    self.cache.delete(key)
+                    return content
+                self.cache.set(
+                    key,
+                    content,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                    ttl=ttl
+                )
+                return content
         except Exception as e:
             logger.error(f"Error fetching content: {str(e)}", exc_info=True)
             raise
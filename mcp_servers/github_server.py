@@ -1,9 +1,9 @@
 import asyncio
-import json
 import logging
 import os
 import sys
 from typing import Dict, Any, List, Optional
+from protocol import serve_connection
 
 # Configure logging
 logging.basicConfig(
@@ -62,39 +62,14 @@ class GitHubServer:
     async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
         """Handle a connection to the GitHub server.
         
+        The connection stays open for any number of length-prefixed requests,
+        which are processed concurrently (see protocol.serve_connection).
+        
         Args:
             reader: The stream reader
             writer: The stream writer
         """
-        try:
-            # Read the request
-            data = await reader.read(1024)
-            if not data:
-                return
-                
-            # Parse the request
-            request = json.loads(data.decode())
-            logger.info(f"Received request: {request}")
-            
-            # Process the request
-            response = await self.process_request(request)
-            
-            # Send the response
-            writer.write(json.dumps(response).encode())
-            await writer.drain()
-            
-        except Exception as e:
-            logger.error(f"Error handling connection: {str(e)}", exc_info=True)
-            # Send error response
-            error_response = {
-                "error": str(e),
-                "status": "error"
-            }
-            writer.write(json.dumps(error_response).encode())
-            await writer.drain()
-        finally:
-            writer.close()
-            await writer.wait_closed()
+        await serve_connection(reader, writer, self.process_request)
             
     async def process_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Process a GitHub request.
@@ -0,0 +1,198 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class HTTPCache:
+    """In-memory LRU cache for HTTP responses with TTL and an optional disk tier."""
+
+    def __init__(self, max_entries: int = 256, ttl: float = 300, cache_dir: Optional[str] = None,
+                 max_disk_entries: Optional[int] = None):
+        """Initialize the HTTP cache.
+
+        Args:
+            max_entries: The maximum number of entries kept in memory
+            ttl: The default number of seconds a response stays fresh
+            cache_dir: Optional directory for a persistent disk cache
+            max_disk_entries: The maximum number of entries kept on disk; the
+                least recently used are removed first (default: 4 * max_entries)
+        """
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries if max_disk_entries is not None else 4 * max_entries
+        self.ttl = ttl
+        self.cache_dir = cache_dir
+        self.entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.disk_entries = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self.disk_entries = len(self._disk_files())
+            self._evict_disk()
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Build a cache key from a URL and its query parameters.
+
+        Args:
+            url: The request URL
+            params: Optional query parameters
+
+        Returns:
+            The cache key
+        """
+        payload = json.dumps([url, sorted((params or {}).items())], default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _disk_files(self) -> List[str]:
+        try:
+            return [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+                    if name.endswith(".json")]
+        except OSError as e:
+            logger.warning(f"Error listing disk cache: {str(e)}")
+            return []
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cache entry, fresh or stale.
+
+        Stale entries are still returned so their validators (ETag,
+        Last-Modified) can be used for a conditional request.
+
+        Args:
+            key: The cache key
+
+        Returns:
+            The cache entry, or None if there is none
+        """
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            return entry
+
+        if self.cache_dir:
+            try:
+                path = self._disk_path(key)
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+                # The modification time orders disk entries for eviction
+                os.utime(path)
+                self._store_memory(key, entry)
+                return entry
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                logger.warning(f"Error reading disk cache entry {key}: {str(e)}")
+        return None
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """Check whether a cache entry can be served without revalidation."""
+        return entry.get("expires_at", 0) > time.time()
+
+    def set(self, key: str, content: str, etag: Optional[str] = None,
+            last_modified: Optional[str] = None, ttl: Optional[float] = None) -> Dict[str, Any]:
+        """Store a response.
+
+        Args:
+            key: The cache key
+            content: The response body
+            etag: The ETag response header, if any
+            last_modified: The Last-Modified response header, if any
+            ttl: Optional override of the default TTL in seconds
+
+        Returns:
+            The stored cache entry
+        """
+        entry = {
+            "content": content,
+            "etag": etag,
+            "last_modified": last_modified,
+            "expires_at": time.time() + (self.ttl if ttl is None else ttl)
+        }
+        self._store_memory(key, entry)
+        self._store_disk(key, entry)
+        return entry
+
+    def delete(self, key: str):
+        """Remove an entry from memory and disk, e.g. for a no-store response."""
+        self.entries.pop(key, None)
+        if not self.cache_dir:
+            return
+        try:
+            os.remove(self._disk_path(key))
+            self.disk_entries -= 1
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Error removing disk cache entry {key}: {str(e)}")
+
+    def refresh(self, key: str, entry: Dict[str, Any], ttl: Optional[float] = None) -> Dict[str, Any]:
+        """Extend the lifetime of an entry after a successful revalidation (304)."""
+        self.revalidations += 1
+        entry["expires_at"] = time.time() + (self.ttl if ttl is None else ttl)
+        self._store_memory(key, entry)
+        self._store_disk(key, entry)
+        return entry
+
+    def _store_memory(self, key: str, entry: Dict[str, Any]):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def _store_disk(self, key: str, entry: Dict[str, Any]):
+        if not self.cache_dir:
+            return
+        path = self._disk_path(key)
+        try:
+            is_new = not os.path.exists(path)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Error writing disk cache entry {key}: {str(e)}")
+            return
+        if is_new:
+            self.disk_entries += 1
+            self._evict_disk()
+
+    def _evict_disk(self):
+        """Remove the least recently used disk entries once over max_disk_entries."""
+        if self.disk_entries <= self.max_disk_entries:
+            return
+        # Evict a tenth of the limit at once so the directory is not listed on every write
+        target = self.max_disk_entries - self.max_disk_entries // 10
+        files = []
+        for path in self._disk_files():
+            try:
+                files.append((os.path.getmtime(path), path))
+            except OSError:
+                pass
+        files.sort()
+        for _, path in files[:max(len(files) - target, 0)]:
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.warning(f"Error evicting disk cache entry {path}: {str(e)}")
+        self.disk_entries = len(self._disk_files())
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "disk_entries": self.disk_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
@@ -1,11 +1,11 @@
 import asyncio
-import json
 import logging
 import os
 import sys
 from typing import Dict, Any, List, Optional
 from fetch_server import FetchServer
 from web_server import WebServer
+from protocol import serve_connection
 
 # Configure logging
 logging.basicConfig(
@@ -64,52 +64,14 @@ class MCPServer:
     async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
         """Handle a connection to the MCP server.
         
+        The connection stays open for any number of length-prefixed requests,
+        which are processed concurrently (see protocol.serve_connection).
+        
         Args:
             reader: The stream reader
             writer: The stream writer
         """
-        try:
-            # Read the request length first (4 bytes)
-            length_bytes = await reader.readexactly(4)
-            request_length = int.from_bytes(length_bytes, byteorder='big')
-            
-            # Read the request
-            data = await reader.readexactly(request_length)
-            if not data:
-                return
-                
-            # Parse the request
-            request = json.loads(data.decode('utf-8'))
-            logger.info(f"Received request: {request}")
-            
-            # Process the request
-            response = await self.process_request(request)
-            
-            # Ensure proper JSON encoding
-            response_json = json.dumps(response, ensure_ascii=False)
-            response_bytes = response_json.encode('utf-8')
-            
-            # Send the response length first (4 bytes)
-            writer.write(len(response_bytes).to_bytes(4, byteorder='big'))
-            # Send the response
-            writer.write(response_bytes)
-            await writer.drain()
-            
-        except Exception as e:
-            logger.error(f"Error handling connection: {str(e)}", exc_info=True)
-            # Send error response
-            error_response = {
-                "error": str(e),
-                "status": "error"
-            }
-            error_json = json.dumps(error_response, ensure_ascii=False)
-            error_bytes = error_json.encode('utf-8')
-            writer.write(len(error_bytes).to_bytes(4, byteorder='big'))
-            writer.write(error_bytes)
-            await writer.drain()
-        finally:
-            writer.close()
-            await writer.wait_closed()
+        await serve_connection(reader, writer, self.process_request)
             
     async def process_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Process an MCP request.
@@ -137,26 +99,31 @@ class MCPServer:
                 )
             elif operation == "extract":
                 return await self.web_server.extract(
-                    url=request.get("url", "")
+                    url=request.get("url", ""),
+                    raw=True
                 )
             elif operation == "summarize":
                 return await self.web_server.summarize(
                     content=request.get("content", ""),
-                    length=request.get("length")
+                    length=request.get("length"),
+                    mode=request.get("mode", "auto")
                 )
             elif operation == "fetch_news":
                 return await self.web_server.fetch_news(
                     query=request.get("query", ""),
                     sources=request.get("sources"),
-                    limit=request.get("limit", 10)
+                    limit=request.get("limit", 10),
+                    deadline=request.get("deadline")
                 )
             elif operation == "filter_news":
                 return await self.web_server.filter_news(
-                    articles=request.get("articles", []),
+                    articles=request.get("articles"),
                     keyword=request.get("keyword"),
                     start_date=request.get("start_date"),
                     end_date=request.get("end_date"),
-                    limit=request.get("limit")
+                    limit=request.get("limit"),
+                    source=request.get("source"),
+                    articles_id=request.get("articles_id")
                 )
             else:
                 return {
@@ -0,0 +1,516 @@
+import asyncio
+import base64
+import itertools
+import json
+import logging
+import zlib
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Every frame is a 4-byte big-endian length followed by a body. JSON bodies
+# start with '{'; binary chunk bodies start with BINARY_MARKER, then a flags
+# byte and the 8-byte request id, then the (possibly compressed) payload.
+HEADER_SIZE = 4
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+BINARY_MARKER = 0x00
+FLAG_LAST_CHUNK = 0x01
+CHUNK_HEADER_SIZE = 10
+CHUNK_SIZE = 64 * 1024
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 1024
+
+IDENTITY = "identity"
+GZIP = "gzip"
+ZSTD = "zstd"
+SUPPORTED_ENCODINGS = ([ZSTD] if zstandard is not None else []) + [GZIP, IDENTITY]
+
+RequestHandler = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+class ProtocolError(Exception):
+    """Raised when a peer sends a malformed frame."""
+
+class Payload:
+    """A binary response body.
+
+    Handlers put a Payload in a response's ``content`` field. Clients that
+    negotiated a transport with ``accept_encoding`` receive it as raw or
+    compressed chunk frames; all other clients get it base64-encoded in the
+    JSON response, as before.
+    """
+
+    def __init__(self, data: bytes, content_type: str = "text/plain; charset=utf-8"):
+        """Initialize the payload.
+
+        Args:
+            data: The body
+            content_type: The MIME type of the body
+        """
+        self.data = data
+        self.content_type = content_type
+
+    @classmethod
+    def from_text(cls, text: str) -> "Payload":
+        """Create a UTF-8 payload from text."""
+        return cls(text.encode('utf-8', errors='replace'))
+
+class _IdentityCodec:
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def decompress(self, data: bytes) -> bytes:
+        return data
+
+    def flush(self) -> bytes:
+        return b""
+
+def _compressor(encoding: str):
+    if encoding == ZSTD:
+        return zstandard.ZstdCompressor(level=3).compressobj()
+    if encoding == GZIP:
+        return zlib.compressobj(6, zlib.DEFLATED, 31)
+    return _IdentityCodec()
+
+def _decompressor(encoding: str):
+    if encoding == ZSTD:
+        if zstandard is None:
+            raise ProtocolError("Received zstd content but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompressobj()
+    if encoding == GZIP:
+        return zlib.decompressobj(31)
+    return _IdentityCodec()
+
+def negotiate_encoding(accept_encoding: Optional[List[str]], size: int) -> Optional[str]:
+    """Pick the content encoding for a binary response.
+
+    Args:
+        accept_encoding: Encodings the client accepts, in order of preference
+        size: The size of the body in bytes
+
+    Returns:
+        The encoding to use, or None to fall back to base64 in JSON
+    """
+    if not accept_encoding:
+        return None
+    if size < MIN_COMPRESS_SIZE and IDENTITY in accept_encoding:
+        return IDENTITY
+    for encoding in accept_encoding:
+        if encoding in SUPPORTED_ENCODINGS:
+            return encoding
+    return None
+
+async def read_frame(reader: asyncio.StreamReader) -> Optional[bytes]:
+    """Read one length-prefixed frame.
+
+    Args:
+        reader: The stream reader
+
+    Returns:
+        The frame body, or None if the peer closed the connection
+    """
+    try:
+        header = await reader.readexactly(HEADER_SIZE)
+    except asyncio.IncompleteReadError as e:
+        if e.partial:
+            raise ProtocolError("Connection closed in the middle of a frame header")
+        return None
+    length = int.from_bytes(header, byteorder='big')
+    if length > MAX_FRAME_SIZE:
+        raise ProtocolError(f"Frame of {length} bytes exceeds the {MAX_FRAME_SIZE} byte limit")
+    return await reader.readexactly(length)
+
+def write_frame(writer: asyncio.StreamWriter, body: bytes):
+    """Queue one length-prefixed frame on the writer (call drain() afterwards).
+
+    Args:
+        writer: The stream writer
+        body: The frame body
+    """
+    writer.write(len(body).to_bytes(HEADER_SIZE, byteorder='big') + body)
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    """Serialize a message for a frame body."""
+    return json.dumps(message, ensure_ascii=False).encode('utf-8')
+
+def _inline_payload(response: Dict[str, Any]) -> Dict[str, Any]:
+    """Base64-encode a Payload into the JSON response (compatibility mode)."""
+    payload = response.get("content")
+    if not isinstance(payload, Payload):
+        return response
+    return {
+        **response,
+        "content": base64.b64encode(payload.data).decode('ascii'),
+        "content_encoding": "base64"
+    }
+
+async def _send_chunked(writer: asyncio.StreamWriter, write_lock: asyncio.Lock,
+                        response: Dict[str, Any], payload: Payload, encoding: str):
+    """Send a JSON header followed by the payload as binary chunk frames.
+
+    The write lock is taken per frame, so other responses on the same
+    connection can interleave with a large body.
+    """
+    request_id = response["id"]
+    header = {k: v for k, v in response.items() if k != "content"}
+    header.update({
+        "chunked": True,
+        "content_encoding": encoding,
+        "content_type": payload.content_type,
+        "content_length": len(payload.data)
+    })
+    prefix = request_id.to_bytes(8, byteorder='big', signed=True)
+
+    async def send(data: bytes, flags: int = 0):
+        async with write_lock:
+            write_frame(writer, bytes([BINARY_MARKER, flags]) + prefix + data)
+            await writer.drain()
+
+    async with write_lock:
+        write_frame(writer, encode_message(header))
+        await writer.drain()
+
+    compressor = _compressor(encoding)
+    view = memoryview(payload.data)
+    for offset in range(0, len(view), CHUNK_SIZE):
+        data = compressor.compress(view[offset:offset + CHUNK_SIZE])
+        if data:
+            await send(data)
+    await send(compressor.flush(), FLAG_LAST_CHUNK)
+
+async def _read_legacy_request(reader: asyncio.StreamReader, prefix: bytes) -> Dict[str, Any]:
+    """Read an unframed JSON request from a client that predates framing."""
+    data = prefix
+    while True:
+        try:
+            return json.loads(data.decode('utf-8'))
+        except (ValueError, UnicodeDecodeError):
+            chunk = await reader.read(65536)
+            if not chunk:
+                raise ProtocolError("Connection closed before a complete JSON request was received")
+            data += chunk
+
+async def serve_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                           handler: RequestHandler, max_in_flight: int = 32):
+    """Serve framed requests on one connection until the client disconnects.
+
+    Requests may carry an ``id``; it is echoed in the matching response so
+    clients can keep many requests in flight on one connection. Responses are
+    written as soon as each request completes, in any order.
+
+    Clients that send a single unframed JSON request (the format used before
+    framing was introduced) get a single unframed response, as before.
+
+    Args:
+        reader: The stream reader
+        writer: The stream writer
+        handler: Coroutine turning a request dict into a response dict
+        max_in_flight: Maximum number of concurrent requests per connection
+    """
+    write_lock = asyncio.Lock()
+    slots = asyncio.Semaphore(max_in_flight)
+    pending = set()
+
+    async def respond(request: Dict[str, Any]):
+        logger.debug(f"Received request: {request}")
+        try:
+            try:
+                response = await handler(request)
+            except Exception as e:
+                logger.error(f"Error processing request: {str(e)}", exc_info=True)
+                response = {"error": str(e), "status": "error"}
+            if "id" in request:
+                response = {**response, "id": request["id"]}
+            payload = response.get("content")
+            encoding = None
+            if isinstance(payload, Payload) and isinstance(request.get("id"), int):
+                encoding = negotiate_encoding(request.get("accept_encoding"), len(payload.data))
+            if encoding is None:
+                async with write_lock:
+                    write_frame(writer, encode_message(_inline_payload(response)))
+                    await writer.drain()
+            else:
+                await _send_chunked(writer, write_lock, response, payload, encoding)
+        finally:
+            slots.release()
+
+    try:
+        # Legacy clients send raw JSON, which starts with '{'; a real length
+        # header starting with that byte would exceed MAX_FRAME_SIZE
+        first = await reader.read(1)
+        if not first:
+            return
+        if first == b'{':
+            request = await _read_legacy_request(reader, first)
+            logger.info(f"Received legacy request: {request}")
+            try:
+                response = await handler(request)
+            except Exception as e:
+                # Legacy clients do not read frames, so errors go out unframed too
+                logger.error(f"Error processing request: {str(e)}", exc_info=True)
+                response = {"error": str(e), "status": "error"}
+            writer.write(encode_message(_inline_payload(response)))
+            await writer.drain()
+            return
+
+        rest = await reader.readexactly(HEADER_SIZE - 1)
+        length = int.from_bytes(first + rest, byteorder='big')
+        if length > MAX_FRAME_SIZE:
+            raise ProtocolError(f"Frame of {length} bytes exceeds the {MAX_FRAME_SIZE} byte limit")
+        body = await reader.readexactly(length)
+
+        while body is not None:
+            try:
+                request = json.loads(body.decode('utf-8'))
+            except (ValueError, UnicodeDecodeError) as e:
+                request = None
+                async with write_lock:
+                    write_frame(writer, encode_message({"error": f"Invalid JSON: {str(e)}", "status": "error"}))
+                    await writer.drain()
+
+            if request is not None:
+                await slots.acquire()
+                task = asyncio.create_task(respond(request))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+
+            body = await read_frame(reader)
+
+    except (ProtocolError, asyncio.IncompleteReadError, ConnectionError) as e:
+        logger.warning(f"Closing connection: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error handling connection: {str(e)}", exc_info=True)
+        try:
+            write_frame(writer, encode_message({"error": str(e), "status": "error"}))
+            await writer.drain()
+        except ConnectionError:
+            pass
+    finally:
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+class _Stream:
+    """Receiving state of one chunked response."""
+
+    def __init__(self, encoding: str):
+        self.decompressor = _decompressor(encoding)
+        self.chunks: asyncio.Queue = asyncio.Queue()
+
+class FramedClient:
+    """A persistent connection that multiplexes concurrent requests by id.
+
+    Requests advertise ``accept_encoding``, so binary bodies arrive as raw or
+    compressed chunk frames instead of base64 inside JSON.
+    """
+
+    def __init__(self, host: str, port: int, accept_encoding: Optional[List[str]] = None):
+        """Initialize the client.
+
+        Args:
+            host: The server host
+            port: The server port
+            accept_encoding: Encodings to accept for binary bodies, in order
+                of preference (default: every supported encoding)
+        """
+        self.host = host
+        self.port = port
+        self.accept_encoding = list(accept_encoding or SUPPORTED_ENCODINGS)
+        self.reader = None
+        self.writer = None
+        self.reader_task = None
+        self.pending: Dict[int, asyncio.Future] = {}
+        self.streams: Dict[int, _Stream] = {}
+        self.ids = itertools.count(1)
+        self.write_lock = asyncio.Lock()
+        self.connect_lock = asyncio.Lock()
+
+    @property
+    def connected(self) -> bool:
+        return self.writer is not None and not self.writer.is_closing()
+
+    async def connect(self):
+        """Open the connection and start dispatching responses."""
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.reader_task = asyncio.create_task(self._dispatch())
+
+    def _handle_chunk(self, body: bytes):
+        """Decompress one binary chunk frame into its response stream."""
+        if len(body) < CHUNK_HEADER_SIZE:
+            raise ProtocolError("Truncated chunk frame")
+        flags = body[1]
+        request_id = int.from_bytes(body[2:CHUNK_HEADER_SIZE], byteorder='big', signed=True)
+        stream = self.streams.get(request_id)
+        if stream is None:
+            return
+        data = stream.decompressor.decompress(body[CHUNK_HEADER_SIZE:])
+        if data:
+            stream.chunks.put_nowait(data)
+        if flags & FLAG_LAST_CHUNK:
+            stream.chunks.put_nowait(None)
+            self.streams.pop(request_id, None)
+
+    async def _dispatch(self):
+        """Route incoming responses to the requests waiting for them."""
+        error: Exception = ConnectionError("Connection closed by server")
+        try:
+            while True:
+                body = await read_frame(self.reader)
+                if body is None:
+                    break
+                if body[:1] == bytes([BINARY_MARKER]):
+                    self._handle_chunk(body)
+                    continue
+                response = json.loads(body.decode('utf-8'))
+                request_id = response.pop("id", None)
+                stream = None
+                if response.get("chunked"):
+                    stream = _Stream(response["content_encoding"])
+                    self.streams[request_id] = stream
+                future = self.pending.pop(request_id, None)
+                if future is not None and not future.done():
+                    future.set_result((response, stream))
+        except Exception as e:
+            error = e
+        finally:
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            self.pending.clear()
+            for stream in self.streams.values():
+                stream.chunks.put_nowait(error)
+            self.streams.clear()
+            if self.writer is not None:
+                self.writer.close()
+
+    async def _send(self, message: Dict[str, Any]):
+        """Send a request and return its id and the future for its response header.
+
+        The future resolves to ``(response, stream)``, where ``stream`` holds
+        the body chunks of a chunked response and is None otherwise.
+        """
+        async with self.connect_lock:
+            if not self.connected:
+                await self.connect()
+        request_id = next(self.ids)
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        message = {"accept_encoding": self.accept_encoding, **message, "id": request_id}
+        try:
+            async with self.write_lock:
+                write_frame(self.writer, encode_message(message))
+                await self.writer.drain()
+        except Exception:
+            self.pending.pop(request_id, None)
+            raise
+        return request_id, future
+
+    async def _iter_chunks(self, stream: _Stream) -> AsyncIterator[bytes]:
+        while True:
+            chunk = await stream.chunks.get()
+            if chunk is None:
+                return
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield chunk
+
+    async def _receive(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        request_id, future = await self._send(message)
+        try:
+            response, stream = await future
+        finally:
+            self.pending.pop(request_id, None)
+        if response.pop("chunked", False):
+            data = b"".join([chunk async for chunk in self._iter_chunks(stream)])
+            response["content"] = data.decode('utf-8', errors='replace')
+            response["content_encoding"] = IDENTITY
+        return response
+
+    async def request(self, message: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Send a request and wait for its response.
+
+        Binary bodies are reassembled and decoded into the ``content`` field.
+
+        Args:
+            message: The request
+            timeout: Optional number of seconds to wait for the response
+
+        Returns:
+            The response
+        """
+        return await asyncio.wait_for(self._receive(message), timeout=timeout)
+
+    async def stream(self, message: Dict[str, Any]) -> AsyncIterator[bytes]:
+        """Send a request and yield its binary body chunk by chunk.
+
+        Args:
+            message: The request
+
+        Yields:
+            Decompressed chunks of the response body
+
+        Raises:
+            ProtocolError: If the server answered without a binary body
+        """
+        request_id, future = await self._send(message)
+        try:
+            response, stream = await future
+        finally:
+            self.pending.pop(request_id, None)
+        if stream is None:
+            raise ProtocolError(response.get("error") or "Response has no binary body")
+        async for chunk in self._iter_chunks(stream):
+            yield chunk
+
+    async def close(self):
+        """Close the connection."""
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+        if self.reader_task is not None:
+            await asyncio.gather(self.reader_task, return_exceptions=True)
+            self.reader_task = None
+
+class ConnectionPool:
+    """A small pool of persistent framed connections to one server."""
+
+    def __init__(self, host: str = 'localhost', port: int = 9010, size: int = 4):
+        """Initialize the pool.
+
+        Args:
+            host: The server host
+            port: The server port
+            size: The number of connections to spread requests over
+        """
+        self.clients: List[FramedClient] = [FramedClient(host, port) for _ in range(size)]
+        self.next_client = itertools.cycle(range(size))
+
+    async def request(self, message: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Send a request on the least busy connection.
+
+        Args:
+            message: The request
+            timeout: Optional number of seconds to wait for the response
+
+        Returns:
+            The response
+        """
+        start = next(self.next_client)
+        ordered = self.clients[start:] + self.clients[:start]
+        client = min(ordered, key=lambda c: len(c.pending))
+        return await client.request(message, timeout=timeout)
+
+    async def close(self):
+        """Close every connection in the pool."""
+        await asyncio.gather(*(client.close() for client in self.clients), return_exceptions=True)
@@ -0,0 +1,121 @@
+import asyncio
+import os
+import tempfile
+
+from fetch_server import FetchServer
+from http_cache import HTTPCache
+
+
+class FakeResponse:
+    def __init__(self, status, text="", headers=None):
+        self.status = status
+        self._text = text
+        self.headers = headers or {}
+
+    async def __aenter__(self):
+        await asyncio.sleep(0.01)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise RuntimeError(f"HTTP {self.status}")
+
+    async def text(self):
+        return self._text
+
+
+class FakeSession:
+    """Serves queued responses and records the request headers."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+        self.closed = False
+
+    def get(self, url, params=None, headers=None):
+        self.requests.append(headers or {})
+        return self.responses.pop(0)
+
+
+def _server(*responses, **kwargs):
+    server = FetchServer(**kwargs)
+    server.session = FakeSession(*responses)
+    return server
+
+
+def test_keys_ignore_parameter_order():
+    assert HTTPCache.make_key("https://a", {"q": 1, "p": 2}) == HTTPCache.make_key("https://a", {"p": 2, "q": 1})
+    assert HTTPCache.make_key("https://a", {"q": 1}) != HTTPCache.make_key("https://a", {"q": 2})
+
+
+def test_fresh_responses_are_served_from_cache_and_fetches_coalesce():
+    async def main():
+        server = _server(FakeResponse(200, "body", {"Cache-Control": "max-age=60"}))
+        results = await asyncio.gather(*(server.fetch_content("https://a") for _ in range(3)))
+        assert results == ["body"] * 3
+        assert await server.fetch_content("https://a") == "body"
+        assert len(server.session.requests) == 1
+        assert server.cache.hits == 1
+
+    asyncio.run(main())
+
+
+def test_stale_responses_are_revalidated():
+    async def main():
+        server = _server(
+            FakeResponse(200, "v1", {"Cache-Control": "no-cache", "ETag": '"1"', "Last-Modified": "yesterday"}),
+            FakeResponse(304, headers={"Cache-Control": "max-age=60"}),
+        )
+        assert await server.fetch_content("https://a") == "v1"
+        assert await server.fetch_content("https://a") == "v1"
+        assert server.session.requests[1] == {"If-None-Match": '"1"', "If-Modified-Since": "yesterday"}
+        assert server.cache.revalidations == 1
+        # The 304 made the entry fresh for its new max-age
+        assert await server.fetch_content("https://a") == "v1"
+        assert len(server.session.requests) == 2
+
+    asyncio.run(main())
+
+
+def test_no_store_responses_are_never_cached():
+    async def main():
+        with tempfile.TemporaryDirectory() as directory:
+            server = _server(
+                FakeResponse(200, "old", {"Cache-Control": "max-age=0"}),
+                FakeResponse(200, "private", {"Cache-Control": "no-store"}),
+                FakeResponse(200, "again", {"Cache-Control": "no-store"}),
+                cache_dir=directory,
+            )
+            await server.fetch_content("https://a")
+            assert await server.fetch_content("https://a") == "private"
+            assert not server.cache.entries and not os.listdir(directory)
+            assert await server.fetch_content("https://a") == "again"
+            # Nothing was kept, so the last request was not conditional
+            assert server.session.requests[2] == {}
+
+    asyncio.run(main())
+
+
+def test_disk_tier_is_bounded_and_reloaded():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = HTTPCache(max_entries=2, cache_dir=directory, max_disk_entries=10)
+        for i in range(25):
+            cache.set(f"k{i}", f"v{i}")
+        assert cache.disk_entries <= 10 and len(os.listdir(directory)) == cache.disk_entries
+        reopened = HTTPCache(max_entries=2, cache_dir=directory, max_disk_entries=10)
+        assert reopened.get("k24")["content"] == "v24"
+        assert reopened.get("k0") is None
+        reopened.delete("k24")
+        assert reopened.get("k24") is None
+
+
+if __name__ == "__main__":
+    test_keys_ignore_parameter_order()
+    test_fresh_responses_are_served_from_cache_and_fetches_coalesce()
+    test_stale_responses_are_revalidated()
+    test_no_store_responses_are_never_cached()
+    test_disk_tier_is_bounded_and_reloaded()
+    print("HTTP cache checks passed")
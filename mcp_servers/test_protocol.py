@@ -0,0 +1,118 @@
+import asyncio
+import json
+
+from protocol import GZIP, IDENTITY, ConnectionPool, FramedClient, Payload, negotiate_encoding, serve_connection
+
+BODY = ("filing text " * 20000).encode("utf-8")
+
+
+async def _handler(request):
+    operation = request.get("operation")
+    if operation == "echo":
+        await asyncio.sleep(request.get("delay", 0))
+        return {"status": "success", "value": request.get("value")}
+    if operation == "body":
+        return {"status": "success", "content": Payload(BODY)}
+    raise RuntimeError("boom")
+
+
+async def _serve():
+    server = await asyncio.start_server(lambda r, w: serve_connection(r, w, _handler), "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+def test_negotiate_encoding():
+    assert negotiate_encoding(None, 10_000) is None
+    assert negotiate_encoding([GZIP, IDENTITY], 100) == IDENTITY
+    assert negotiate_encoding(["br", GZIP], 10_000) == GZIP
+    assert negotiate_encoding(["br"], 10_000) is None
+
+
+def test_responses_are_matched_by_id_out_of_order():
+    async def main():
+        server, port = await _serve()
+        client = FramedClient("127.0.0.1", port)
+        try:
+            slow = asyncio.ensure_future(client.request({"operation": "echo", "value": "slow", "delay": 0.1}))
+            fast = await client.request({"operation": "echo", "value": "fast"})
+            assert fast["value"] == "fast" and not slow.done()
+            assert (await slow)["value"] == "slow"
+        finally:
+            await client.close()
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(main())
+
+
+def test_binary_body_is_chunked_and_compressed():
+    async def main():
+        server, port = await _serve()
+        gzip_client = FramedClient("127.0.0.1", port, accept_encoding=[GZIP])
+        raw_client = FramedClient("127.0.0.1", port, accept_encoding=[IDENTITY])
+        pool = ConnectionPool("127.0.0.1", port, size=2)
+        try:
+            response = await gzip_client.request({"operation": "body"})
+            assert response["content"].encode("utf-8") == BODY
+            assert response["content_length"] == len(BODY)
+            chunks = [chunk async for chunk in raw_client.stream({"operation": "body"})]
+            assert len(chunks) > 1 and b"".join(chunks) == BODY
+            results = await asyncio.gather(*(pool.request({"operation": "echo", "value": i}) for i in range(6)))
+            assert [result["value"] for result in results] == list(range(6))
+        finally:
+            await gzip_client.close()
+            await raw_client.close()
+            await pool.close()
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(main())
+
+
+def test_handler_errors_become_error_responses():
+    async def main():
+        server, port = await _serve()
+        client = FramedClient("127.0.0.1", port)
+        try:
+            assert await client.request({"operation": "fail"}) == {"error": "boom", "status": "error"}
+        finally:
+            await client.close()
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(main())
+
+
+def test_legacy_clients_get_unframed_responses():
+    async def legacy(request):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(json.dumps(request).encode("utf-8"))
+        await writer.drain()
+        data = await reader.read()
+        writer.close()
+        return json.loads(data)
+
+    async def main():
+        nonlocal port
+        server, port = await _serve()
+        try:
+            assert await legacy({"operation": "echo", "value": 1}) == {"status": "success", "value": 1}
+            assert await legacy({"operation": "fail"}) == {"error": "boom", "status": "error"}
+            # Binary bodies are inlined as base64 for clients that cannot read chunks
+            response = await legacy({"operation": "body"})
+            assert response["content_encoding"] == "base64"
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    port = None
+    asyncio.run(main())
+
+
+if __name__ == "__main__":
+    test_negotiate_encoding()
+    test_responses_are_matched_by_id_out_of_order()
+    test_binary_body_is_chunked_and_compressed()
+    test_handler_errors_become_error_responses()
+    test_legacy_clients_get_unframed_responses()
+    print("Protocol checks passed")
@@ -8,9 +8,13 @@ import aiohttp
 from bs4 import BeautifulSoup
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
+from urllib.parse import urlparse
 import random
+import math
+from owl.news import ArticleStore, ArticleStoreCache, parse_timestamp
 from search_toolkit import SearchToolkit
 from browser_toolkit import BrowserToolkit
+from protocol import Payload
 
 # Configure logging
 logging.basicConfig(
@@ -19,13 +23,33 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Number of fetched articles kept for filter_news calls without an article list
+MAX_STORED_ARTICLES = 5000
+
 class WebServer:
     """Server for web operations."""
     
-    def __init__(self):
-        """Initialize the web server."""
+    def __init__(self, max_concurrency: int = 8, per_host_limit: int = 2,
+                 url_timeout: float = 8.0, news_deadline: float = 15.0):
+        """Initialize the web server.
+        
+        Args:
+            max_concurrency: The maximum number of pages extracted at once
+            per_host_limit: The maximum number of concurrent requests to one host
+            url_timeout: The number of seconds allowed for extracting one page
+            news_deadline: The default number of seconds fetch_news may spend
+                extracting articles before returning partial results
+        """
         self.search_toolkit = SearchToolkit()
         self.browser_toolkit = BrowserToolkit()
+        self.per_host_limit = per_host_limit
+        self.url_timeout = url_timeout
+        self.news_deadline = news_deadline
+        self.extract_semaphore = asyncio.Semaphore(max_concurrency)
+        # Articles from fetch_news, and indexes of article lists given to filter_news
+        self.article_store = ArticleStore(max_articles=MAX_STORED_ARTICLES)
+        self.article_stores = ArticleStoreCache()
+        self.host_semaphores: Dict[str, asyncio.Semaphore] = {}
         
     async def search(self, query: str, limit: int = 10) -> Dict[str, Any]:
         """Search the web.
@@ -50,11 +74,13 @@ class WebServer:
                 "error": str(e)
             }
     
-    async def extract(self, url: str) -> Dict[str, Any]:
+    async def extract(self, url: str, raw: bool = False) -> Dict[str, Any]:
         """Extract content from a URL.
         
         Args:
             url: The URL to extract content from
+            raw: Return the content as a binary Payload for the framed
+                transport instead of a base64 string
             
         Returns:
             The extracted content
@@ -62,6 +88,12 @@ class WebServer:
         try:
             content = await self.browser_toolkit.browser_extract_text(url)
             
+            if raw:
+                return {
+                    "status": "success",
+                    "content": Payload.from_text(content)
+                }
+            
             # Encode content as base64 to avoid JSON serialization issues
             encoded_content = base64.b64encode(content.encode()).decode()
             
@@ -76,12 +108,14 @@ class WebServer:
                 "error": str(e)
             }
     
-    async def summarize(self, content: str, length: Optional[int] = None) -> Dict[str, Any]:
+    async def summarize(self, content: str, length: Optional[int] = None,
+                        mode: str = "auto") -> Dict[str, Any]:
         """Summarize content.
         
         Args:
             content: The content to summarize
-            length: The desired length of the summary
+            length: The desired length of the summary in words
+            mode: "auto", "extractive" or "abstractive"
             
         Returns:
             The summary
@@ -91,7 +125,7 @@ class WebServer:
             if content.startswith("data:text/plain;base64,"):
                 content = base64.b64decode(content.split(",")[1]).decode()
             
-            summary = await self.browser_toolkit.browser_summarize(content, length)
+            summary = await self.browser_toolkit.browser_summarize(content, length, mode)
             
             return {
                 "status": "success",
@@ -104,48 +138,105 @@ class WebServer:
                 "error": str(e)
             }
     
-    async def fetch_news(self, query: str, sources: Optional[List[str]] = None, limit: int = 10) -> Dict[str, Any]:
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """Get the semaphore that limits concurrent requests to the URL's host."""
+        host = urlparse(url).netloc.lower()
+        semaphore = self.host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_host_limit)
+            self.host_semaphores[host] = semaphore
+        return semaphore
+    
+    async def _enrich_article(self, article: Dict[str, Any]):
+        """Replace an article's snippet with the full page text, if it can be extracted in time.
+        
+        Args:
+            article: The article to enrich in place
+        """
+        url = article["url"]
+        try:
+            async with self.extract_semaphore, self._host_semaphore(url):
+                content = await asyncio.wait_for(
+                    self.browser_toolkit.browser_extract_text(url),
+                    timeout=self.url_timeout
+                )
+        except asyncio.TimeoutError:
+            logger.warning(f"Timed out extracting {url} after {self.url_timeout}s, keeping snippet")
+            return
+        except Exception as e:
+            logger.warning(f"Error extracting {url}: {str(e)}, keeping snippet")
+            return
+            
+        # browser_extract_text reports failures as text rather than raising
+        if content and not content.startswith("Error:"):
+            article["content"] = content
+            article["enriched"] = True
+    
+    async def fetch_news(self, query: str, sources: Optional[List[str]] = None, limit: int = 10,
+                         deadline: Optional[float] = None) -> Dict[str, Any]:
         """Fetch news articles.
         
+        Article pages are extracted concurrently, bounded overall and per host.
+        Articles whose page could not be extracted before its own timeout or
+        the overall deadline keep their search snippet as content.
+        
         Args:
             query: The search query
             sources: The news sources to search
             limit: The maximum number of results to return
+            deadline: Seconds to spend extracting articles (default: news_deadline)
             
         Returns:
-            The news articles
+            The news articles, and an ``articles_id`` that filter_news accepts
+            in place of the article list
         """
         try:
             # For now, return mock news articles
             # In a real implementation, this would use a news API
-            articles = []
             
             # Use the search toolkit to find relevant content
             search_results = await self.search_toolkit.search_google(query, limit)
             
-            for i, result in enumerate(search_results):
-                # Try to extract content from the URL
-                try:
-                    content = await self.browser_toolkit.browser_extract_text(result["url"])
-                except:
-                    content = result["snippet"]
-                
-                # Create a mock article
-                article = {
+            # Start from the snippets so a missed deadline still yields articles
+            articles = [
+                {
                     "title": result["title"],
                     "url": result["url"],
                     "source": result.get("source", "Unknown Source"),
                     "date": datetime.now().isoformat(),
-                    "content": content
+                    "content": result["snippet"],
+                    "enriched": False
                 }
-                
-                articles.append(article)
+                for result in search_results
+            ]
+            
+            tasks = [asyncio.create_task(self._enrich_article(article)) for article in articles]
+            partial = False
+            if tasks:
+                _, pending = await asyncio.wait(
+                    tasks, timeout=self.news_deadline if deadline is None else deadline
+                )
+                if pending:
+                    partial = True
+                    logger.warning(f"News deadline reached with {len(pending)} of {len(tasks)} pages still loading")
+                    for task in pending:
+                        task.cancel()
+                    await asyncio.gather(*pending, return_exceptions=True)
+            
+            # Index the batch now so filter_news can find it by id or by content
+            sanitized = [self._sanitize_article(article) for article in articles]
+            self.article_store.add(sanitized)
+            articles_id = self.article_stores.key(sanitized)
+            self.article_stores.get(sanitized)
             
             return {
                 "status": "success",
                 "articles": articles,
+                "articles_id": articles_id,
                 "sources_used": sources or ["Google"],
-                "total_found": len(articles)
+                "total_found": len(articles),
+                "enriched": sum(1 for article in articles if article["enriched"]),
+                "partial": partial
             }
         except Exception as e:
             logger.error(f"Error fetching news: {str(e)}", exc_info=True)
@@ -154,65 +245,56 @@ class WebServer:
                 "error": str(e)
             }
     
-    async def filter_news(self, articles: List[Dict[str, Any]], keyword: Optional[str] = None, 
+    async def filter_news(self, articles: Optional[List[Dict[str, Any]]] = None, keyword: Optional[str] = None, 
                          start_date: Optional[str] = None, end_date: Optional[str] = None, 
-                         limit: Optional[int] = None) -> Dict[str, Any]:
+                         limit: Optional[int] = None, source: Optional[str] = None,
+                         articles_id: Optional[str] = None) -> Dict[str, Any]:
         """Filter news articles.
         
+        Articles are normalized and indexed once; repeated filtering of the
+        same article list reuses its index, and an ``articles_id`` from
+        fetch_news selects an indexed batch without sending the list.
+        
         Args:
-            articles: The articles to filter
+            articles: The articles to filter (default: the articles fetched by fetch_news)
             keyword: The keyword to filter by
             start_date: The start date to filter by
             end_date: The end date to filter by
             limit: The maximum number of results to return
+            source: The news source to filter by
+            articles_id: The id of a batch returned by fetch_news
             
         Returns:
             The filtered articles
         """
         try:
-            # Sanitize articles to ensure they can be JSON serialized
-            sanitized_articles = []
-            for article in articles:
-                sanitized_article = {
-                    "title": str(article.get("title", "")),
-                    "url": str(article.get("url", "")),
-                    "source": str(article.get("source", "")),
-                    "date": str(article.get("date", "")),
-                    "content": str(article.get("content", ""))
+            store = self.article_stores.find(articles_id) if articles_id else None
+            if store is None and articles_id and articles is None:
+                return {
+                    "status": "error",
+                    "error": f"Unknown or expired articles_id: {articles_id}"
                 }
-                sanitized_articles.append(sanitized_article)
-            
-            filtered_articles = []
-            
-            # Apply filters
-            for article in sanitized_articles:
-                # Keyword filter
-                if keyword and keyword.lower() not in article["title"].lower() and keyword.lower() not in article["content"].lower():
-                    continue
-                
-                # Date filter
-                if start_date or end_date:
-                    try:
-                        article_date = datetime.fromisoformat(article["date"].replace("Z", "+00:00"))
-                        
-                        if start_date:
-                            start = datetime.fromisoformat(start_date.replace("Z", "+00:00"))
-                            if article_date < start:
-                                continue
-                        
-                        if end_date:
-                            end = datetime.fromisoformat(end_date.replace("Z", "+00:00"))
-                            if article_date > end:
-                                continue
-                    except:
-                        # If date parsing fails, skip date filtering
-                        pass
-                
-                filtered_articles.append(article)
-            
-            # Apply limit
-            if limit:
-                filtered_articles = filtered_articles[:limit]
+            if store is None:
+                # Articles are only copied and indexed when their list has no store yet
+                store = (self.article_store if articles is None
+                         else self.article_stores.get(articles, prepare=self._sanitize_article))
+            
+            # Unparseable bounds are ignored, as are articles without a usable date
+            if start_date and math.isnan(parse_timestamp(start_date)):
+                logger.warning(f"Ignoring invalid start date: {start_date}")
+                start_date = None
+            if end_date and math.isnan(parse_timestamp(end_date)):
+                logger.warning(f"Ignoring invalid end date: {end_date}")
+                end_date = None
+            
+            filtered_articles = store.filter(
+                keyword=keyword,
+                source=source,
+                start=start_date,
+                end=end_date,
+                include_undated=True,
+                limit=limit
+            )
             
             return {
                 "status": "success",
@@ -226,6 +308,17 @@ class WebServer:
                 "error": str(e)
             }
     
+    @staticmethod
+    def _sanitize_article(article: Dict[str, Any]) -> Dict[str, str]:
+        """Copy an article with the fields filter_news returns, as strings."""
+        return {
+            "title": str(article.get("title", "")),
+            "url": str(article.get("url", "")),
+            "source": str(article.get("source", "")),
+            "date": str(article.get("date", "")),
+            "content": str(article.get("content", ""))
+        }
+    
     async def close(self):
         """Close the server."""
         await self.search_toolkit.close()
@@ -0,0 +1,23 @@
+"""
+OWL News package.
+This package contains the news-processing components shared by the news
+toolkits, the MCP web server and the news tool client.
+"""
+
+from .article_store import ArticleStore, ArticleStoreCache, parse_timestamp
+from .dedupe import MinHasher, dedupe_articles
+from .feed_cache import FeedCache, get_feed_cache, google_news_url, parse_feed
+from .feed_poller import FeedPoller
+
+__all__ = [
+    'ArticleStore',
+    'ArticleStoreCache',
+    'FeedCache',
+    'FeedPoller',
+    'MinHasher',
+    'dedupe_articles',
+    'get_feed_cache',
+    'google_news_url',
+    'parse_feed',
+    'parse_timestamp',
+]
@@ -0,0 +1,378 @@
+"""
+Columnar article store.
+Normalizes news articles once on ingest (epoch timestamps, lowercase text,
+token postings, source ids) so keyword, source and date-range filters are
+answered with index lookups and vectorized masks instead of per-call scans.
+"""
+
+import bisect
+import logging
+import math
+import re
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+TOKEN = re.compile(r"[a-z0-9]+")
+
+# Field names used by the different article producers, in order of preference
+TEXT_FIELDS = ("title", "content", "summary")
+DATE_FIELDS = ("date", "published")
+URL_FIELDS = ("url", "link")
+SOURCE_FIELD = "source"
+
+
+def parse_timestamp(value: Any) -> float:
+    """
+    Parse an article date into a UTC epoch timestamp.
+
+    Accepts datetimes, epoch numbers, ISO 8601 strings (with or without "Z"),
+    RFC 2822 strings as used by RSS feeds, and plain YYYY-MM-DD dates. Naive
+    values are taken as UTC.
+
+    Args:
+        value: The date value
+
+    Returns:
+        The timestamp, or NaN if the value cannot be parsed
+    """
+    if value is None or value == "":
+        return math.nan
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        text = str(value).strip()
+        try:
+            parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+        except ValueError:
+            try:
+                parsed = parsedate_to_datetime(text)
+            except (TypeError, ValueError, IndexError):
+                return math.nan
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _first(article: Dict[str, Any], fields: Sequence[str]) -> Any:
+    for field in fields:
+        value = article.get(field)
+        if value:
+            return value
+    return None
+
+
+def _source_name(article: Dict[str, Any]) -> str:
+    source = article.get(SOURCE_FIELD) or ""
+    # feedparser gives {"title": ..., "href": ...}
+    if isinstance(source, dict):
+        source = source.get("title") or source.get("href") or ""
+    return str(source)
+
+
+class ArticleStore:
+    """Array-backed article collection with keyword, source and date indexes.
+
+    Articles are kept in insertion order. Columns are plain lists while
+    articles are ingested and are frozen into NumPy arrays on the first query
+    after a change.
+
+    Args:
+        articles: Articles to ingest
+        unique_urls: Whether to skip articles whose URL is already stored
+        max_articles: Maximum number of articles kept; the oldest are dropped
+            when an ingest goes over it (default: unbounded)
+    """
+
+    def __init__(self, articles: Optional[Iterable[Dict[str, Any]]] = None, unique_urls: bool = True,
+                 max_articles: Optional[int] = None):
+        self.unique_urls = unique_urls
+        self.max_articles = max_articles
+        self._clear()
+        if articles:
+            self.add(articles)
+
+    def _clear(self):
+        self.articles: List[Dict[str, Any]] = []
+        self.texts: List[str] = []
+        self._timestamps: List[float] = []
+        self._source_ids: List[int] = []
+        self.source_names: List[str] = []
+        self._source_lookup: Dict[str, int] = {}
+        self._postings: Dict[str, List[int]] = {}
+        self._row_by_url: Dict[str, int] = {}
+        self._dirty = True
+
+    def __len__(self) -> int:
+        return len(self.articles)
+
+    def add(self, articles: Iterable[Dict[str, Any]]) -> int:
+        """
+        Ingest articles.
+
+        Args:
+            articles: Article dicts with title/content or summary, date or
+                published, url or link, and source fields
+
+        Returns:
+            The number of articles added
+        """
+        added = 0
+        for article in articles:
+            row = len(self.articles)
+            if self.unique_urls:
+                url = _first(article, URL_FIELDS)
+                if url and url in self._row_by_url:
+                    continue
+                if url:
+                    self._row_by_url[url] = row
+
+            text = "\n".join(str(article.get(field) or "") for field in TEXT_FIELDS).lower()
+            for token in set(TOKEN.findall(text)):
+                self._postings.setdefault(token, []).append(row)
+
+            source = _source_name(article).lower()
+            source_id = self._source_lookup.get(source)
+            if source_id is None:
+                source_id = len(self.source_names)
+                self._source_lookup[source] = source_id
+                self.source_names.append(source)
+
+            self.articles.append(article)
+            self.texts.append(text)
+            self._timestamps.append(parse_timestamp(_first(article, DATE_FIELDS)))
+            self._source_ids.append(source_id)
+            added += 1
+        if added:
+            self._dirty = True
+        if self.max_articles is not None and len(self.articles) > self.max_articles:
+            # Row numbers are baked into every index, so re-ingest the newest articles
+            kept = self.articles[-self.max_articles:]
+            self._clear()
+            self.add(kept)
+        return added
+
+    def _freeze(self):
+        """Build the array columns and the sorted indexes."""
+        if not self._dirty:
+            return
+        self.timestamps = np.array(self._timestamps, dtype=np.float64)
+        self.source_ids = np.array(self._source_ids, dtype=np.int32)
+        self.postings = {token: np.array(rows, dtype=np.int64) for token, rows in self._postings.items()}
+        self.vocabulary = sorted(self.postings)
+        dated = ~np.isnan(self.timestamps)
+        self.dated_rows = np.flatnonzero(dated)
+        order = np.argsort(self.timestamps[self.dated_rows], kind="stable")
+        self.dated_rows = self.dated_rows[order]
+        self.sorted_timestamps = self.timestamps[self.dated_rows]
+        self.undated_rows = np.flatnonzero(~dated)
+        self._dirty = False
+
+    def _token_rows(self, token: str) -> np.ndarray:
+        """Rows containing a word that starts with ``token``."""
+        index = bisect.bisect_left(self.vocabulary, token)
+        matches = []
+        while index < len(self.vocabulary) and self.vocabulary[index].startswith(token):
+            matches.append(self.postings[self.vocabulary[index]])
+            index += 1
+        if not matches:
+            return np.empty(0, dtype=np.int64)
+        if len(matches) == 1:
+            return matches[0]
+        return np.unique(np.concatenate(matches))
+
+    def keyword_rows(self, keyword: str, verify: bool = True) -> np.ndarray:
+        """
+        Find the rows whose title or text contains a keyword.
+
+        Words are matched through the token index (a query word also matches
+        longer words it is a prefix of); multi-word keywords are then checked
+        as a phrase on the candidate rows only.
+
+        Args:
+            keyword: The keyword or phrase
+            verify: Whether to run the phrase check; without it the result
+                may contain rows with the words in another order
+
+        Returns:
+            Sorted row numbers
+        """
+        self._freeze()
+        needle = keyword.lower().strip()
+        tokens = TOKEN.findall(needle)
+        if not tokens:
+            return np.array([row for row, text in enumerate(self.texts) if needle in text], dtype=np.int64)
+
+        rows = None
+        for token in sorted(set(tokens), key=len, reverse=True):
+            token_rows = self._token_rows(token)
+            rows = token_rows if rows is None else np.intersect1d(rows, token_rows, assume_unique=True)
+            if not len(rows):
+                return rows
+        if verify:
+            rows = self._verify_phrase(rows, needle, tokens)
+        return rows
+
+    def _verify_phrase(self, rows: np.ndarray, needle: str, tokens: List[str]) -> np.ndarray:
+        # A single whole word needs no check: the index match implies it
+        if needle == tokens[0]:
+            return rows
+        return np.array([row for row in rows if needle in self.texts[row]], dtype=np.int64)
+
+    def date_rows(self, start: Optional[float] = None, end: Optional[float] = None,
+                  include_undated: bool = False) -> np.ndarray:
+        """
+        Find the rows dated within ``[start, end]`` with a binary search.
+
+        Args:
+            start: Earliest epoch timestamp
+            end: Latest epoch timestamp
+            include_undated: Whether articles without a parseable date match
+
+        Returns:
+            Sorted row numbers
+        """
+        self._freeze()
+        lo = 0 if start is None else np.searchsorted(self.sorted_timestamps, start, side="left")
+        hi = len(self.sorted_timestamps) if end is None else np.searchsorted(self.sorted_timestamps, end, side="right")
+        rows = self.dated_rows[lo:hi]
+        if include_undated:
+            rows = np.concatenate([rows, self.undated_rows])
+        return np.sort(rows)
+
+    def source_rows(self, source: str) -> np.ndarray:
+        """Find the rows whose source name contains ``source`` (case-insensitive)."""
+        self._freeze()
+        needle = source.lower()
+        ids = [source_id for source_id, name in enumerate(self.source_names) if needle in name]
+        return np.flatnonzero(np.isin(self.source_ids, ids))
+
+    def filter(
+        self,
+        keyword: Optional[str] = None,
+        source: Optional[str] = None,
+        start: Any = None,
+        end: Any = None,
+        include_undated: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Filter articles; all given criteria must match.
+
+        Args:
+            keyword: Keyword or phrase in the title or text
+            source: Substring of the source name
+            start: Earliest date (anything parse_timestamp accepts)
+            end: Latest date (anything parse_timestamp accepts)
+            include_undated: Whether undated articles pass a date filter
+            limit: Maximum number of articles to return
+
+        Returns:
+            The matching articles in insertion order
+        """
+        rows = self.filter_rows(keyword, source, start, end, include_undated)
+        if limit:
+            rows = rows[:limit]
+        return [self.articles[row] for row in rows]
+
+    def filter_rows(self, keyword: Optional[str] = None, source: Optional[str] = None,
+                    start: Any = None, end: Any = None, include_undated: bool = False) -> np.ndarray:
+        """Like filter(), but return the matching row numbers."""
+        self._freeze()
+        rows: Optional[np.ndarray] = None
+        if keyword:
+            # The phrase check runs last, on the smallest candidate set
+            rows = self.keyword_rows(keyword, verify=False)
+        if source and (rows is None or len(rows)):
+            source_rows = self.source_rows(source)
+            rows = source_rows if rows is None else np.intersect1d(rows, source_rows, assume_unique=True)
+        if (start or end) and (rows is None or len(rows)):
+            start_ts = parse_timestamp(start) if start else None
+            end_ts = parse_timestamp(end) if end else None
+            if (start_ts is not None and math.isnan(start_ts)) or (end_ts is not None and math.isnan(end_ts)):
+                raise ValueError(f"Invalid date range: {start!r} to {end!r}")
+            date_rows = self.date_rows(start_ts, end_ts, include_undated)
+            rows = date_rows if rows is None else np.intersect1d(rows, date_rows, assume_unique=True)
+        if keyword and len(rows):
+            needle = keyword.lower().strip()
+            tokens = TOKEN.findall(needle)
+            if tokens:
+                rows = self._verify_phrase(rows, needle, tokens)
+        if rows is None:
+            rows = np.arange(len(self.articles))
+        return rows
+
+
+def fingerprint(articles: Sequence[Dict[str, Any]]) -> int:
+    """Identify an article list by every field the store indexes or filters on."""
+    return hash(tuple(
+        (_first(article, URL_FIELDS), _first(article, DATE_FIELDS), _source_name(article),
+         *(str(article.get(field) or "") for field in TEXT_FIELDS))
+        for article in articles
+    ))
+
+
+class ArticleStoreCache:
+    """LRU of stores keyed by article-list fingerprint.
+
+    Lets callers that receive the same article list repeatedly (e.g. over a
+    request/response API) reuse its indexes instead of re-ingesting it. The
+    stores keep every article of the list, duplicates included. Each store
+    also has a string id that callers can hand out and look up later without
+    sending the list again.
+
+    Args:
+        max_stores: Number of stores kept
+    """
+
+    def __init__(self, max_stores: int = 8):
+        self.max_stores = max_stores
+        self.stores: "OrderedDict[str, ArticleStore]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(articles: Sequence[Dict[str, Any]]) -> str:
+        """The id of the store for an article list."""
+        return f"{fingerprint(articles) & 0xFFFFFFFFFFFFFFFF:016x}"
+
+    def find(self, key: str) -> Optional[ArticleStore]:
+        """Return the store with a given id, or None if it was evicted or never built."""
+        store = self.stores.get(key)
+        if store is not None:
+            self.stores.move_to_end(key)
+            self.hits += 1
+        return store
+
+    def get(self, articles: Sequence[Dict[str, Any]],
+            prepare: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None) -> ArticleStore:
+        """
+        Return the store for an article list, building it on first use.
+
+        Args:
+            articles: The article list
+            prepare: Optional function applied to each article before it is
+                ingested; it only runs when the store is built
+
+        Returns:
+            The store
+        """
+        key = self.key(articles)
+        store = self.find(key)
+        if store is not None:
+            return store
+        self.misses += 1
+        if prepare is not None:
+            articles = [prepare(article) for article in articles]
+        store = ArticleStore(articles, unique_urls=False)
+        self.stores[key] = store
+        while len(self.stores) > self.max_stores:
+            self.stores.popitem(last=False)
+        return store
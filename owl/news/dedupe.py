@@ -0,0 +1,215 @@
+"""
+Near-duplicate article clustering.
+Syndicated copies of a story are grouped with MinHash signatures over the
+title and summary words and a banded LSH index, so only one representative
+per story reaches an LLM prompt.
+"""
+
+import logging
+import re
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from owl.text.keywords import STOPWORDS
+
+logger = logging.getLogger(__name__)
+
+TAG = re.compile(r"<[^>]+>")
+ENTITY = re.compile(r"&[#a-z0-9]+;")
+WORD = re.compile(r"[a-z0-9]+")
+# Google News titles end with " - Publisher"
+SOURCE_SUFFIX = re.compile(r"\s+[-|–—]\s+[^-|–—]{1,60}$")
+
+
+def article_text(article: Dict[str, Any]) -> str:
+    """Title and summary of an article as plain text, without the publisher suffix."""
+    title = SOURCE_SUFFIX.sub("", str(article.get("title") or ""))
+    summary = article.get("summary") or article.get("content") or ""
+    summary = ENTITY.sub(" ", TAG.sub(" ", str(summary)))
+    return f"{title} {summary}"
+
+
+def _stem(word: str) -> str:
+    # Crude plural/verb folding so "shares soar" meets "share soars"
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def shingles(text: str) -> set:
+    """Stemmed content words of a text."""
+    return {_stem(word) for word in WORD.findall(text.lower()) if word not in STOPWORDS}
+
+
+class MinHasher:
+    """MinHash signatures and banded LSH clustering.
+
+    With ``bands`` bands of ``num_perm / bands`` rows, pairs whose Jaccard
+    similarity is around ``(1 / bands) ** (bands / num_perm)`` or more
+    become candidates (about 0.42 with the defaults, so pairs at
+    ``threshold`` are found with 99% probability). Candidates are then
+    verified with their exact Jaccard similarity.
+
+    Headlines that differ by a swapped word ("Fed raises rates" / "Fed cuts
+    rates") are different stories, and in short texts one swapped word still
+    leaves a high similarity. Pairs where each text has words the other
+    lacks therefore need ``short_threshold`` when the smaller text has fewer
+    than ``min_shingles`` words.
+
+    Args:
+        num_perm: Number of hash permutations per signature
+        bands: Number of LSH bands (must divide num_perm)
+        threshold: Minimum Jaccard similarity of duplicates
+        min_shingles: Texts with fewer words count as short
+        short_threshold: Minimum similarity of short texts that both have
+            words the other lacks
+        seed: Seed of the permutations
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 32, threshold: float = 0.6,
+                 min_shingles: int = 8, short_threshold: float = 0.8, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("bands must divide num_perm")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.min_shingles = min_shingles
+        self.short_threshold = short_threshold
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hash functions: (a * x + b) >> 32 with odd a, wrapping at 64 bits
+        self.a = rng.integers(1, 1 << 63, num_perm, dtype=np.uint64) | np.uint64(1)
+        self.b = rng.integers(0, 1 << 63, num_perm, dtype=np.uint64)
+        self.band_weights = rng.integers(1, 1 << 63, self.rows, dtype=np.uint64) | np.uint64(1)
+
+    def _hash(self, features: Sequence[str]) -> np.ndarray:
+        # Signatures are only compared within one process, so the built-in string hash will do
+        hashes = np.fromiter(map(hash, features), dtype=np.int64, count=len(features))
+        return hashes.view(np.uint64)
+
+    def _permute(self, hashes: np.ndarray) -> np.ndarray:
+        return (hashes[:, None] * self.a + self.b) >> np.uint64(32)
+
+    def signature(self, features: set) -> Optional[np.ndarray]:
+        """MinHash signature of a feature set, or None for an empty set."""
+        if not features:
+            return None
+        return self._permute(self._hash(features)).min(axis=0)
+
+    def signatures(self, feature_sets: Sequence[set]) -> np.ndarray:
+        """
+        MinHash signatures of many feature sets at once.
+
+        Args:
+            feature_sets: Non-empty feature sets
+
+        Returns:
+            Array of shape (len(feature_sets), num_perm)
+        """
+        counts = np.array([len(features) for features in feature_sets])
+        hashes = self._hash([feature for features in feature_sets for feature in features])
+        permuted = self._permute(hashes)
+        offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        return np.minimum.reduceat(permuted, offsets, axis=0)
+
+    def _candidate_pairs(self, signatures: np.ndarray) -> np.ndarray:
+        """Pairs of rows that share an LSH bucket and are plausibly similar enough."""
+        n = len(signatures)
+        # One integer key per band; colliding keys only add candidates, which are verified below
+        bands = signatures.reshape(n, self.bands, self.rows)
+        keys = (bands * self.band_weights).sum(axis=2)
+        order = np.argsort(keys, axis=0, kind="stable")
+        sorted_keys = np.take_along_axis(keys, order, axis=0)
+        same = sorted_keys[1:] == sorted_keys[:-1]
+        # Neighbours within a bucket chain all of its members together
+        first, second = order[:-1][same], order[1:][same]
+        if not len(first):
+            return np.empty((0, 2), dtype=np.int64)
+        pairs = np.unique(np.stack([np.minimum(first, second), np.maximum(first, second)], axis=1), axis=0)
+        # Loose pre-filter on the estimate; the exact check happens in is_duplicate
+        similarity = (signatures[pairs[:, 0]] == signatures[pairs[:, 1]]).mean(axis=1)
+        return pairs[similarity >= self.threshold - 0.15]
+
+    def is_duplicate(self, a: set, b: set) -> bool:
+        """Whether two feature sets describe the same story."""
+        common = len(a & b)
+        similarity = common / (len(a) + len(b) - common)
+        if common < len(a) and common < len(b) and min(len(a), len(b)) < self.min_shingles:
+            return similarity >= self.short_threshold
+        return similarity >= self.threshold
+
+    def cluster(self, texts: Sequence[str]) -> List[List[int]]:
+        """
+        Group near-duplicate texts.
+
+        Args:
+            texts: The texts
+
+        Returns:
+            Clusters of text indexes, ordered by their first member
+        """
+        parent = list(range(len(texts)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        feature_sets = [shingles(text) for text in texts]
+        # Texts without content words stay on their own
+        indexes = np.array([i for i, features in enumerate(feature_sets) if features], dtype=np.int64)
+        if len(indexes) > 1:
+            signatures = self.signatures([feature_sets[i] for i in indexes])
+            for a, b in self._candidate_pairs(signatures):
+                a, b = int(indexes[a]), int(indexes[b])
+                if not self.is_duplicate(feature_sets[a], feature_sets[b]):
+                    continue
+                root, other_root = find(a), find(b)
+                if root != other_root:
+                    parent[max(root, other_root)] = min(root, other_root)
+
+        clusters: Dict[int, List[int]] = {}
+        for index in range(len(texts)):
+            clusters.setdefault(find(index), []).append(index)
+        return sorted(clusters.values(), key=lambda members: members[0])
+
+
+_default_hasher: Optional[MinHasher] = None
+
+
+def dedupe_articles(articles: Sequence[Dict[str, Any]], hasher: Optional[MinHasher] = None) -> List[Dict[str, Any]]:
+    """
+    Keep one article per story.
+
+    The first article of each cluster (the highest ranked in feed order) is
+    the representative. It is returned as a copy with ``duplicates`` (the
+    number of other copies) and, when sources are known, ``sources`` (all
+    publishers of the story).
+
+    Args:
+        articles: Articles with title and summary or content
+        hasher: MinHasher to use (default: 128 permutations, 32 bands, 0.6 threshold)
+
+    Returns:
+        The representatives, in the original order
+    """
+    global _default_hasher
+    if hasher is None:
+        if _default_hasher is None:
+            _default_hasher = MinHasher()
+        hasher = _default_hasher
+    clusters = hasher.cluster([article_text(article) for article in articles])
+    representatives = []
+    for members in clusters:
+        representative = dict(articles[members[0]])
+        representative["duplicates"] = len(members) - 1
+        sources = [str(articles[i].get("source") or "") for i in members]
+        sources = list(dict.fromkeys(source for source in sources if source))
+        if sources:
+            representative["sources"] = sources
+        representatives.append(representative)
+    if len(representatives) < len(articles):
+        logger.debug(f"Collapsed {len(articles)} articles into {len(representatives)} stories")
+    return representatives
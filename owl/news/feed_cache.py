@@ -0,0 +1,250 @@
+"""
+RSS feed cache.
+Keeps the entries of each feed URL in memory, deduplicated by GUID or link.
+Feeds checked within the freshness window are served from memory; older
+ones are revalidated with conditional requests (ETag / Last-Modified) and
+new entries are merged into what is already stored.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Optional
+
+import feedparser
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_NEWS_RSS = "https://news.google.com/rss/search?q={query}&hl=en-US&gl=US&ceid=US:en"
+
+
+def google_news_url(query: str) -> str:
+    """Build the Google News RSS search URL for a query."""
+    return GOOGLE_NEWS_RSS.format(query=urllib.parse.quote(query))
+
+
+def _entry_dict(entry: Dict[str, Any]) -> Dict[str, Any]:
+    source = entry.get("source") or {}
+    return {
+        "id": entry.get("id") or entry.get("link") or entry.get("title", ""),
+        "title": entry.get("title", ""),
+        "link": entry.get("link", ""),
+        "published": entry.get("published", ""),
+        "summary": entry.get("summary", ""),
+        "source": source.get("title", "") if isinstance(source, dict) else str(source),
+    }
+
+
+def parse_feed(data: Any) -> List[Dict[str, Any]]:
+    """
+    Parse a feed document into plain entry dicts.
+
+    Module level so it can run in a thread or process pool.
+
+    Args:
+        data: The feed document (bytes or str)
+
+    Returns:
+        Entries with id, title, link, published, summary and source keys
+    """
+    return [_entry_dict(entry) for entry in feedparser.parse(data).entries]
+
+
+class _Feed:
+    """Cached state of one feed URL."""
+
+    def __init__(self):
+        self.entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.etag: Optional[str] = None
+        self.modified: Optional[str] = None
+        self.checked = 0.0
+        self.error: Optional[str] = None
+        self.lock = threading.Lock()
+        self.pending: Optional[asyncio.Future] = None
+
+
+class FeedCache:
+    """Conditional-GET feed cache shared by the news toolkits and clients.
+
+    Thread-safe for the synchronous get(); aget() coalesces concurrent
+    revalidations of the same feed into one request.
+
+    Args:
+        freshness: Seconds a feed is served from memory before it is revalidated
+        max_feeds: Number of feed URLs kept (least recently used are dropped)
+        max_entries: Number of entries kept per feed (oldest are dropped)
+    """
+
+    def __init__(self, freshness: float = 120.0, max_feeds: int = 256, max_entries: int = 200):
+        self.freshness = freshness
+        self.max_feeds = max_feeds
+        self.max_entries = max_entries
+        self.feeds: "OrderedDict[str, _Feed]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.not_modified = 0
+        self.fetches = 0
+        self.errors = 0
+
+    def _feed(self, url: str) -> _Feed:
+        with self.lock:
+            feed = self.feeds.get(url)
+            if feed is None:
+                feed = self.feeds[url] = _Feed()
+                while len(self.feeds) > self.max_feeds:
+                    self.feeds.popitem(last=False)
+            else:
+                self.feeds.move_to_end(url)
+            return feed
+
+    def _is_fresh(self, feed: _Feed) -> bool:
+        return bool(feed.checked) and time.monotonic() - feed.checked < self.freshness
+
+    def is_fresh(self, url: str) -> bool:
+        """Whether a feed is cached and within its freshness window."""
+        with self.lock:
+            feed = self.feeds.get(url)
+        return feed is not None and self._is_fresh(feed)
+
+    def _merge(self, feed: _Feed, entries: List[Dict[str, Any]]):
+        """Put the feed's current entries first, keeping older ones after them."""
+        merged: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        for entry in entries:
+            merged[entry["id"]] = entry
+        added = sum(1 for key in merged if key not in feed.entries)
+        for key, entry in feed.entries.items():
+            if key not in merged and len(merged) < self.max_entries:
+                merged[key] = entry
+        while len(merged) > self.max_entries:
+            merged.popitem()
+        feed.entries = merged
+        logger.debug(f"Feed refreshed with {added} new of {len(entries)} entries")
+
+    def _record(self, feed: _Feed, status: Optional[int], entries: Optional[List[Dict[str, Any]]],
+                etag: Optional[str], modified: Optional[str]):
+        feed.checked = time.monotonic()
+        feed.error = None
+        if status == 304:
+            self.not_modified += 1
+            return
+        self.fetches += 1
+        feed.etag = etag
+        feed.modified = modified
+        self._merge(feed, entries or [])
+
+    def get(self, url: str, force: bool = False) -> List[Dict[str, Any]]:
+        """
+        Return the entries of a feed, revalidating it when it is stale.
+
+        Args:
+            url: The feed URL
+            force: Revalidate even within the freshness window
+
+        Returns:
+            The feed's entries, newest feed order first
+        """
+        feed = self._feed(url)
+        with feed.lock:
+            if not force and self._is_fresh(feed):
+                self.hits += 1
+                return list(feed.entries.values())
+            try:
+                parsed = feedparser.parse(url, etag=feed.etag, modified=feed.modified)
+                if parsed.get("bozo") and not parsed.entries and "status" not in parsed:
+                    raise parsed.get("bozo_exception") or ValueError("Feed could not be fetched")
+                self._record(
+                    feed, parsed.get("status"), [_entry_dict(entry) for entry in parsed.entries],
+                    parsed.get("etag"), parsed.get("modified")
+                )
+            except Exception as e:
+                self.errors += 1
+                feed.error = str(e)
+                logger.warning(f"Error refreshing feed {url}, serving cached entries: {str(e)}")
+            return list(feed.entries.values())
+
+    async def aget(self, url: str, session: Any, executor: Optional[Executor] = None,
+                   force: bool = False) -> List[Dict[str, Any]]:
+        """
+        Return the entries of a feed without blocking the event loop.
+
+        Args:
+            url: The feed URL
+            session: The aiohttp session to fetch with
+            executor: Executor for parsing (default: the loop's default executor)
+            force: Revalidate even within the freshness window
+
+        Returns:
+            The feed's entries, newest feed order first
+        """
+        feed = self._feed(url)
+        if not force and self._is_fresh(feed):
+            self.hits += 1
+            return list(feed.entries.values())
+        if feed.pending is None or feed.pending.done():
+            feed.pending = asyncio.ensure_future(self._arefresh(url, feed, session, executor))
+        await asyncio.shield(feed.pending)
+        return list(feed.entries.values())
+
+    async def _arefresh(self, url: str, feed: _Feed, session: Any, executor: Optional[Executor]):
+        headers = {}
+        if feed.etag:
+            headers["If-None-Match"] = feed.etag
+        if feed.modified:
+            headers["If-Modified-Since"] = feed.modified
+        try:
+            async with session.get(url, headers=headers) as response:
+                if response.status == 304:
+                    self._record(feed, 304, None, None, None)
+                    return
+                response.raise_for_status()
+                data = await response.read()
+                etag = response.headers.get("ETag")
+                modified = response.headers.get("Last-Modified")
+            loop = asyncio.get_running_loop()
+            entries = await loop.run_in_executor(executor, parse_feed, data)
+            self._record(feed, response.status, entries, etag, modified)
+        except Exception as e:
+            self.errors += 1
+            feed.error = str(e)
+            logger.warning(f"Error refreshing feed {url}, serving cached entries: {str(e)}")
+
+    async def arefresh(self, url: str, session: Any, executor: Optional[Executor] = None) -> bool:
+        """
+        Revalidate a feed now, regardless of its freshness.
+
+        Args:
+            url: The feed URL
+            session: The aiohttp session to fetch with
+            executor: Executor for parsing (default: the loop's default executor)
+
+        Returns:
+            Whether the refresh succeeded
+        """
+        await self.aget(url, session, executor, force=True)
+        return self.feeds[url].error is None if url in self.feeds else False
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache usage statistics."""
+        return {
+            "feeds": len(self.feeds),
+            "entries": sum(len(feed.entries) for feed in list(self.feeds.values())),
+            "hits": self.hits,
+            "not_modified": self.not_modified,
+            "fetches": self.fetches,
+            "errors": self.errors,
+        }
+
+
+_default_cache: Optional[FeedCache] = None
+
+
+def get_feed_cache() -> FeedCache:
+    """Return the process-wide feed cache shared by the news toolkits."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = FeedCache()
+    return _default_cache
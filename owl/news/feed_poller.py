@@ -0,0 +1,162 @@
+"""
+Background feed poller.
+Keeps the feeds of a set of topics warm in a FeedCache by revalidating them
+on a schedule, so news requests for those topics are answered from memory
+instead of waiting for an RSS fetch.
+"""
+
+import asyncio
+import logging
+import random
+from concurrent.futures import Executor
+from typing import Any, Dict, Iterable, List, Optional
+
+import aiohttp
+
+from .feed_cache import FeedCache, get_feed_cache, google_news_url
+
+logger = logging.getLogger(__name__)
+
+
+class FeedPoller:
+    """Refreshes topic feeds in the background with jitter and backoff.
+
+    Each topic is polled by its own task. Polls are spread out with random
+    jitter, failing topics back off exponentially up to ``max_backoff``, and
+    at most ``max_concurrency`` refreshes run at once. The interval defaults
+    to three quarters of the cache's freshness window, so polled topics
+    never go stale between polls.
+
+    Args:
+        topics: The topics to keep warm
+        feed_cache: The cache to fill (default: the process-wide cache)
+        interval: Seconds between polls of a topic
+        jitter: Relative random spread applied to every delay (0.1 = +/-10%)
+        max_backoff: Longest delay in seconds after repeated failures
+        max_concurrency: Maximum number of feeds refreshed at once
+        session: aiohttp session to fetch with (default: one owned by the poller)
+        executor: Executor for feed parsing (default: the loop's default executor)
+    """
+
+    def __init__(
+        self,
+        topics: Iterable[str],
+        feed_cache: Optional[FeedCache] = None,
+        interval: Optional[float] = None,
+        jitter: float = 0.1,
+        max_backoff: float = 1800.0,
+        max_concurrency: int = 4,
+        session: Optional[aiohttp.ClientSession] = None,
+        executor: Optional[Executor] = None,
+    ):
+        self.topics: List[str] = list(dict.fromkeys(topics))
+        self.feed_cache = feed_cache or get_feed_cache()
+        self.interval = interval if interval is not None else self.feed_cache.freshness * 0.75
+        self.jitter = jitter
+        self.max_backoff = max_backoff
+        self.max_concurrency = max_concurrency
+        self.session = session
+        self.owns_session = session is None
+        self.executor = executor
+        self.tasks: Dict[str, asyncio.Task] = {}
+        self.failures: Dict[str, int] = {}
+        self.polls = 0
+        self.semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self.tasks)
+
+    def _delay(self, topic: str) -> float:
+        failures = self.failures.get(topic, 0)
+        delay = min(self.interval * (2 ** failures), max(self.max_backoff, self.interval))
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    async def refresh(self, topic: str) -> bool:
+        """
+        Refresh one topic's feed now.
+
+        Args:
+            topic: The topic
+
+        Returns:
+            Whether the refresh succeeded
+        """
+        async with self.semaphore:
+            ok = await self.feed_cache.arefresh(google_news_url(topic), self.session, self.executor)
+        self.polls += 1
+        if ok:
+            self.failures.pop(topic, None)
+        else:
+            self.failures[topic] = self.failures.get(topic, 0) + 1
+            logger.warning(f"Polling news for {topic} failed {self.failures[topic]} time(s) in a row")
+        return ok
+
+    async def _poll(self, topic: str, initial_delay: float):
+        await asyncio.sleep(initial_delay)
+        while True:
+            try:
+                await self.refresh(topic)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failures[topic] = self.failures.get(topic, 0) + 1
+                logger.error(f"Error polling news for {topic}: {str(e)}", exc_info=True)
+            await asyncio.sleep(self._delay(topic))
+
+    async def start(self, warm: bool = True):
+        """
+        Start polling.
+
+        Args:
+            warm: Refresh every topic before returning, so the first
+                requests are already served from memory
+        """
+        if self.running:
+            return
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=15))
+            self.owns_session = True
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        if warm:
+            await asyncio.gather(*(self.refresh(topic) for topic in self.topics))
+        for topic in self.topics:
+            # Spread the first polls over the interval so topics do not refresh in lockstep
+            initial = self._delay(topic) if warm else random.uniform(0, self.interval * self.jitter)
+            self.tasks[topic] = asyncio.create_task(self._poll(topic, initial))
+        logger.info(f"Polling news for {len(self.topics)} topics every ~{self.interval:.0f}s")
+
+    async def stop(self):
+        """Stop polling and close the poller's own session."""
+        tasks = list(self.tasks.values())
+        self.tasks.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # Refreshes are shielded from cancellation; let them finish before closing their session
+        pending = []
+        for topic in self.topics:
+            feed = self.feed_cache.feeds.get(google_news_url(topic))
+            if feed is not None and feed.pending is not None and not feed.pending.done():
+                pending.append(feed.pending)
+        await asyncio.gather(*pending, return_exceptions=True)
+        if self.owns_session and self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self) -> "FeedPoller":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any):
+        await self.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return polling statistics."""
+        return {
+            "topics": len(self.topics),
+            "running": self.running,
+            "polls": self.polls,
+            "failing": {topic: count for topic, count in self.failures.items() if count},
+            "cache": self.feed_cache.stats(),
+        }
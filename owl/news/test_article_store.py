@@ -0,0 +1,92 @@
+from owl.news.article_store import ArticleStore, ArticleStoreCache, parse_timestamp
+
+ARTICLES = [
+    {"title": "Tesla stock rises after deliveries", "url": "https://a/1", "source": "Reuters",
+     "date": "2025-01-02T10:00:00Z", "content": "Electric vehicle maker beats estimates."},
+    {"title": "Fed holds interest rates", "link": "https://b/2", "source": {"title": "CNBC"},
+     "published": "Fri, 03 Jan 2025 14:00:00 GMT", "summary": "Central bank keeps rates steady."},
+    {"title": "Tesla recalls vehicles", "url": "https://c/3", "source": "AP",
+     "date": "2025-01-05", "content": "Recall covers older models."},
+    {"title": "Undated tesla rumor", "url": "https://d/4", "source": "Blog", "content": "No date here."},
+]
+
+
+def _titles(articles):
+    return [article["title"] for article in articles]
+
+
+def test_parse_timestamp_formats():
+    assert parse_timestamp("2025-01-02") == parse_timestamp("2025-01-02T00:00:00Z")
+    assert parse_timestamp("Thu, 02 Jan 2025 00:00:00 GMT") == parse_timestamp("2025-01-02")
+    assert parse_timestamp("not a date") != parse_timestamp("not a date")  # NaN
+
+
+def test_keyword_prefix_and_phrase():
+    store = ArticleStore(ARTICLES)
+    assert _titles(store.filter(keyword="tesla")) == [
+        "Tesla stock rises after deliveries", "Tesla recalls vehicles", "Undated tesla rumor"]
+    # Query words match longer words they are a prefix of
+    assert _titles(store.filter(keyword="recall")) == ["Tesla recalls vehicles"]
+    assert _titles(store.filter(keyword="interest rates")) == ["Fed holds interest rates"]
+    assert store.filter(keyword="rates interest") == []
+
+
+def test_source_and_date_filters():
+    store = ArticleStore(ARTICLES)
+    assert _titles(store.filter(source="cnbc")) == ["Fed holds interest rates"]
+    assert _titles(store.filter(start="2025-01-03", end="2025-01-04")) == ["Fed holds interest rates"]
+    assert _titles(store.filter(keyword="tesla", start="2025-01-04", include_undated=True)) == [
+        "Tesla recalls vehicles", "Undated tesla rumor"]
+    assert len(store.filter(limit=2)) == 2
+
+
+def test_unique_urls_and_incremental_add():
+    store = ArticleStore(ARTICLES[:2])
+    assert store.add(ARTICLES) == 2
+    assert len(store) == 4
+    assert _titles(store.filter(keyword="recalls")) == ["Tesla recalls vehicles"]
+
+
+def test_max_articles_keeps_newest():
+    store = ArticleStore(max_articles=2)
+    for article in ARTICLES:
+        store.add([article])
+    assert len(store) == 2
+    assert _titles(store.filter(keyword="tesla")) == ["Tesla recalls vehicles", "Undated tesla rumor"]
+    assert store.filter(keyword="fed") == []
+
+
+def test_cache_reuses_store_and_tracks_filtered_fields():
+    cache = ArticleStoreCache(max_stores=2)
+    first = cache.get(ARTICLES)
+    assert cache.get([dict(article) for article in ARTICLES]) is first
+    changed = [dict(article) for article in ARTICLES]
+    changed[1]["summary"] = "Central bank cuts rates."
+    assert cache.get(changed) is not first
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_cache_prepares_only_on_miss_and_finds_by_id():
+    cache = ArticleStoreCache()
+    prepared = []
+
+    def prepare(article):
+        prepared.append(article)
+        return dict(article)
+
+    store = cache.get(ARTICLES, prepare=prepare)
+    cache.get(ARTICLES, prepare=prepare)
+    assert len(prepared) == len(ARTICLES)
+    assert cache.find(cache.key(ARTICLES)) is store
+    assert cache.find("0000000000000000") is None
+
+
+if __name__ == "__main__":
+    test_parse_timestamp_formats()
+    test_keyword_prefix_and_phrase()
+    test_source_and_date_filters()
+    test_unique_urls_and_incremental_add()
+    test_max_articles_keeps_newest()
+    test_cache_reuses_store_and_tracks_filtered_fields()
+    test_cache_prepares_only_on_miss_and_finds_by_id()
+    print("Article store checks passed")
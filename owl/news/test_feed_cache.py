@@ -0,0 +1,132 @@
+import asyncio
+
+from owl.news.feed_cache import FeedCache, google_news_url
+from owl.news.feed_poller import FeedPoller
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>News</title>
+<item><guid>1</guid><title>First story</title><link>https://a/1</link></item>
+<item><guid>2</guid><title>Second story</title><link>https://a/2</link></item>
+</channel></rss>"""
+
+RSS_UPDATED = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>News</title>
+<item><guid>3</guid><title>Third story</title><link>https://a/3</link></item>
+</channel></rss>"""
+
+
+class FakeResponse:
+    def __init__(self, status, body=b"", headers=None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+    async def __aenter__(self):
+        await asyncio.sleep(0.01)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise RuntimeError(f"HTTP {self.status}")
+
+    async def read(self):
+        return self.body
+
+
+class FakeSession:
+    """Serves queued responses and records the request headers."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+        self.closed = False
+
+    def get(self, url, headers=None):
+        self.requests.append(headers or {})
+        return self.responses.pop(0)
+
+
+def test_concurrent_requests_share_one_fetch():
+    async def main():
+        cache = FeedCache()
+        session = FakeSession(FakeResponse(200, RSS, {"ETag": '"v1"'}))
+        url = google_news_url("technology")
+        results = await asyncio.gather(*(cache.aget(url, session) for _ in range(5)))
+        assert len(session.requests) == 1
+        assert all([entry["title"] for entry in entries] == ["First story", "Second story"] for entries in results)
+        assert cache.is_fresh(url)
+        # Served from memory within the freshness window
+        await cache.aget(url, session)
+        assert cache.stats()["hits"] == 1
+
+    asyncio.run(main())
+
+
+def test_stale_feed_is_revalidated_and_merged():
+    async def main():
+        cache = FeedCache(freshness=0)
+        session = FakeSession(
+            FakeResponse(200, RSS, {"ETag": '"v1"'}),
+            FakeResponse(304),
+            FakeResponse(200, RSS_UPDATED, {"ETag": '"v2"'}),
+        )
+        url = google_news_url("business")
+        await cache.aget(url, session)
+        assert not cache.is_fresh(url)
+        await cache.aget(url, session)
+        assert session.requests[1] == {"If-None-Match": '"v1"'}
+        entries = await cache.aget(url, session)
+        assert [entry["title"] for entry in entries] == ["Third story", "First story", "Second story"]
+        stats = cache.stats()
+        assert (stats["fetches"], stats["not_modified"]) == (2, 1)
+
+    asyncio.run(main())
+
+
+def test_failed_refresh_keeps_entries():
+    async def main():
+        cache = FeedCache(freshness=0)
+        session = FakeSession(FakeResponse(200, RSS), FakeResponse(503))
+        url = google_news_url("science")
+        await cache.aget(url, session)
+        assert not await cache.arefresh(url, session)
+        assert len(await cache.aget(url, FakeSession(FakeResponse(304)))) == 2
+        assert cache.stats()["errors"] == 1
+
+    asyncio.run(main())
+
+
+def test_unknown_feed_is_not_fresh():
+    assert not FeedCache().is_fresh(google_news_url("nothing"))
+
+
+def test_poller_warms_topics_and_backs_off_failures():
+    async def main():
+        cache = FeedCache()
+        session = FakeSession(FakeResponse(200, RSS), FakeResponse(500))
+        poller = FeedPoller(["health", "sports"], feed_cache=cache, interval=60, jitter=0,
+                            max_backoff=600, session=session)
+        await poller.start()
+        try:
+            assert cache.is_fresh(google_news_url("health"))
+            assert poller.stats()["failing"] == {"sports": 1}
+            # A failing topic waits twice the interval before its next poll
+            assert poller._delay("sports") == 120
+            assert poller._delay("health") == 60
+        finally:
+            await poller.stop()
+        assert not poller.running and not session.closed
+
+    asyncio.run(main())
+
+
+if __name__ == "__main__":
+    test_concurrent_requests_share_one_fetch()
+    test_stale_feed_is_revalidated_and_merged()
+    test_failed_refresh_keeps_entries()
+    test_unknown_feed_is_not_fresh()
+    test_poller_warms_topics_and_backs_off_failures()
+    print("Feed cache checks passed")
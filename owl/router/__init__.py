@@ -0,0 +1,26 @@
+"""
+OWL Router package.
+This package contains the supporting components used by the MCP LLM router.
+"""
+
+from .admission import AdmissionController, AdmissionRejected, Reservation, TokenBucket
+from .mcp_manager import MCPConnectionManager
+from .model_pool import ModelPool
+from .query_router import QueryRouter, RouteDecision, RouteProfile, TfidfQueryClassifier
+from .response_cache import ResponseCache, SQLiteCacheBackend, make_cache_key
+
+__all__ = [
+    'AdmissionController',
+    'AdmissionRejected',
+    'MCPConnectionManager',
+    'ModelPool',
+    'QueryRouter',
+    'Reservation',
+    'ResponseCache',
+    'RouteDecision',
+    'RouteProfile',
+    'SQLiteCacheBackend',
+    'TfidfQueryClassifier',
+    'TokenBucket',
+    'make_cache_key',
+]
@@ -0,0 +1,248 @@
+"""
+Admission control for the MCP LLM router.
+Provides a token-bucket rate limiter and an admission controller that
+bounds in-flight requests, bounds the wait queue and reports backpressure.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is refused because the router is saturated."""
+
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """An asyncio token bucket.
+
+    Args:
+        rate: Tokens added per second
+        capacity: Maximum burst size (default: rate, at least 1)
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens if they are available right now."""
+        self._refill()
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            return True
+        return False
+
+    def available(self) -> int:
+        """Number of whole tokens a new caller could take without waiting."""
+        if self._lock.locked():
+            return 0
+        self._refill()
+        return int(self._tokens)
+
+    async def acquire(self, tokens: float = 1.0):
+        """Wait until tokens are available and take them."""
+        async with self._lock:
+            while not self.try_acquire(tokens):
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
+class AdmissionController:
+    """Bounds concurrency and queue depth, and rate-limits per provider.
+
+    Args:
+        max_concurrency: Maximum number of requests processed at once
+        max_queue_depth: Maximum number of requests waiting for a slot;
+            requests beyond that are rejected with AdmissionRejected
+        rate_limits: Optional mapping of provider name to requests per second,
+            or to a (rate, burst) tuple
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        max_queue_depth: int = 64,
+        rate_limits: Optional[Dict[str, Union[float, Tuple[float, float]]]] = None,
+    ):
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be positive")
+        self.max_concurrency = max_concurrency
+        self.max_queue_depth = max_queue_depth
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._buckets: Dict[str, TokenBucket] = {}
+        for provider, limit in (rate_limits or {}).items():
+            rate, burst = limit if isinstance(limit, tuple) else (limit, None)
+            self._buckets[provider] = TokenBucket(rate, burst)
+
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._latency_total = 0.0
+        self._completed = 0
+
+    def _immediate(self, provider: Optional[str] = None) -> int:
+        """Number of new requests that would start without waiting."""
+        free = max(self.max_concurrency - self.in_flight - self.queued, 0)
+        bucket = self._buckets.get(provider) if provider else None
+        if bucket is not None:
+            free = min(free, bucket.available())
+        return free
+
+    def _would_wait(self, requests: int = 1, provider: Optional[str] = None) -> int:
+        """Queue length if ``requests`` more requests were admitted now."""
+        return self.queued + max(requests - self._immediate(provider), 0)
+
+    @property
+    def overloaded(self) -> bool:
+        """True when new requests would be rejected."""
+        return self._would_wait() > self.max_queue_depth
+
+    def _retry_after(self) -> float:
+        """Estimate how long a rejected caller should wait before retrying."""
+        if not self._completed:
+            return 1.0
+        avg_latency = self._latency_total / self._completed
+        return round(avg_latency * (self.queued + 1) / self.max_concurrency, 2)
+
+    def check(self, requests: int = 1, provider: Optional[str] = None):
+        """
+        Refuse work that would push the wait queue past max_queue_depth.
+
+        Requests waiting for a rate-limit token count as queued, the same as
+        requests waiting for a processing slot.
+
+        Args:
+            requests: Number of requests the caller brings
+            provider: Provider whose rate limit applies to the requests
+
+        Raises:
+            AdmissionRejected: If the requests do not fit in the wait queue
+        """
+        if self._would_wait(requests, provider) > self.max_queue_depth:
+            self.rejected += requests
+            raise AdmissionRejected(
+                f"Router overloaded: {self.in_flight} in flight, {self.queued} queued, "
+                f"{requests} requested",
+                retry_after=self._retry_after(),
+            )
+
+    def reserve(self, requests: int = 1, provider: Optional[str] = None) -> "Reservation":
+        """
+        Admit several requests as a unit.
+
+        The requests are checked against the queue depth together and counted
+        as queued right away; each is then started with ``admit(reservation=...)``.
+
+        Args:
+            requests: Number of requests to reserve
+            provider: Provider whose rate limit applies to the requests
+
+        Returns:
+            The reservation; release it once its requests are done
+
+        Raises:
+            AdmissionRejected: If the requests do not fit in the wait queue
+        """
+        self.check(requests, provider)
+        self.queued += requests
+        return Reservation(self, provider, requests)
+
+    @asynccontextmanager
+    async def admit(self, provider: Optional[str] = None, reservation: Optional["Reservation"] = None):
+        """
+        Reserve a processing slot for one request.
+
+        The provider's rate limit is waited out before taking the slot, so a
+        throttled request does not hold a slot while it sleeps.
+
+        Args:
+            provider: Provider whose rate limit applies to this request
+            reservation: Reservation from ``reserve()`` to take the request from,
+                instead of checking the queue depth for it alone
+
+        Raises:
+            AdmissionRejected: If the wait queue is already full
+        """
+        if reservation is None:
+            reservation = self.reserve(1, provider)
+        reservation.take()
+
+        try:
+            bucket = self._buckets.get(reservation.provider) if reservation.provider else None
+            if bucket is not None:
+                await bucket.acquire()
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+
+        started = time.monotonic()
+        try:
+            self.in_flight += 1
+            self.admitted += 1
+            try:
+                yield
+            finally:
+                self.in_flight -= 1
+                self._latency_total += time.monotonic() - started
+                self._completed += 1
+        finally:
+            self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return load and backpressure information suitable for health checks."""
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_concurrency": self.max_concurrency,
+            "max_queue_depth": self.max_queue_depth,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "utilization": self.in_flight / self.max_concurrency,
+            "overloaded": self.overloaded,
+            "retry_after": self._retry_after() if self.overloaded else 0.0,
+        }
+
+
+class Reservation:
+    """Queue places held by a batch admitted with ``AdmissionController.reserve``.
+
+    Args:
+        controller: The controller the places belong to
+        provider: Provider whose rate limit applies to the requests
+        requests: Number of places
+    """
+
+    def __init__(self, controller: AdmissionController, provider: Optional[str], requests: int):
+        self.controller = controller
+        self.provider = provider
+        self.remaining = requests
+
+    def take(self):
+        """Use one place for a request that is about to wait for its slot."""
+        if self.remaining <= 0:
+            raise ValueError("Reservation has no places left")
+        self.remaining -= 1
+
+    def release(self):
+        """Give back the places no request has used."""
+        self.controller.queued -= self.remaining
+        self.remaining = 0
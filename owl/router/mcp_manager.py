@@ -0,0 +1,317 @@
+"""
+Long-lived MCP connection manager.
+Connects to every configured MCP server in parallel, health-checks the live
+connections, reconnects with exponential backoff and starts rarely used
+servers lazily.
+"""
+
+import asyncio
+import json
+import logging
+import random
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from camel.toolkits import MCPToolkit
+
+logger = logging.getLogger(__name__)
+
+
+class _ServerState:
+    """Connection state of one MCP server."""
+
+    def __init__(self, name: str, server: Any, lazy: bool = False):
+        self.name = name
+        self.server = server
+        self.lazy = lazy
+        self.connected = False
+        self.connected_once = False
+        self.failures = 0
+        self.reconnects = 0
+        self.last_error: Optional[str] = None
+        self.ready = asyncio.Event()
+        self.requested = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        if not lazy:
+            self.requested.set()
+
+
+class MCPConnectionManager:
+    """Keeps MCP server connections alive for the lifetime of the router.
+
+    Each server is owned by one supervisor task that connects, health-checks
+    and disconnects it. MCP stdio clients must be entered and exited from the
+    same task, so connections are never handed between tasks.
+
+    Args:
+        config_path: Path of the MCP servers JSON configuration
+        connect_timeout: Seconds to wait for each server during start()
+        health_check_interval: Seconds between health checks of a live server
+        health_check_timeout: Seconds a health check may take before the
+            server is considered unhealthy
+        max_backoff: Upper bound in seconds for the reconnect delay
+        lazy_servers: Names of servers that are only started on first use
+        server_timeouts: Per-server overrides of ``connect_timeout``
+    """
+
+    def __init__(
+        self,
+        config_path: str,
+        connect_timeout: float = 30,
+        health_check_interval: float = 60,
+        health_check_timeout: float = 10,
+        max_backoff: float = 60,
+        lazy_servers: Optional[Iterable[str]] = None,
+        server_timeouts: Optional[Dict[str, float]] = None,
+    ):
+        self.config_path = config_path
+        self.connect_timeout = connect_timeout
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self.max_backoff = max_backoff
+        self.lazy_servers = set(lazy_servers or [])
+        self.server_timeouts = dict(server_timeouts or {})
+        self._ready_callbacks: List[Callable[[str, List[Any]], None]] = []
+        self.toolkit: Optional[MCPToolkit] = None
+        self._states: Dict[str, _ServerState] = {}
+        self._closing: Optional[asyncio.Event] = None
+
+    def _server_names(self, count: int) -> List[str]:
+        """Map the toolkit's servers back to their names in the config file."""
+        try:
+            with open(self.config_path) as f:
+                servers = json.load(f).get("mcpServers", {})
+            names = [
+                name for name, cfg in servers.items()
+                if isinstance(cfg, dict) and ("command" in cfg or "url" in cfg)
+            ]
+        except (OSError, ValueError):
+            names = []
+        if len(names) != count:
+            names = [f"server-{i}" for i in range(count)]
+        return names
+
+    async def start(self, wait: bool = True) -> List[str]:
+        """
+        Start a supervisor for every server and wait for the eager ones.
+
+        Args:
+            wait: Whether to wait for the eager servers to connect, each up
+                to its own deadline
+
+        Returns:
+            The names of the servers that are connected
+        """
+        if self.toolkit is None:
+            self.toolkit = MCPToolkit(config_path=str(self.config_path))
+            servers = list(self.toolkit.servers)
+            for name, server in zip(self._server_names(len(servers)), servers):
+                self._states[name] = _ServerState(name, server, lazy=name in self.lazy_servers)
+
+        self._closing = asyncio.Event()
+        for state in self._states.values():
+            if state.task is None or state.task.done():
+                state.task = asyncio.create_task(self._supervise(state), name=f"mcp-{state.name}")
+
+        if wait:
+            eager = [state.name for state in self._states.values() if not state.lazy]
+            await self.wait_ready(eager)
+        return self.connected_servers()
+
+    async def wait_ready(self, names: Iterable[str], timeout: Optional[float] = None) -> List[str]:
+        """
+        Wait until the given servers are connected or their deadlines pass.
+
+        Args:
+            names: Server names to wait for
+            timeout: Deadline in seconds for every server; defaults to each
+                server's entry in ``server_timeouts`` or ``connect_timeout``
+
+        Returns:
+            The names among ``names`` that are connected
+        """
+        states = [self._states[name] for name in names if name in self._states]
+
+        async def wait_one(state: _ServerState):
+            deadline = timeout if timeout is not None else self.server_timeouts.get(state.name, self.connect_timeout)
+            try:
+                await asyncio.wait_for(state.ready.wait(), timeout=deadline)
+            except asyncio.TimeoutError:
+                logger.warning(f"MCP server '{state.name}' not ready after {deadline}s, continuing without it")
+
+        await asyncio.gather(*(wait_one(state) for state in states))
+        return [state.name for state in states if state.connected]
+
+    async def ensure_started(self, names: Iterable[str], timeout: Optional[float] = None) -> List[str]:
+        """
+        Start lazy servers on first use.
+
+        Only servers that were not requested before are waited for, so later
+        calls never block on a server that is down or reconnecting.
+
+        Args:
+            names: Server names to start
+            timeout: Deadline in seconds to wait for them
+
+        Returns:
+            The names among ``names`` that are connected
+        """
+        names = [name for name in names if name in self._states]
+        new_names = [name for name in names if not self._states[name].requested.is_set()]
+        for name in new_names:
+            self._states[name].requested.set()
+        if new_names:
+            await self.wait_ready(new_names, timeout=self.connect_timeout if timeout is None else timeout)
+        return [name for name in names if self._states[name].connected]
+
+    async def _supervise(self, state: _ServerState):
+        """Connect, health-check and reconnect one server until the manager stops."""
+        backoff = 1.0
+        while not self._closing.is_set():
+            await state.requested.wait()
+            if self._closing.is_set():
+                break
+            try:
+                logger.info(f"Connecting to MCP server '{state.name}'...")
+                await state.server.connect()
+            except Exception as e:
+                state.failures += 1
+                state.last_error = str(e)
+                delay = min(backoff, self.max_backoff) * random.uniform(0.5, 1.5)
+                logger.warning(f"MCP server '{state.name}' failed to connect ({str(e)}), retrying in {delay:.1f}s")
+                await self._sleep(delay)
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+
+            if state.connected_once:
+                state.reconnects += 1
+            state.connected_once = True
+            state.connected = True
+            state.ready.set()
+            backoff = 1.0
+            logger.info(f"MCP server '{state.name}' connected")
+            self._notify_ready(state)
+
+            while not self._closing.is_set():
+                await self._sleep(self.health_check_interval)
+                if self._closing.is_set():
+                    break
+                try:
+                    await asyncio.wait_for(state.server.list_mcp_tools(), timeout=self.health_check_timeout)
+                except Exception as e:
+                    state.failures += 1
+                    state.last_error = str(e) or type(e).__name__
+                    logger.warning(f"MCP server '{state.name}' failed health check ({state.last_error}), reconnecting")
+                    break
+
+            state.connected = False
+            state.ready.clear()
+            try:
+                await state.server.disconnect()
+            except Exception as e:
+                logger.debug(f"Error disconnecting MCP server '{state.name}': {str(e)}")
+
+    def _notify_ready(self, state: _ServerState):
+        """Hand the tools of a newly connected server to the registered callbacks."""
+        if not self._ready_callbacks:
+            return
+        tools = state.server.get_tools()
+        for callback in self._ready_callbacks:
+            try:
+                callback(state.name, tools)
+            except Exception as e:
+                logger.error(f"Error in MCP ready callback for '{state.name}': {str(e)}", exc_info=True)
+
+    def add_ready_callback(self, callback: Callable[[str, List[Any]], None]):
+        """
+        Register a callback run with ``(server_name, tools)`` whenever a server connects.
+
+        Args:
+            callback: The function to call
+        """
+        self._ready_callbacks.append(callback)
+
+    def attach_late_tools(self, agent: Any, attached: Iterable[str]):
+        """
+        Add the tools of servers that come up later to a running agent.
+
+        Args:
+            agent: A ChatAgent, e.g. ``society.assistant_agent``
+            attached: Names of the servers whose tools the agent already has
+        """
+        attached = set(attached)
+
+        def attach(name: str, tools: List[Any]):
+            if name in attached:
+                return
+            attached.add(name)
+            for tool in tools:
+                agent.add_tool(tool)
+            logger.info(f"Attached {len(tools)} tools from late MCP server '{name}'")
+
+        self.add_ready_callback(attach)
+        # Servers that connected before the callback was registered
+        for name in self.connected_servers():
+            attach(name, self.get_tools([name]))
+
+    async def _sleep(self, delay: float):
+        """Sleep for ``delay`` seconds, waking up early when the manager stops."""
+        try:
+            await asyncio.wait_for(self._closing.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+
+    @property
+    def started(self) -> bool:
+        """True once start() has run and until stop() is called."""
+        return self._closing is not None and not self._closing.is_set()
+
+    def connected_servers(self) -> List[str]:
+        """Return the names of the servers that are currently connected."""
+        return [state.name for state in self._states.values() if state.connected]
+
+    def get_tools(self, names: Optional[Iterable[str]] = None) -> List[Any]:
+        """
+        Get the tools of the connected servers.
+
+        Args:
+            names: Optional subset of server names
+
+        Returns:
+            A list of FunctionTool objects
+        """
+        wanted = set(names) if names is not None else None
+        tools = []
+        for state in self._states.values():
+            if state.connected and (wanted is None or state.name in wanted):
+                tools.extend(state.server.get_tools())
+        return tools
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return per-server connection health."""
+        return {
+            state.name: {
+                "connected": state.connected,
+                "lazy": state.lazy,
+                "failures": state.failures,
+                "reconnects": state.reconnects,
+                "last_error": state.last_error,
+            }
+            for state in self._states.values()
+        }
+
+    async def stop(self):
+        """Disconnect every server and stop the supervisors."""
+        if self._closing is None:
+            return
+        self._closing.set()
+        for state in self._states.values():
+            # Wake supervisors still waiting for a lazy start
+            state.requested.set()
+        tasks = [state.task for state in self._states.values() if state.task]
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=self.health_check_timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        for state in self._states.values():
+            state.task = None
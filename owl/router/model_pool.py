@@ -0,0 +1,97 @@
+"""
+Model backend pool for the MCP LLM router.
+Creates each CAMEL model backend once per (platform, model_type, config)
+and hands the same instance to every society that asks for it.
+"""
+
+import json
+import logging
+import threading
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from camel.models import ModelFactory
+
+logger = logging.getLogger(__name__)
+
+
+class ModelPool:
+    """A thread-safe pool of reusable model backends.
+
+    Backends only hold the HTTP client and model configuration; conversation
+    state lives in the ChatAgent, so one backend can safely serve many
+    concurrent societies.
+    """
+
+    def __init__(self):
+        """Initialize an empty model pool."""
+        self._backends: Dict[Tuple[Hashable, ...], Any] = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    @staticmethod
+    def _key(model_platform, model_type, model_config_dict: Optional[Dict[str, Any]]) -> Tuple[Hashable, ...]:
+        """Build a hashable pool key from the backend parameters."""
+        config = json.dumps(model_config_dict or {}, sort_keys=True, default=str)
+        return (str(model_platform), str(model_type), config)
+
+    def get(self, model_platform, model_type, model_config_dict: Optional[Dict[str, Any]] = None):
+        """
+        Get a shared backend, creating it on first use.
+
+        Args:
+            model_platform: The ModelPlatformType of the backend
+            model_type: The ModelType of the backend
+            model_config_dict: Optional model configuration
+
+        Returns:
+            The pooled model backend
+        """
+        key = self._key(model_platform, model_type, model_config_dict)
+        with self._lock:
+            backend = self._backends.get(key)
+            if backend is not None:
+                self.reused += 1
+                return backend
+
+            logger.info(f"Creating pooled model backend for {model_platform}/{model_type}")
+            backend = ModelFactory.create(
+                model_platform=model_platform,
+                model_type=model_type,
+                model_config_dict=dict(model_config_dict or {}),
+            )
+            self._backends[key] = backend
+            self.created += 1
+            return backend
+
+    def warm(self, model_platform, model_type, model_config_dict: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Create a backend ahead of the first request.
+
+        Args:
+            model_platform: The ModelPlatformType of the backend
+            model_type: The ModelType of the backend
+            model_config_dict: Optional model configuration
+
+        Returns:
+            True if the backend is ready, False if it could not be created
+        """
+        try:
+            self.get(model_platform, model_type, model_config_dict)
+            return True
+        except Exception as e:
+            logger.warning(f"Could not warm model backend {model_platform}/{model_type}: {str(e)}")
+            return False
+
+    def stats(self) -> Dict[str, int]:
+        """Return pool size and reuse counters."""
+        return {
+            "backends": len(self._backends),
+            "created": self.created,
+            "reused": self.reused,
+        }
+
+    def clear(self):
+        """Drop all pooled backends."""
+        with self._lock:
+            self._backends.clear()
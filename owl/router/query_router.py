@@ -0,0 +1,252 @@
+"""
+Query routing for the MCP LLM router.
+Provides a cheap local TF-IDF classifier that decides whether a prompt goes
+to the news pipeline, a single direct LLM call or the full OWL society, along
+with per-route cost/latency estimates and routing metrics.
+"""
+
+import logging
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Protocol
+
+logger = logging.getLogger(__name__)
+
+NEWS_ROUTE = "news"
+DIRECT_ROUTE = "direct"
+OWL_ROUTE = "owl"
+
+DEFAULT_EXAMPLES: Dict[str, List[str]] = {
+    NEWS_ROUTE: [
+        "what is the latest news about the election",
+        "breaking news today",
+        "recent headlines about the stock market",
+        "what happened today in world news",
+        "current events in technology this week",
+        "give me the top news stories",
+        "latest updates on the war",
+        "news about climate policy",
+        "what are the headlines this morning",
+        "any recent announcements from apple",
+    ],
+    DIRECT_ROUTE: [
+        "what is the capital of france",
+        "explain recursion in simple terms",
+        "translate this sentence into spanish",
+        "write a haiku about autumn",
+        "define photosynthesis",
+        "summarize this paragraph",
+        "how do i reverse a list in python",
+        "what does this error message mean",
+        "give me a synonym for happy",
+        "convert 10 miles to kilometers",
+        "hello how are you",
+        "tell me a joke",
+    ],
+    OWL_ROUTE: [
+        "research and write a detailed report on andrew ng including his papers",
+        "search the web and compile a comparison of the top three vendors",
+        "browse the website extract the pricing table and analyze it",
+        "find the github repository read the code and summarize the architecture",
+        "download the dataset analyze it and produce charts",
+        "plan and execute a multi step investigation of the company filings",
+        "collect information from several sources and write an article",
+        "visit these sites gather the latest articles and save a markdown digest",
+        "analyze the sec filings and build an investment memo",
+        "compare the healthcare systems of three countries and cite the sources",
+    ],
+}
+
+STOPWORDS = frozenset(
+    "a an the and or of to in on for is are was were be it this that with as at by "
+    "me my i you your we our do does did can could would should please "
+    "what how who which when why where tell give about any these there".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word unigrams and bigrams with stopwords removed."""
+    words = [w for w in re.findall(r"[a-z0-9]+", text.lower()) if w not in STOPWORDS]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+@dataclass
+class RouteProfile:
+    """Estimated cost (USD) and latency (seconds) of serving one prompt on a route."""
+
+    cost: float
+    latency: float
+
+
+DEFAULT_ROUTE_PROFILES: Dict[str, RouteProfile] = {
+    # Keyword extraction + answer: two LLM calls plus an RSS fetch
+    NEWS_ROUTE: RouteProfile(cost=0.02, latency=6.0),
+    # One LLM call
+    DIRECT_ROUTE: RouteProfile(cost=0.01, latency=3.0),
+    # Up to 15 rounds of two agents each
+    OWL_ROUTE: RouteProfile(cost=0.5, latency=60.0),
+}
+
+
+@dataclass
+class RouteDecision:
+    """The outcome of routing one prompt."""
+
+    route: str
+    confidence: float
+    scores: Dict[str, float] = field(default_factory=dict)
+    estimated_cost: float = 0.0
+    estimated_latency: float = 0.0
+    fallback: bool = False
+
+
+class QueryClassifier(Protocol):
+    """Anything that maps a prompt to a probability per route."""
+
+    def predict(self, prompt: str) -> Dict[str, float]:
+        ...
+
+
+class TfidfQueryClassifier:
+    """Nearest-centroid TF-IDF classifier trained on a few examples per route.
+
+    Args:
+        examples: Mapping of route name to example prompts
+        temperature: Softmax temperature applied to cosine similarities
+    """
+
+    def __init__(self, examples: Optional[Dict[str, List[str]]] = None, temperature: float = 0.1):
+        self.examples = examples or DEFAULT_EXAMPLES
+        self.temperature = temperature
+        self.fit(self.examples)
+
+    def fit(self, examples: Dict[str, List[str]]):
+        """Build the IDF table and one centroid per route."""
+        documents = [(route, tokenize(text)) for route, texts in examples.items() for text in texts]
+        doc_freq = Counter(term for _, tokens in documents for term in set(tokens))
+        total = len(documents)
+        self.idf = {term: math.log((1 + total) / (1 + df)) + 1 for term, df in doc_freq.items()}
+
+        self.centroids: Dict[str, Dict[str, float]] = {}
+        for route in examples:
+            centroid: Counter = Counter()
+            for doc_route, tokens in documents:
+                if doc_route == route:
+                    centroid.update(self._vectorize(tokens))
+            self.centroids[route] = self._normalize(centroid)
+
+    def _vectorize(self, tokens: Iterable[str]) -> Dict[str, float]:
+        counts = Counter(tokens)
+        return self._normalize({term: tf * self.idf[term] for term, tf in counts.items() if term in self.idf})
+
+    @staticmethod
+    def _normalize(vector: Dict[str, float]) -> Dict[str, float]:
+        norm = math.sqrt(sum(v * v for v in vector.values()))
+        return {k: v / norm for k, v in vector.items()} if norm else {}
+
+    def predict(self, prompt: str) -> Dict[str, float]:
+        """Return a probability for each route."""
+        vector = self._vectorize(tokenize(prompt))
+        similarities = {
+            route: sum(weight * centroid.get(term, 0.0) for term, weight in vector.items())
+            for route, centroid in self.centroids.items()
+        }
+        peak = max(similarities.values())
+        exps = {route: math.exp((sim - peak) / self.temperature) for route, sim in similarities.items()}
+        total = sum(exps.values())
+        return {route: value / total for route, value in exps.items()}
+
+
+class QueryRouter:
+    """Routes prompts with a pluggable classifier and a confidence threshold.
+
+    Args:
+        classifier: Classifier returning route probabilities
+            (default: TfidfQueryClassifier)
+        confidence_threshold: Minimum probability needed to follow the
+            classifier; below it the prompt goes to ``default_route``
+        default_route: Route used for low-confidence prompts. The cheap direct
+            route by default, so uncertain prompts do not pay for a society run
+        profiles: Per-route cost and latency estimates
+    """
+
+    def __init__(
+        self,
+        classifier: Optional[QueryClassifier] = None,
+        confidence_threshold: float = 0.5,
+        default_route: str = DIRECT_ROUTE,
+        profiles: Optional[Dict[str, RouteProfile]] = None,
+    ):
+        self.classifier = classifier or TfidfQueryClassifier()
+        self.confidence_threshold = confidence_threshold
+        self.default_route = default_route
+        self.profiles = {route: RouteProfile(p.cost, p.latency)
+                         for route, p in (profiles or DEFAULT_ROUTE_PROFILES).items()}
+        self.route_counts: Counter = Counter()
+        self.fallbacks = 0
+        self._confidence_total = 0.0
+
+    def route(self, prompt: str, allowed_routes: Optional[Iterable[str]] = None) -> RouteDecision:
+        """
+        Decide which route should serve a prompt.
+
+        Args:
+            prompt: The user's prompt
+            allowed_routes: Routes the caller can serve (e.g. no OWL route when
+                OWL is unavailable); the others are ignored
+
+        Returns:
+            The routing decision with its confidence and estimates
+        """
+        scores = self.classifier.predict(prompt)
+        if allowed_routes is not None:
+            allowed = set(allowed_routes)
+            scores = {route: score for route, score in scores.items() if route in allowed}
+            total = sum(scores.values())
+            if total:
+                scores = {route: score / total for route, score in scores.items()}
+
+        if scores:
+            route, confidence = max(scores.items(), key=lambda item: item[1])
+        else:
+            route, confidence = self.default_route, 0.0
+
+        fallback = confidence < self.confidence_threshold
+        if fallback:
+            route = self.default_route
+            self.fallbacks += 1
+
+        profile = self.profiles.get(route, RouteProfile(0.0, 0.0))
+        decision = RouteDecision(
+            route=route,
+            confidence=confidence,
+            scores=scores,
+            estimated_cost=profile.cost,
+            estimated_latency=profile.latency,
+            fallback=fallback,
+        )
+        self.route_counts[route] += 1
+        self._confidence_total += confidence
+        logger.info(
+            f"Routed prompt to '{route}' (confidence {confidence:.2f}, "
+            f"est. ${profile.cost:.3f}, {profile.latency:.1f}s{', fallback' if fallback else ''})"
+        )
+        return decision
+
+    def record_latency(self, route: str, latency: float, alpha: float = 0.2):
+        """Fold an observed latency into the route's estimate (exponential moving average)."""
+        profile = self.profiles.setdefault(route, RouteProfile(0.0, latency))
+        profile.latency = (1 - alpha) * profile.latency + alpha * latency
+
+    def stats(self) -> Dict[str, object]:
+        """Return routing-decision metrics."""
+        decisions = sum(self.route_counts.values())
+        return {
+            "decisions": decisions,
+            "routes": dict(self.route_counts),
+            "fallbacks": self.fallbacks,
+            "avg_confidence": self._confidence_total / decisions if decisions else 0.0,
+            "estimated_latency": {route: p.latency for route, p in self.profiles.items()},
+        }
@@ -0,0 +1,276 @@
+"""
+Response cache for the MCP LLM router.
+Provides normalized cache keys, an in-memory LRU with TTL expiry and an
+optional SQLite backend shared across processes.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(
+    prompt: str,
+    namespace: str = "",
+    model: Optional[str] = None,
+    language: Optional[str] = None,
+    tools: Optional[Iterable[str]] = None,
+) -> str:
+    """Build a normalized cache key for a prompt.
+
+    Whitespace is collapsed and case is folded so that trivially different
+    spellings of the same prompt share an entry. The model, output language
+    and tool set are part of the key because they change the answer.
+
+    Args:
+        prompt: The user prompt.
+        namespace: The router path producing the answer.
+        model: The model or provider name.
+        language: The requested output language.
+        tools: Names of the tools available.
+
+    Returns:
+        A hex digest identifying the request.
+    """
+    normalized_prompt = " ".join(prompt.split()).casefold()
+    payload = json.dumps(
+        [
+            namespace,
+            model or "",
+            language or "",
+            sorted(set(tools or ())),
+            normalized_prompt,
+        ],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SQLiteCacheBackend:
+    """SQLite-backed cache storage that can be shared across processes.
+
+    Args:
+        path: Path of the SQLite database file.
+        max_entries: Maximum number of rows kept on disk; the least
+            recently used rows are evicted first. (default: 10000)
+    """
+
+    def __init__(self, path: str, max_entries: int = 10000):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        # WAL lets several router processes read while one writes.
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS response_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_response_cache_accessed "
+            "ON response_cache (accessed_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Return ``(value, expires_at)`` for a live key, else ``None``."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM response_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at <= now:
+                self._conn.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE response_cache SET accessed_at = ? WHERE key = ?",
+                (now, key),
+            )
+            self._conn.commit()
+        return json.loads(value), expires_at
+
+    def set(self, key: str, value: Any, expires_at: float) -> None:
+        """Store a value and trim the table to ``max_entries`` rows."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO response_cache "
+                "(key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), expires_at, now),
+            )
+            self._conn.execute(
+                "DELETE FROM response_cache WHERE expires_at <= ?", (now,)
+            )
+            self._conn.execute(
+                "DELETE FROM response_cache WHERE key IN ("
+                "SELECT key FROM response_cache ORDER BY accessed_at DESC "
+                "LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM response_cache")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class ResponseCache:
+    """Bounded LRU response cache with TTL expiry and hit-rate metrics.
+
+    Entries live in an in-memory LRU. When a ``backend`` is given it acts as
+    a second level that survives restarts and is shared by every process
+    pointing at the same file.
+
+    Args:
+        max_entries: Maximum number of in-memory entries.
+            (default: 256)
+        ttl: Seconds an entry stays valid, or ``None`` to
+            never expire. (default: 3600)
+        backend: Optional persistent store.
+            (default: None)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl: Optional[float] = 3600,
+        backend: Optional[SQLiteCacheBackend] = None,
+    ):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.backend = backend
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.backend_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _expiry(self, ttl: Optional[float]) -> float:
+        ttl = self.ttl if ttl is None else ttl
+        return float("inf") if ttl is None else time.time() + ttl
+
+    def _store(self, key: str, value: Any, expires_at: float) -> None:
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for ``key`` or ``None`` on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > time.time():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+
+        if self.backend is not None:
+            try:
+                stored = self.backend.get(key)
+            except sqlite3.Error as e:
+                logger.warning(f"Response cache backend read failed: {e}")
+                stored = None
+            if stored is not None:
+                value, expires_at = stored
+                with self._lock:
+                    self._store(key, value, expires_at)
+                    self.hits += 1
+                    self.backend_hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Cache ``value`` under ``key``.
+
+        Args:
+            key: The cache key, usually from :func:`make_cache_key`.
+            value: A JSON-serializable value.
+            ttl: Override of the default TTL in seconds.
+        """
+        expires_at = self._expiry(ttl)
+        with self._lock:
+            self._store(key, value, expires_at)
+        if self.backend is not None:
+            try:
+                self.backend.set(key, value, expires_at)
+            except sqlite3.Error as e:
+                logger.warning(f"Response cache backend write failed: {e}")
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[1] > time.time()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.backend is not None:
+            self.backend.delete(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "backend_hits": self.backend_hits,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        if self.backend is not None:
+            self.backend.close()
@@ -0,0 +1,99 @@
+import asyncio
+
+from owl.router.admission import AdmissionController, AdmissionRejected
+
+
+async def _run(controller: AdmissionController, provider=None, hold: float = 0.0):
+    async with controller.admit(provider):
+        await asyncio.sleep(hold)
+
+
+def test_rate_limited_requests_count_against_queue_depth():
+    async def main():
+        controller = AdmissionController(max_queue_depth=3, rate_limits={"model": (20.0, 1.0)})
+        results = await asyncio.gather(*(_run(controller, "model") for _ in range(20)),
+                                       return_exceptions=True)
+        rejected = sum(isinstance(result, AdmissionRejected) for result in results)
+        # One request takes the burst token, three wait for tokens, the rest are refused
+        assert rejected == 16
+        assert controller.stats()["admitted"] == 4
+        assert controller.queued == 0
+
+    asyncio.run(main())
+
+
+def test_concurrency_bound_requests_queue_up_to_depth():
+    async def main():
+        controller = AdmissionController(max_concurrency=2, max_queue_depth=2)
+        results = await asyncio.gather(*(_run(controller, hold=0.01) for _ in range(6)),
+                                       return_exceptions=True)
+        assert sum(isinstance(result, AdmissionRejected) for result in results) == 2
+        assert controller.in_flight == 0 and controller.queued == 0
+
+    asyncio.run(main())
+
+
+def test_batch_larger_than_queue_is_rejected_as_a_whole():
+    controller = AdmissionController(max_concurrency=2, max_queue_depth=3)
+    try:
+        controller.reserve(100)
+    except AdmissionRejected:
+        pass
+    else:
+        raise AssertionError("an oversized batch was admitted")
+    assert controller.rejected == 100
+    assert controller.queued == 0
+
+
+def test_reserved_batch_runs_and_blocks_other_callers():
+    async def main():
+        controller = AdmissionController(max_concurrency=2, max_queue_depth=3)
+        reservation = controller.reserve(5)
+        assert controller.queued == 5
+        # The batch fills the slots and the queue, so a single request is refused
+        assert controller.overloaded
+        try:
+            async def serve():
+                async with controller.admit(reservation=reservation):
+                    await asyncio.sleep(0.01)
+            await asyncio.gather(*(serve() for _ in range(5)))
+        finally:
+            reservation.release()
+        assert controller.stats()["admitted"] == 5
+        assert controller.queued == 0 and not controller.overloaded
+
+    asyncio.run(main())
+
+
+def test_unused_reservation_places_are_released():
+    controller = AdmissionController(max_concurrency=1, max_queue_depth=4)
+    reservation = controller.reserve(3)
+    reservation.release()
+    assert controller.queued == 0
+    controller.check(5)
+
+
+def test_rate_limit_wait_does_not_hold_a_slot():
+    async def main():
+        controller = AdmissionController(max_concurrency=1, max_queue_depth=8,
+                                         rate_limits={"slow": (5.0, 1.0)})
+        # The first request drains the bucket; the second waits for a token while
+        # a request to another provider still gets the only slot right away
+        first = asyncio.ensure_future(_run(controller, "slow"))
+        await asyncio.sleep(0)
+        throttled = asyncio.ensure_future(_run(controller, "slow"))
+        await asyncio.sleep(0)
+        await asyncio.wait_for(_run(controller, "fast"), timeout=0.1)
+        await asyncio.gather(first, throttled)
+
+    asyncio.run(main())
+
+
+if __name__ == "__main__":
+    test_rate_limited_requests_count_against_queue_depth()
+    test_concurrency_bound_requests_queue_up_to_depth()
+    test_batch_larger_than_queue_is_rejected_as_a_whole()
+    test_reserved_batch_runs_and_blocks_other_callers()
+    test_unused_reservation_places_are_released()
+    test_rate_limit_wait_does_not_hold_a_slot()
+    print("Admission checks passed")
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import time
+
+from owl.router.response_cache import ResponseCache, SQLiteCacheBackend, make_cache_key
+
+
+def test_key_ignores_case_and_whitespace():
+    assert make_cache_key("What is  the\nweather?", "direct") == make_cache_key("what is the weather?", "direct")
+
+
+def test_key_separates_answers_that_differ():
+    prompt = "latest tesla news"
+    base = make_cache_key(prompt, "news", model="anthropic", language="en")
+    assert make_cache_key(prompt, "direct", model="anthropic", language="en") != base
+    assert make_cache_key(prompt, "news", model="groq", language="en") != base
+    assert make_cache_key(prompt, "news", model="anthropic", language="fr") != base
+    assert make_cache_key(prompt, "news", model="anthropic", language="en", tools=["fetch"]) != base
+
+
+def test_key_ignores_tool_order():
+    assert make_cache_key("q", tools=["b", "a", "a"]) == make_cache_key("q", tools=["a", "b"])
+
+
+def test_empty_cache_is_still_a_cache():
+    cache = ResponseCache(max_entries=2)
+    # __len__ makes an empty cache falsy; callers must compare against None
+    assert len(cache) == 0 and cache is not None
+    cache.set("k", "v")
+    assert cache.get("k") == "v"
+
+
+def test_lru_eviction_and_stats():
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert (stats["hits"], stats["misses"]) == (3, 1)
+
+
+def test_per_entry_ttl_overrides_default():
+    cache = ResponseCache(ttl=3600)
+    cache.set("news", "headlines", ttl=0.05)
+    cache.set("answer", "42")
+    time.sleep(0.1)
+    assert cache.get("news") is None
+    assert cache.get("answer") == "42"
+    assert cache.stats()["expirations"] == 1
+
+
+def test_sqlite_backend_is_shared_and_trimmed():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "cache.sqlite3")
+        writer = ResponseCache(backend=SQLiteCacheBackend(path, max_entries=2))
+        for key in ("a", "b", "c"):
+            writer.set(key, {"response": key})
+        reader = ResponseCache(backend=SQLiteCacheBackend(path))
+        assert reader.get("c") == {"response": "c"}
+        assert reader.get("a") is None
+        assert reader.stats()["backend_hits"] == 1
+        writer.close()
+        reader.close()
+
+
+if __name__ == "__main__":
+    test_key_ignores_case_and_whitespace()
+    test_key_separates_answers_that_differ()
+    test_key_ignores_tool_order()
+    test_empty_cache_is_still_a_cache()
+    test_lru_eviction_and_stats()
+    test_per_entry_ttl_overrides_default()
+    test_sqlite_backend_is_shared_and_trimmed()
+    print("Response cache checks passed")
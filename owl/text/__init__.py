@@ -0,0 +1,22 @@
+"""
+OWL Text package.
+This package contains text-processing helpers shared by the toolkits, the
+MCP servers and the tool clients.
+"""
+
+from .html_text import HTMLTextStream, aiter_html_text, available_backends, html_to_text, iter_html_text
+from .keywords import extract_keywords, extract_search_terms
+from .summarizer import ExtractiveSummarizer, Summarizer, split_sentences
+
+__all__ = [
+    'ExtractiveSummarizer',
+    'HTMLTextStream',
+    'Summarizer',
+    'aiter_html_text',
+    'available_backends',
+    'extract_keywords',
+    'extract_search_terms',
+    'html_to_text',
+    'iter_html_text',
+    'split_sentences',
+]
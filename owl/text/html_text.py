@@ -0,0 +1,478 @@
+"""
+Fast HTML-to-text extraction.
+Converts HTML to plain text with the fastest available parser (lxml, then
+selectolax, then the standard library), strips navigation, ads and other
+boilerplate, and can stream large documents chunk by chunk.
+See benchmarks/html_text for throughput and memory measurements.
+"""
+
+import codecs
+import logging
+import re
+from html.parser import HTMLParser
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, List, Optional, Union
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:
+    etree = None
+
+logger = logging.getLogger(__name__)
+
+# Elements whose content is never text
+SKIP_TAGS = frozenset({
+    "script", "style", "noscript", "template", "svg", "canvas", "iframe", "object", "embed",
+})
+
+# Elements that are page furniture rather than content
+BOILERPLATE_TAGS = frozenset({"nav", "header", "footer", "aside", "form", "button", "menu", "dialog"})
+
+# Containers of the content itself, never stripped whatever their class or id
+CONTENT_TAGS = frozenset({"html", "body", "main", "article"})
+
+# Inside these a <header> holds the headline rather than site navigation
+HEADLINE_CONTAINERS = frozenset({"main", "article"})
+
+BOILERPLATE_WORDS = (
+    r"(?:nav|navbar|navigation|menu|breadcrumbs?|footer|sidebar|cookies?|consent|banner|ads?|"
+    r"advert\w*|sponsor\w*|promo\w*|share|sharing|social|newsletter|subscribe|related|"
+    r"recommended|comments?|popup|modal|skip-link)"
+)
+
+# A whole class/id token that marks page furniture, e.g. "sidebar", "site-footer" or
+# "cookie-banner", but not "has-sidebar" or "layout--with-related-rail"
+BOILERPLATE_TOKEN = re.compile(
+    rf"(?:(?:site|main|global|page|top)[-_])?{BOILERPLATE_WORDS}"
+    rf"(?:[-_](?:{BOILERPLATE_WORDS}|bar|box|container|wrapper|links|buttons|widget|section|area))?",
+    re.IGNORECASE,
+)
+
+# Elements that start a new line of text
+BLOCK_TAGS = frozenset({
+    "address", "article", "blockquote", "br", "dd", "div", "dl", "dt", "figcaption", "figure",
+    "h1", "h2", "h3", "h4", "h5", "h6", "hr", "li", "main", "ol", "p", "pre", "section",
+    "table", "tbody", "thead", "tfoot", "tr", "ul", "title",
+})
+
+VOID_TAGS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param",
+    "source", "track", "wbr",
+})
+
+XML_DECLARATION = re.compile(r"^\s*<\?xml[^>]*>")
+
+BACKENDS = ("lxml", "selectolax", "stdlib")
+
+
+def available_backends() -> List[str]:
+    """Return the installed parser backends, fastest first."""
+    installed = {
+        "selectolax": LexborHTMLParser is not None,
+        "lxml": etree is not None,
+        "stdlib": True,
+    }
+    return [name for name in BACKENDS if installed[name]]
+
+
+def _is_boilerplate(tag: str, class_value: Optional[str], id_value: Optional[str],
+                    in_content: bool = False) -> bool:
+    """Whether an element is page furniture; ``in_content`` is True inside <main> or <article>."""
+    if tag in CONTENT_TAGS:
+        return False
+    if tag in BOILERPLATE_TAGS:
+        return not (tag == "header" and in_content)
+    tokens = f"{class_value or ''} {id_value or ''}".split()
+    return any(BOILERPLATE_TOKEN.fullmatch(token) for token in tokens)
+
+
+def _in_content(ancestor_tags: Iterable[str]) -> bool:
+    return any(tag in HEADLINE_CONTAINERS for tag in ancestor_tags)
+
+
+def _ancestor_tags(node) -> Iterator[str]:
+    parent = node.parent
+    while parent is not None:
+        yield parent.tag
+        parent = parent.parent
+
+
+def _normalize_lines(text: str) -> List[str]:
+    """Collapse whitespace within lines and drop empty lines."""
+    lines = (" ".join(line.split()) for line in text.split("\n"))
+    return [line for line in lines if line]
+
+
+def _to_str(html: Union[str, bytes]) -> str:
+    if isinstance(html, bytes):
+        return html.decode("utf-8", errors="replace")
+    return html
+
+
+def _extract_selectolax(html: Union[str, bytes], strip_boilerplate: bool) -> str:
+    tree = LexborHTMLParser(_to_str(html))
+    tree.strip_tags(list(SKIP_TAGS))
+    if strip_boilerplate:
+        # Find every match before removing anything: decomposing a node frees
+        # its descendants, so only the outermost matches may be decomposed
+        matched = set()
+        outermost = []
+        for node in tree.css(", ".join(sorted(BOILERPLATE_TAGS)) + ", [class], [id]"):
+            attrs = node.attributes
+            in_content = node.tag == "header" and _in_content(_ancestor_tags(node))
+            if not _is_boilerplate(node.tag, attrs.get("class"), attrs.get("id"), in_content):
+                continue
+            matched.add(node.mem_id)
+            parent = node.parent
+            while parent is not None and parent.mem_id not in matched:
+                parent = parent.parent
+            if parent is None:
+                outermost.append(node)
+        for node in outermost:
+            node.decompose()
+
+    if tree.root is None:
+        return ""
+    parts = []
+    # Depth-first walk; a None entry marks the end of a block element
+    stack = [tree.root]
+    while stack:
+        node = stack.pop()
+        if node is None:
+            parts.append("\n")
+        elif node.tag == "-text":
+            parts.append(node.text_content)
+        else:
+            if node.tag in BLOCK_TAGS:
+                parts.append("\n")
+                stack.append(None)
+            stack.extend(reversed(list(node.iter(include_text=True))))
+    return "".join(parts)
+
+
+def _extract_lxml(html: Union[str, bytes], strip_boilerplate: bool) -> str:
+    if isinstance(html, str):
+        # lxml refuses str input that carries an encoding declaration
+        html = XML_DECLARATION.sub("", html, count=1)
+    try:
+        doc = lxml.html.fromstring(html)
+    except (etree.ParserError, ValueError):
+        return ""
+    etree.strip_elements(doc, *SKIP_TAGS, with_tail=False)
+    if strip_boilerplate:
+        matched = []
+        for el in doc.iter():
+            if not isinstance(el.tag, str) or el.getparent() is None:
+                continue
+            in_content = el.tag == "header" and _in_content(a.tag for a in el.iterancestors())
+            if _is_boilerplate(el.tag, el.get("class"), el.get("id"), in_content):
+                matched.append(el)
+        for el in matched:
+            el.drop_tree()
+    for el in doc.iter(*BLOCK_TAGS):
+        el.text = "\n" + (el.text or "")
+        el.tail = "\n" + (el.tail or "")
+    return doc.text_content()
+
+
+class _StreamingTextParser(HTMLParser):
+    """Incremental extractor on the standard library tokenizer."""
+
+    def __init__(self, strip_boilerplate: bool):
+        super().__init__(convert_charrefs=True)
+        self.strip_boilerplate = strip_boilerplate
+        # Open tags inside the element being skipped, outermost first
+        self.skip_stack: List[str] = []
+        # Open <main>/<article> elements, where <header> is content
+        self.content_depth = 0
+        self.parts: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            if not self.skip_stack and tag in BLOCK_TAGS:
+                self.parts.append("\n")
+            return
+        if self.skip_stack:
+            self.skip_stack.append(tag)
+            return
+        if tag in SKIP_TAGS:
+            self.skip_stack.append(tag)
+            return
+        if self.strip_boilerplate:
+            attrs = dict(attrs)
+            if _is_boilerplate(tag, attrs.get("class"), attrs.get("id"), self.content_depth > 0):
+                self.skip_stack.append(tag)
+                return
+        if tag in HEADLINE_CONTAINERS:
+            self.content_depth += 1
+        if tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in VOID_TAGS:
+            return
+        if self.skip_stack:
+            # Close implicitly closed tags (e.g. <li> without </li>) as well
+            if tag in self.skip_stack:
+                while self.skip_stack.pop() != tag:
+                    pass
+            return
+        if tag in HEADLINE_CONTAINERS and self.content_depth:
+            self.content_depth -= 1
+        if tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self.skip_stack:
+            self.parts.append(data)
+
+    def take(self) -> str:
+        text = "".join(self.parts)
+        self.parts = []
+        return text
+
+
+class _LxmlStreamingParser:
+    """Incremental extractor on lxml's pull parser.
+
+    Text is emitted in document order as soon as it is complete: an
+    element's leading text when its first child starts, a sibling's tail when
+    the next sibling starts, and the rest when the element ends. Finished
+    elements are removed so memory stays bounded by the document depth.
+    """
+
+    def __init__(self, strip_boilerplate: bool, encoding: Optional[str] = None):
+        self.strip_boilerplate = strip_boilerplate
+        self.parser = etree.HTMLPullParser(events=("start", "end"), encoding=encoding)
+        self.skip_root = None
+        self.parts: List[str] = []
+
+    def _skipped(self, el) -> bool:
+        if el.tag in SKIP_TAGS:
+            return True
+        if not self.strip_boilerplate:
+            return False
+        in_content = el.tag == "header" and _in_content(a.tag for a in el.iterancestors())
+        return _is_boilerplate(el.tag, el.get("class"), el.get("id"), in_content)
+
+    def _start(self, el):
+        if self.skip_root is not None:
+            return
+        parent = el.getparent()
+        if parent is not None:
+            if parent.text:
+                self.parts.append(parent.text)
+                parent.text = None
+            previous = el.getprevious()
+            while previous is not None:
+                if previous.tail:
+                    self.parts.append(previous.tail)
+                parent.remove(previous)
+                previous = el.getprevious()
+        if self._skipped(el):
+            self.skip_root = el
+        elif el.tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def _end(self, el):
+        if self.skip_root is not None:
+            if el is self.skip_root:
+                self.skip_root = None
+                el.clear(keep_tail=True)
+            return
+        if el.text:
+            self.parts.append(el.text)
+        for child in el:
+            if child.tail:
+                self.parts.append(child.tail)
+        if el.tag in BLOCK_TAGS:
+            self.parts.append("\n")
+        el.clear(keep_tail=True)
+
+    def _drain(self):
+        for event, el in self.parser.read_events():
+            if not isinstance(el.tag, str):
+                continue
+            if event == "start":
+                self._start(el)
+            else:
+                self._end(el)
+
+    def feed(self, data: Union[str, bytes]):
+        self.parser.feed(data)
+        self._drain()
+
+    def close(self):
+        try:
+            self.parser.close()
+        except etree.XMLSyntaxError:
+            pass
+        self._drain()
+
+    def take(self) -> str:
+        text = "".join(self.parts)
+        self.parts = []
+        return text
+
+
+class HTMLTextStream:
+    """Push-style streaming extractor.
+
+    Feed chunks of HTML as they arrive and collect complete lines of text,
+    so a large document never has to be held in memory as a whole.
+
+    Args:
+        strip_boilerplate: Whether to drop navigation, ads and similar content
+        encoding: Encoding of byte chunks (default: utf-8, or detected by lxml)
+        backend: "lxml" or "stdlib"; defaults to lxml when it is installed
+    """
+
+    def __init__(self, strip_boilerplate: bool = True, encoding: Optional[str] = None,
+                 backend: Optional[str] = None):
+        backend = backend or ("lxml" if etree is not None else "stdlib")
+        if backend == "lxml":
+            if etree is None:
+                raise ImportError("lxml is required for the lxml streaming backend")
+            self._parser = _LxmlStreamingParser(strip_boilerplate, encoding)
+            self._decoder = None
+        elif backend == "stdlib":
+            self._parser = _StreamingTextParser(strip_boilerplate)
+            self._decoder = codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+        else:
+            raise ValueError(f"Unsupported streaming backend: {backend}")
+        self.backend = backend
+        self._pending = ""
+
+    def _lines(self, text: str, final: bool = False) -> List[str]:
+        text = self._pending + text
+        if final:
+            self._pending = ""
+        else:
+            text, _, self._pending = text.rpartition("\n")
+        return _normalize_lines(text)
+
+    def feed(self, chunk: Union[str, bytes]) -> List[str]:
+        """
+        Parse a chunk of HTML.
+
+        Args:
+            chunk: The next piece of the document
+
+        Returns:
+            The lines of text completed by this chunk
+        """
+        if self._decoder is not None and isinstance(chunk, bytes):
+            chunk = self._decoder.decode(chunk)
+        self._parser.feed(chunk)
+        return self._lines(self._parser.take())
+
+    def close(self) -> List[str]:
+        """Finish the document and return its remaining lines."""
+        if self._decoder is not None:
+            tail = self._decoder.decode(b"", final=True)
+            if tail:
+                self._parser.feed(tail)
+        self._parser.close()
+        return self._lines(self._parser.take(), final=True)
+
+
+_EXTRACTORS = {
+    "selectolax": _extract_selectolax,
+    "lxml": _extract_lxml,
+}
+
+
+def html_to_text(
+    html: Union[str, bytes],
+    strip_boilerplate: bool = True,
+    separator: str = "\n",
+    backend: Optional[str] = None,
+) -> str:
+    """
+    Convert an HTML document to plain text.
+
+    Args:
+        html: The document
+        strip_boilerplate: Whether to drop navigation, ads and similar content
+        separator: String placed between lines of text; use " " for a single
+            line of running text
+        backend: Parser to use (see available_backends()); defaults to the
+            fastest installed one
+
+    Returns:
+        The text with whitespace collapsed and empty lines removed; when
+        stripping boilerplate leaves nothing, the unstripped text
+    """
+    if not html:
+        return ""
+    backend = backend or available_backends()[0]
+    if backend != "stdlib" and (backend not in _EXTRACTORS or backend not in available_backends()):
+        raise ValueError(f"Unsupported or unavailable HTML backend: {backend}")
+
+    def extract(strip: bool) -> List[str]:
+        if backend == "stdlib":
+            stream = HTMLTextStream(strip, backend="stdlib")
+            return stream.feed(html) + stream.close()
+        return _normalize_lines(_EXTRACTORS[backend](html, strip))
+
+    lines = extract(strip_boilerplate)
+    if not lines and strip_boilerplate:
+        lines = extract(False)
+    return separator.join(lines)
+
+
+def iter_html_text(
+    chunks: Iterable[Union[str, bytes]],
+    strip_boilerplate: bool = True,
+    encoding: Optional[str] = None,
+    backend: Optional[str] = None,
+) -> Iterator[str]:
+    """
+    Stream lines of text out of an HTML document delivered in chunks.
+
+    Args:
+        chunks: Pieces of the document, e.g. ``response.iter_content(65536)``
+        strip_boilerplate: Whether to drop navigation, ads and similar content
+        encoding: Encoding of byte chunks
+        backend: "lxml" or "stdlib" (default: lxml when installed)
+
+    Yields:
+        Lines of text, whitespace-collapsed and non-empty
+    """
+    stream = HTMLTextStream(strip_boilerplate, encoding, backend)
+    for chunk in chunks:
+        if chunk:
+            yield from stream.feed(chunk)
+    yield from stream.close()
+
+
+async def aiter_html_text(
+    chunks: AsyncIterable[Union[str, bytes]],
+    strip_boilerplate: bool = True,
+    encoding: Optional[str] = None,
+    backend: Optional[str] = None,
+) -> AsyncIterator[str]:
+    """
+    Async variant of iter_html_text, e.g. for ``response.content.iter_chunked()``.
+
+    Args:
+        chunks: Pieces of the document
+        strip_boilerplate: Whether to drop navigation, ads and similar content
+        encoding: Encoding of byte chunks
+        backend: "lxml" or "stdlib" (default: lxml when installed)
+
+    Yields:
+        Lines of text, whitespace-collapsed and non-empty
+    """
+    stream = HTMLTextStream(strip_boilerplate, encoding, backend)
+    async for chunk in chunks:
+        if chunk:
+            for line in stream.feed(chunk):
+                yield line
+    for line in stream.close():
+        yield line
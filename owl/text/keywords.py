@@ -0,0 +1,99 @@
+"""
+Keyword extraction.
+Turns a natural-language question into search terms locally, without a
+model call: stopwords and question filler are dropped, and the remaining
+words are grouped into phrases and ranked RAKE-style (word degree over
+frequency) when there are more than the requested number.
+"""
+
+import logging
+import re
+from collections import defaultdict
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+WORD = re.compile(r"[A-Za-z0-9][A-Za-z0-9&'.+-]*[A-Za-z0-9+]|[A-Za-z0-9]")
+PHRASE_BREAK = re.compile(r"[,;:!?()\[\]\"/]|\.(?:\s|$)")
+
+STOPWORDS = frozenset(
+    "a an the and or but if of to in on at by for with from as is are was were be been being it its "
+    "this that these those he she they we you i his her their our your them him us me my "
+    "do does did has have had will would can could should may might must shall so than then there "
+    "here what which who whom when where why how all any each some such also just only very into "
+    "about over after before up down out more most other between s t not no".split()
+)
+
+# Words that are common in questions to a news assistant but useless as search terms
+QUERY_FILLER = frozenset(
+    "news latest recent recently current currently today today's tonight yesterday week this "
+    "update updates happening happened going on tell give show find get know let please "
+    "anything something everything new headlines headline story stories article articles "
+    "report reports info information regarding related".split()
+)
+
+
+def extract_keywords(text: str, max_keywords: int = 6) -> List[str]:
+    """
+    Extract search keyphrases from a query.
+
+    Args:
+        text: The query
+        max_keywords: Maximum number of phrases
+
+    Returns:
+        Phrases in the order they appear in the query, original casing kept
+    """
+    phrases: List[List[str]] = []
+    for chunk in PHRASE_BREAK.split(text):
+        current: List[str] = []
+        for match in WORD.finditer(chunk):
+            word = re.sub(r"'s$", "", match.group(0)).strip("'.")
+            lowered = word.lower()
+            # Acronyms such as "US" or "IT" are kept even when they spell a stopword
+            filler = lowered in STOPWORDS or lowered in QUERY_FILLER or "'" in lowered
+            if not word or (filler and not (word.isupper() and len(word) > 1)):
+                if current:
+                    phrases.append(current)
+                    current = []
+                continue
+            current.append(word)
+        if current:
+            phrases.append(current)
+    if not phrases:
+        return []
+
+    unique: Dict[str, List[str]] = {}
+    for phrase in phrases:
+        unique.setdefault(" ".join(phrase).lower(), phrase)
+    if len(unique) <= max_keywords:
+        return [" ".join(phrase) for phrase in unique.values()]
+
+    frequency: Dict[str, int] = defaultdict(int)
+    degree: Dict[str, int] = defaultdict(int)
+    for phrase in phrases:
+        for word in phrase:
+            frequency[word.lower()] += 1
+            degree[word.lower()] += len(phrase)
+    scores = {
+        key: sum(degree[w.lower()] / frequency[w.lower()] for w in phrase)
+        for key, phrase in unique.items()
+    }
+    best = set(sorted(scores, key=scores.get, reverse=True)[:max_keywords])
+    return [" ".join(phrase) for key, phrase in unique.items() if key in best]
+
+
+def extract_search_terms(text: str, max_keywords: int = 6) -> str:
+    """
+    Build a search query from a natural-language question.
+
+    Args:
+        text: The question
+        max_keywords: Maximum number of phrases
+
+    Returns:
+        The keyphrases joined by spaces, or the stripped question when no
+        keyphrase is found
+    """
+    keywords = extract_keywords(text, max_keywords)
+    return " ".join(keywords) if keywords else text.strip()
@@ -0,0 +1,340 @@
+"""
+Text summarization.
+Provides a local extractive summarizer (TF-IDF sentence vectors ranked with
+TextRank on NumPy) that runs in milliseconds, plus an optional abstractive
+LLM stage that is only used for texts within a size window. Summaries are
+cached by content hash.
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+EXTRACTIVE = "extractive"
+ABSTRACTIVE = "abstractive"
+AUTO = "auto"
+
+DEFAULT_SUMMARY_SENTENCES = 5
+
+# Texts longer than this (in words) are summarized off the event loop; at this
+# size an extractive summary takes about 2 ms, longer ones would stall other coroutines
+OFFLOAD_WORDS = 1000
+
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])[\"')\]]*\s+(?=[\"'(\[]?[A-Z0-9])")
+LINE_BREAK = re.compile(r"\n+")
+# A sentence candidate ending in a title, month or similar abbreviation, an
+# initial ("John F.") or a dotted acronym ("U.S.") continues in the next one
+ABBREVIATION_END = re.compile(
+    r"(?:\b(?:mr|mrs|ms|dr|prof|sr|jr|st|mt|gen|gov|sen|rep|rev|hon|lt|col|capt|sgt|"
+    r"jan|feb|mar|apr|jun|jul|aug|sep|sept|oct|nov|dec|vs|approx|fig|dept)"
+    r"|(?<![A-Za-z.])(?:[A-Za-z]\.)*[A-Za-z])\.[\"')\]]*$",
+    re.IGNORECASE,
+)
+WORD = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+STOPWORDS = frozenset(
+    "a an the and or but if of to in on at by for with from as is are was were be been being it its "
+    "this that these those he she they we you i his her their our your them him us me my not no "
+    "do does did has have had will would can could should may might must shall so than then there "
+    "here what which who whom when where why how all any each some such also just only very into "
+    "about over after before up down out more most other said says".split()
+)
+
+# Async callable turning a prompt into a completion
+LLMCallable = Callable[[str], Awaitable[str]]
+
+ABSTRACTIVE_PROMPT = (
+    "Summarize the following text in at most {words} words. Keep names, numbers and dates "
+    "exact and do not add information that is not in the text.\n\n{text}"
+)
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences on terminal punctuation and line breaks.
+
+    Periods of abbreviations, initials and dotted acronyms do not end a
+    sentence.
+    """
+    sentences: List[str] = []
+    for line in LINE_BREAK.split(text):
+        continues = False
+        for part in SENTENCE_BOUNDARY.split(line):
+            part = part.strip()
+            if not part:
+                continue
+            if continues:
+                sentences[-1] = f"{sentences[-1]} {part}"
+            else:
+                sentences.append(part)
+            continues = ABBREVIATION_END.search(sentences[-1]) is not None
+    return sentences
+
+
+def _words(sentence: str) -> List[str]:
+    return [w for w in WORD.findall(sentence.lower()) if w not in STOPWORDS]
+
+
+class ExtractiveSummarizer:
+    """Picks the most central sentences of a text.
+
+    Sentences become TF-IDF vectors; their cosine-similarity graph is ranked
+    with TextRank (PageRank power iteration). Very long texts are ranked by
+    similarity to the document centroid instead, which is linear in the
+    number of sentences.
+
+    Args:
+        damping: TextRank damping factor
+        lead_bias: Extra weight for early sentences (news leads), 0 to disable
+        max_graph_sentences: Above this many sentences, centroid ranking is
+            used instead of TextRank
+        min_sentence_words: Sentences with fewer content words are only used
+            when nothing else is available
+    """
+
+    def __init__(
+        self,
+        damping: float = 0.85,
+        lead_bias: float = 0.1,
+        max_graph_sentences: int = 400,
+        min_sentence_words: int = 3,
+    ):
+        self.damping = damping
+        self.lead_bias = lead_bias
+        self.max_graph_sentences = max_graph_sentences
+        self.min_sentence_words = min_sentence_words
+
+    def _tfidf(self, tokenized: List[List[str]]) -> np.ndarray:
+        vocabulary: Dict[str, int] = {}
+        for tokens in tokenized:
+            for token in tokens:
+                vocabulary.setdefault(token, len(vocabulary))
+        counts = np.zeros((len(tokenized), max(len(vocabulary), 1)), dtype=np.float32)
+        for row, tokens in enumerate(tokenized):
+            for token in tokens:
+                counts[row, vocabulary[token]] += 1
+        doc_freq = (counts > 0).sum(axis=0)
+        idf = np.log((1 + len(tokenized)) / (1 + doc_freq)) + 1
+        matrix = np.log1p(counts) * idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        return matrix / norms
+
+    def _textrank(self, matrix: np.ndarray, iterations: int = 50, tol: float = 1e-6) -> np.ndarray:
+        n = matrix.shape[0]
+        similarity = matrix @ matrix.T
+        np.fill_diagonal(similarity, 0)
+        row_sums = similarity.sum(axis=1, keepdims=True)
+        # Sentences that share no words with any other link to every sentence
+        transition = np.where(row_sums > 0, similarity / np.where(row_sums > 0, row_sums, 1), 1.0 / n)
+        scores = np.full(n, 1.0 / n)
+        for _ in range(iterations):
+            updated = (1 - self.damping) / n + self.damping * (transition.T @ scores)
+            if np.abs(updated - scores).sum() < tol:
+                return updated
+            scores = updated
+        return scores
+
+    def rank(self, sentences: List[str]) -> np.ndarray:
+        """Return a centrality score for each sentence."""
+        tokenized = [_words(sentence) for sentence in sentences]
+        matrix = self._tfidf(tokenized)
+        if len(sentences) > self.max_graph_sentences:
+            centroid = matrix.mean(axis=0)
+            scores = matrix @ centroid
+        else:
+            scores = self._textrank(matrix)
+        if self.lead_bias:
+            positions = np.arange(len(sentences))
+            scores = scores * (1 + self.lead_bias / (1 + positions / 3))
+        lengths = np.array([len(tokens) for tokens in tokenized])
+        if (lengths >= self.min_sentence_words).any():
+            scores = np.where(lengths >= self.min_sentence_words, scores, -np.inf)
+        return scores
+
+    def summarize(self, text: str, max_words: Optional[int] = None,
+                  max_sentences: Optional[int] = None) -> str:
+        """
+        Extract a summary.
+
+        Args:
+            text: The text to summarize
+            max_words: Word budget for the summary
+            max_sentences: Sentence budget (default: 5 when no word budget is given)
+
+        Returns:
+            The selected sentences in their original order
+        """
+        sentences = split_sentences(text)
+        if not sentences:
+            return ""
+        if max_words is None and max_sentences is None:
+            max_sentences = DEFAULT_SUMMARY_SENTENCES
+        if len(sentences) == 1:
+            return self._truncate(sentences[0], max_words)
+
+        scores = self.rank(sentences)
+        chosen: List[int] = []
+        used_words = 0
+        for index in np.argsort(-scores, kind="stable"):
+            if not np.isfinite(scores[index]):
+                break
+            if max_sentences is not None and len(chosen) >= max_sentences:
+                break
+            length = len(sentences[index].split())
+            if max_words is not None and used_words + length > max_words:
+                if chosen:
+                    continue
+                # Even the best sentence is over budget: keep its beginning
+                return self._truncate(sentences[index], max_words)
+            chosen.append(int(index))
+            used_words += length
+        return " ".join(sentences[i] for i in sorted(chosen))
+
+    @staticmethod
+    def _truncate(sentence: str, max_words: Optional[int]) -> str:
+        words = sentence.split()
+        if max_words is not None and len(words) > max_words:
+            return " ".join(words[:max_words]) + "..."
+        return sentence
+
+
+class Summarizer:
+    """Summarization stage with an extractive fast path and a gated LLM mode.
+
+    In ``auto`` mode the LLM is only called when one is configured and the
+    text has at least ``llm_min_words`` words; short texts are summarized
+    locally. Texts longer than ``llm_max_input_words`` are first reduced
+    extractively, so an LLM call never receives a whole long page.
+
+    Args:
+        llm: Optional async callable ``prompt -> completion`` for abstractive
+            summaries
+        llm_min_words: Minimum text length (words) for the LLM in auto mode
+        llm_max_input_words: Maximum number of words sent to the LLM
+        cache_size: Number of summaries kept, keyed by content hash
+        extractive: The extractive summarizer to use
+    """
+
+    def __init__(
+        self,
+        llm: Optional[LLMCallable] = None,
+        llm_min_words: int = 400,
+        llm_max_input_words: int = 1500,
+        cache_size: int = 512,
+        extractive: Optional[ExtractiveSummarizer] = None,
+    ):
+        self.llm = llm
+        self.llm_min_words = llm_min_words
+        self.llm_max_input_words = llm_max_input_words
+        self.cache_size = cache_size
+        self.extractive = extractive or ExtractiveSummarizer()
+        self.cache: "OrderedDict[str, str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.llm_calls = 0
+        self.llm_failures = 0
+        self.extractive_seconds = 0.0
+
+    @staticmethod
+    def cache_key(content: str, length: Optional[int], mode: str) -> str:
+        """Build the cache key for a summary request."""
+        digest = hashlib.sha256(content.encode("utf-8", errors="replace")).hexdigest()
+        return f"{digest}:{length}:{mode}"
+
+    def _choose_mode(self, mode: str, word_count: int) -> str:
+        if mode not in (AUTO, EXTRACTIVE, ABSTRACTIVE):
+            raise ValueError(f"Unknown summarization mode: {mode}")
+        if self.llm is None or mode == EXTRACTIVE:
+            return EXTRACTIVE
+        if mode == ABSTRACTIVE or word_count >= self.llm_min_words:
+            return ABSTRACTIVE
+        return EXTRACTIVE
+
+    def summarize_extractive(self, content: str, length: Optional[int] = None) -> str:
+        """Summarize locally, without the cache."""
+        start = time.perf_counter()
+        try:
+            return self.extractive.summarize(content, max_words=length)
+        finally:
+            self.extractive_seconds += time.perf_counter() - start
+
+    async def summarize(self, content: str, length: Optional[int] = None, mode: str = AUTO) -> str:
+        """
+        Summarize content.
+
+        Args:
+            content: The text to summarize
+            length: Maximum length of the summary in words
+            mode: "auto", "extractive" or "abstractive"
+
+        Returns:
+            The summary
+        """
+        if not content or not content.strip():
+            return ""
+        word_count = len(content.split())
+        if length is not None and word_count <= length:
+            return content
+
+        chosen = self._choose_mode(mode, word_count)
+        key = self.cache_key(content, length, chosen)
+        summary = self.cache.get(key)
+        if summary is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return summary
+        self.misses += 1
+
+        if chosen == ABSTRACTIVE:
+            summary = await self._summarize_abstractive(content, length, word_count)
+        if summary is None:
+            if word_count > OFFLOAD_WORDS:
+                loop = asyncio.get_running_loop()
+                summary = await loop.run_in_executor(None, self.summarize_extractive, content, length)
+            else:
+                summary = self.summarize_extractive(content, length)
+
+        self.cache[key] = summary
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return summary
+
+    async def _summarize_abstractive(self, content: str, length: Optional[int],
+                                     word_count: int) -> Optional[str]:
+        text = content
+        if word_count > self.llm_max_input_words:
+            loop = asyncio.get_running_loop()
+            text = await loop.run_in_executor(
+                None, self.summarize_extractive, content, self.llm_max_input_words
+            )
+        target = length or max(50, min(200, word_count // 10))
+        self.llm_calls += 1
+        try:
+            summary = await self.llm(ABSTRACTIVE_PROMPT.format(words=target, text=text))
+        except Exception as e:
+            self.llm_failures += 1
+            logger.warning(f"LLM summarization failed, using extractive summary: {str(e)}")
+            return None
+        summary = (summary or "").strip()
+        return summary or None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache and mode usage statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "llm_calls": self.llm_calls,
+            "llm_failures": self.llm_failures,
+            "extractive_seconds": round(self.extractive_seconds, 4),
+        }
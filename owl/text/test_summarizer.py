@@ -0,0 +1,103 @@
+import asyncio
+import threading
+
+from owl.text.keywords import extract_keywords, extract_search_terms
+from owl.text.summarizer import ExtractiveSummarizer, Summarizer, split_sentences
+
+ARTICLE = (
+    "Dr. Lisa Cook said the U.S. economy is cooling. The Federal Reserve held interest rates steady on Wednesday. "
+    "Officials signaled that interest rates could fall later this year if inflation keeps easing. "
+    "Markets rallied after the Federal Reserve decision. Mr. Powell spoke to reporters in Washington. "
+    "Some analysts expect two rate cuts before December. The weather in Washington was sunny."
+)
+
+
+def test_split_keeps_abbreviations_and_initials():
+    assert split_sentences("Dr. Smith met Mr. Jones in the U.S. Senate. They talked.") == [
+        "Dr. Smith met Mr. Jones in the U.S. Senate.", "They talked."]
+    assert split_sentences("John F. Kennedy was president. He died in 1963.") == [
+        "John F. Kennedy was president.", "He died in 1963."]
+    assert split_sentences("Shares peaked on Jan. 5 in New York. Trading was heavy.") == [
+        "Shares peaked on Jan. 5 in New York.", "Trading was heavy."]
+
+
+def test_split_on_punctuation_and_line_breaks():
+    assert split_sentences("Prices rose 5%. Really? Yes!\nA new line") == [
+        "Prices rose 5%.", "Really?", "Yes!", "A new line"]
+    assert split_sentences("Growth was 3.5 percent. Next year 4.") == ["Growth was 3.5 percent.", "Next year 4."]
+
+
+def test_extractive_summary_keeps_whole_sentences_in_order():
+    sentences = split_sentences(ARTICLE)
+    summary = ExtractiveSummarizer().summarize(ARTICLE, max_sentences=2)
+    chosen = split_sentences(summary)
+    assert len(chosen) == 2
+    assert all(sentence in sentences for sentence in chosen)
+    assert [sentences.index(sentence) for sentence in chosen] == sorted(sentences.index(s) for s in chosen)
+    assert "sunny" not in summary
+
+
+def test_extractive_summary_respects_word_budget():
+    summary = ExtractiveSummarizer().summarize(ARTICLE, max_words=25)
+    assert 0 < len(summary.split()) <= 25
+
+
+def test_summarizer_caches_and_returns_short_content():
+    async def main():
+        summarizer = Summarizer()
+        assert await summarizer.summarize("Short text.", length=10) == "Short text."
+        first = await summarizer.summarize(ARTICLE, length=30)
+        assert await summarizer.summarize(ARTICLE, length=30) == first
+        assert (summarizer.hits, summarizer.misses) == (1, 1)
+
+    asyncio.run(main())
+
+
+def test_summarizer_falls_back_when_llm_fails():
+    async def failing(prompt):
+        raise RuntimeError("model down")
+
+    async def main():
+        summarizer = Summarizer(llm=failing, llm_min_words=10)
+        summary = await summarizer.summarize(ARTICLE, length=30)
+        assert summary and summarizer.stats()["llm_failures"] == 1
+
+    asyncio.run(main())
+
+
+def test_long_texts_are_summarized_off_the_loop():
+    async def main():
+        summarizer = Summarizer()
+        threads = []
+        summarize = summarizer.summarize_extractive
+
+        def recording(content, length=None):
+            threads.append(threading.current_thread())
+            return summarize(content, length)
+
+        summarizer.summarize_extractive = recording
+        await summarizer.summarize(ARTICLE, length=30)
+        text = " ".join(f"Sentence number {i} talks about topic {i % 7} in detail." for i in range(400))
+        summary = await summarizer.summarize(text, length=40)
+        assert 0 < len(summary.split()) <= 40
+        assert threads[0] is threading.main_thread()
+        assert threads[1] is not threading.main_thread()
+
+    asyncio.run(main())
+
+
+def test_keywords_drop_question_filler():
+    assert extract_keywords("What is the latest news about Tesla stock?") == ["Tesla stock"]
+    assert extract_search_terms("tell me the news") == "tell me the news"
+
+
+if __name__ == "__main__":
+    test_split_keeps_abbreviations_and_initials()
+    test_split_on_punctuation_and_line_breaks()
+    test_extractive_summary_keeps_whole_sentences_in_order()
+    test_extractive_summary_respects_word_budget()
+    test_summarizer_caches_and_returns_short_content()
+    test_summarizer_falls_back_when_llm_fails()
+    test_long_texts_are_summarized_off_the_loop()
+    test_keywords_drop_question_filler()
+    print("Summarizer checks passed")
@@ -3,29 +3,89 @@ News Toolkit for OWL.
 This toolkit provides tools for fetching and processing news articles.
 """
 
-import feedparser
-import urllib.parse
+import asyncio
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor
 from typing import Optional, Any
+from owl.news import FeedCache, FeedPoller, dedupe_articles, get_feed_cache, google_news_url
+from owl.text import extract_search_terms
 from owl.types import Tool
 
+DEFAULT_ANTHROPIC_MODEL = "claude-3-opus-20240229"
+DEFAULT_OPENAI_MODEL = "gpt-4-turbo-preview"
+DEFAULT_MAX_TOKENS = 1024
+
+# How search keywords are obtained: locally (no LLM call) or from the LLM, cached per query
+LOCAL_KEYWORDS = "local"
+LLM_KEYWORDS = "llm"
+KEYWORD_MAX_TOKENS = 64
+KEYWORD_CACHE_SIZE = 1024
+
+KEYWORD_SYSTEM_PROMPT = """
+        You are a helpful AI assistant that extracts relevant search terms from user queries about news.
+        Extract only the most important keywords that would be useful for searching news articles.
+        Return only the keywords, nothing else.
+        """
+
+ANSWER_SYSTEM_PROMPT = """
+        You are a helpful AI assistant that provides news updates. Based on the provided news articles,
+        generate a concise and informative response to the user's query. Include relevant information
+        from the articles and cite your sources.
+        """
+
+NO_ARTICLES_RESPONSE = "I couldn't find any relevant news articles for your query."
+
+# LLM-extracted keywords by normalized query, shared by all toolkit instances
+_keyword_cache: "OrderedDict[str, str]" = OrderedDict()
+_keyword_cache_lock = threading.Lock()
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query for keyword caching (case, punctuation and spacing)."""
+    return " ".join(re.findall(r"[a-z0-9]+", query.lower()))
+
 class NewsToolkit:
     """A toolkit for fetching and processing news articles."""
     
-    def __init__(self, llm_client=None):
+    def __init__(self, llm_client=None, executor: Optional[Executor] = None,
+                 feed_cache: Optional[FeedCache] = None, model: Optional[str] = None,
+                 max_tokens: int = DEFAULT_MAX_TOKENS, keyword_mode: str = LOCAL_KEYWORDS):
         """
         Initialize the NewsToolkit.
         
         Args:
-            llm_client: Optional LLM client for generating responses (Anthropic, OpenAI, etc.)
+            llm_client: Optional LLM client for generating responses (Anthropic, OpenAI,
+                AsyncAnthropic, AsyncOpenAI, etc.)
+            executor: Optional executor used to run blocking feed fetches from async code.
+                Defaults to the event loop's default executor.
+            feed_cache: Optional feed cache. Defaults to the process-wide cache, so
+                repeated queries for the same topic are served from memory.
+            model: Optional model name. Defaults to DEFAULT_ANTHROPIC_MODEL for Anthropic
+                clients and DEFAULT_OPENAI_MODEL for OpenAI clients.
+            max_tokens: Maximum number of tokens in an answer
+            keyword_mode: "local" extracts search keywords without an LLM call, so a
+                query needs a single LLM round-trip; "llm" asks the LLM and caches the
+                keywords by normalized query.
         """
+        if keyword_mode not in (LOCAL_KEYWORDS, LLM_KEYWORDS):
+            raise ValueError(f"Unknown keyword mode: {keyword_mode}")
         self.llm_client = llm_client
+        self.executor = executor
+        self.model = model
+        self.max_tokens = max_tokens
+        self.keyword_mode = keyword_mode
+        self.feed_cache = feed_cache or get_feed_cache()
+        self.poller: Optional[FeedPoller] = None
         
-    def _get_llm_response(self, messages: list[dict]) -> str:
+    def _get_llm_response(self, messages: list[dict], max_tokens: Optional[int] = None) -> str:
         """
         Get response from LLM client, handling different client types.
         
         Args:
             messages: List of message dictionaries with role and content
+            max_tokens: Maximum number of tokens to generate (default: the toolkit's max_tokens)
             
         Returns:
             The LLM's response text
@@ -40,8 +100,8 @@ class NewsToolkit:
             user_message = next((m["content"] for m in messages if m["role"] == "user"), "")
             
             response = self.llm_client.messages.create(
-                model="claude-3-opus-20240229",
-                max_tokens=1024,
+                model=self.model or DEFAULT_ANTHROPIC_MODEL,
+                max_tokens=max_tokens or self.max_tokens,
                 system=system_message,
                 messages=[{"role": "user", "content": user_message}]
             )
@@ -50,14 +110,56 @@ class NewsToolkit:
         # Handle OpenAI client
         elif self.llm_client.__class__.__name__ == "OpenAI":
             response = self.llm_client.chat.completions.create(
-                model="gpt-4-turbo-preview",
-                max_tokens=1024,
+                model=self.model or DEFAULT_OPENAI_MODEL,
+                max_tokens=max_tokens or self.max_tokens,
                 messages=messages
             )
             return response.choices[0].message.content
             
         else:
             raise ValueError(f"Unsupported LLM client type: {type(self.llm_client)}")
+            
+    async def _aget_llm_response(self, messages: list[dict], max_tokens: Optional[int] = None) -> str:
+        """
+        Get response from LLM client without blocking the event loop.
+        
+        Async clients are awaited directly; synchronous clients are run in the executor.
+        
+        Args:
+            messages: List of message dictionaries with role and content
+            max_tokens: Maximum number of tokens to generate (default: the toolkit's max_tokens)
+            
+        Returns:
+            The LLM's response text
+        """
+        if isinstance(self.llm_client, type(None)):
+            raise ValueError("LLM client is required")
+            
+        # Handle AsyncAnthropic client
+        if self.llm_client.__class__.__name__ == "AsyncAnthropic":
+            system_message = next((m["content"] for m in messages if m["role"] == "system"), "")
+            user_message = next((m["content"] for m in messages if m["role"] == "user"), "")
+            
+            response = await self.llm_client.messages.create(
+                model=self.model or DEFAULT_ANTHROPIC_MODEL,
+                max_tokens=max_tokens or self.max_tokens,
+                system=system_message,
+                messages=[{"role": "user", "content": user_message}]
+            )
+            return response.content[0].text
+            
+        # Handle AsyncOpenAI client
+        elif self.llm_client.__class__.__name__ == "AsyncOpenAI":
+            response = await self.llm_client.chat.completions.create(
+                model=self.model or DEFAULT_OPENAI_MODEL,
+                max_tokens=max_tokens or self.max_tokens,
+                messages=messages
+            )
+            return response.choices[0].message.content
+            
+        else:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, self._get_llm_response, messages, max_tokens)
         
     def get_tools(self) -> list[Tool]:
         """
@@ -101,81 +203,197 @@ class NewsToolkit:
         Returns:
             A list of dictionaries containing news article information
         """
-        # URL encode the query
-        encoded_query = urllib.parse.quote(query)
-        
-        # Use Google News RSS feed
-        url = f"https://news.google.com/rss/search?q={encoded_query}&hl=en-US&gl=US&ceid=US:en"
-        feed = feedparser.parse(url)
+        # Use the Google News RSS feed, revalidated only when the cached copy is stale
+        entries = self.feed_cache.get(google_news_url(query))
         
         articles = []
-        for entry in feed.entries:
+        for entry in entries:
             article = {
-                "title": entry.title,
-                "link": entry.link,
-                "published": entry.get("published", "Unknown date"),
-                "summary": entry.get("summary", "No summary available")
+                "title": entry["title"],
+                "link": entry["link"],
+                "published": entry["published"] or "Unknown date",
+                "summary": entry["summary"] or "No summary available"
             }
             articles.append(article)
             
         return articles
         
-    def process_news_query(self, user_query: str) -> dict:
+    async def aget_news(self, query: str) -> list[dict]:
         """
-        Process a user's news query and generate a response.
+        Fetch news articles based on a query without blocking the event loop.
         
         Args:
-            user_query: The user's news-related question
+            query: The search query for news articles
             
         Returns:
-            A dictionary containing the response and relevant articles
+            A list of dictionaries containing news article information
         """
-        if not self.llm_client:
-            raise ValueError("LLM client is required for processing news queries. Please initialize NewsToolkit with an LLM client.")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.get_news, query)
+        
+    async def start_polling(self, topics: list[str], interval: Optional[float] = None) -> FeedPoller:
+        """
+        Keep the feeds of the given topics warm in the background, so get_news
+        answers queries for them from memory.
+        
+        Args:
+            topics: The topics (queries) to poll
+            interval: Seconds between refreshes of a topic. Defaults to a bit less
+                than the feed cache freshness window.
             
-        # Extract key terms from the user query using the LLM
-        system_prompt = """
-        You are a helpful AI assistant that extracts relevant search terms from user queries about news.
-        Extract only the most important keywords that would be useful for searching news articles.
-        Return only the keywords, nothing else.
+        Returns:
+            The running poller
         """
+        if self.poller is None:
+            self.poller = FeedPoller(topics, feed_cache=self.feed_cache, interval=interval,
+                                     executor=self.executor)
+            await self.poller.start()
+        return self.poller
         
-        messages = [
-            {"role": "system", "content": system_prompt},
+    async def stop_polling(self) -> None:
+        """Stop the background poller."""
+        if self.poller is not None:
+            await self.poller.stop()
+            self.poller = None
+        
+    def _keyword_messages(self, user_query: str) -> list[dict]:
+        """Build the messages asking the LLM for search keywords."""
+        return [
+            {"role": "system", "content": KEYWORD_SYSTEM_PROMPT},
             {"role": "user", "content": f"Extract search terms from: {user_query}"}
         ]
         
-        search_terms = self._get_llm_response(messages).strip()
+    def _answer_messages(self, user_query: str, articles: list[dict]) -> list[dict]:
+        """Build the messages asking the LLM to answer from the top articles."""
+        article_summaries = "\n\n".join([
+            f"Title: {article['title']}\nSummary: {article['summary']}\nPublished: {article['published']}"
+            + (f"\nAlso reported by {article['duplicates']} other source(s)" if article.get('duplicates') else "")
+            for article in articles[:5]  # Use top 5 stories for context
+        ])
+        return [
+            {"role": "system", "content": ANSWER_SYSTEM_PROMPT},
+            {"role": "user", "content": f"User Query: {user_query}\n\nAvailable Articles:\n{article_summaries}"}
+        ]
+        
+    def _cached_keywords(self, user_query: str) -> Optional[str]:
+        """Return the LLM keywords cached for a query, if any."""
+        key = normalize_query(user_query)
+        with _keyword_cache_lock:
+            terms = _keyword_cache.get(key)
+            if terms is not None:
+                _keyword_cache.move_to_end(key)
+            return terms
         
-        # Fetch news articles using the extracted terms
-        articles = self.get_news(search_terms)
+    def _cache_keywords(self, user_query: str, terms: str) -> None:
+        """Remember the LLM keywords for a query."""
+        with _keyword_cache_lock:
+            _keyword_cache[normalize_query(user_query)] = terms
+            while len(_keyword_cache) > KEYWORD_CACHE_SIZE:
+                _keyword_cache.popitem(last=False)
         
+    def _answer(self, search_terms: str, articles: list[dict], response: Optional[str]) -> dict:
+        """Build the result of a news query."""
         if not articles:
             return {
-                "response": "I couldn't find any relevant news articles for your query.",
-                "articles": []
+                "response": NO_ARTICLES_RESPONSE,
+                "articles": [],
+                "search_terms": search_terms
             }
+        return {
+            "response": response,
+            "articles": articles[:5],  # Return top 5 articles for reference
+            "search_terms": search_terms
+        }
+        
+    def process_news_query(self, user_query: str) -> dict:
+        """
+        Process a user's news query and generate a response.
+        
+        Search keywords are extracted locally or taken from the keyword cache, so
+        the answer is the only LLM call. Syndicated copies of a story are collapsed
+        before the top articles are put in the prompt. On a keyword cache miss in "llm" mode, the
+        feed for the locally extracted keywords is fetched while the LLM extracts
+        its keywords.
+        
+        Args:
+            user_query: The user's news-related question
             
-        # Generate a response using the LLM based on the articles
-        article_summaries = "\n\n".join([
-            f"Title: {article['title']}\nSummary: {article['summary']}\nPublished: {article['published']}"
-            for article in articles[:5]  # Use top 5 articles for context
-        ])
+        Returns:
+            A dictionary containing the response, relevant articles and the search terms used
+        """
+        if not self.llm_client:
+            raise ValueError("LLM client is required for processing news queries. Please initialize NewsToolkit with an LLM client.")
+            
+        local_terms = extract_search_terms(user_query)
+        search_terms = local_terms if self.keyword_mode == LOCAL_KEYWORDS else self._cached_keywords(user_query)
         
-        system_prompt = """
-        You are a helpful AI assistant that provides news updates. Based on the provided news articles,
-        generate a concise and informative response to the user's query. Include relevant information
-        from the articles and cite your sources.
+        if search_terms is not None:
+            articles = self.get_news(search_terms)
+        else:
+            # Fetch the local keywords' feed while the LLM extracts its keywords
+            pool = self.executor or ThreadPoolExecutor(max_workers=1)
+            try:
+                speculative = pool.submit(self.get_news, local_terms)
+                search_terms = self._get_llm_response(
+                    self._keyword_messages(user_query), KEYWORD_MAX_TOKENS
+                ).strip() or local_terms
+                self._cache_keywords(user_query, search_terms)
+                local_articles = speculative.result()
+            finally:
+                if pool is not self.executor:
+                    pool.shutdown(wait=False)
+            same_terms = normalize_query(search_terms) == normalize_query(local_terms)
+            articles = local_articles if same_terms else (self.get_news(search_terms) or local_articles)
+        
+        # Keep one article per story so the context covers more stories
+        articles = dedupe_articles(articles)
+            
+        response = None
+        if articles:
+            # Generate a response using the LLM based on the articles
+            response = self._get_llm_response(self._answer_messages(user_query, articles))
+        
+        return self._answer(search_terms, articles, response)
+        
+    async def aprocess_news_query(self, user_query: str) -> dict:
         """
+        Process a user's news query without blocking the event loop.
         
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": f"User Query: {user_query}\n\nAvailable Articles:\n{article_summaries}"}
-        ]
+        Args:
+            user_query: The user's news-related question
+            
+        Returns:
+            A dictionary containing the response, relevant articles and the search terms used
+        """
+        if not self.llm_client:
+            raise ValueError("LLM client is required for processing news queries. Please initialize NewsToolkit with an LLM client.")
+            
+        local_terms = extract_search_terms(user_query)
+        search_terms = local_terms if self.keyword_mode == LOCAL_KEYWORDS else self._cached_keywords(user_query)
         
-        response = self._get_llm_response(messages)
+        if search_terms is not None:
+            articles = await self.aget_news(search_terms)
+        else:
+            # Fetch the local keywords' feed while the LLM extracts its keywords
+            speculative = asyncio.ensure_future(self.aget_news(local_terms))
+            try:
+                search_terms = (await self._aget_llm_response(
+                    self._keyword_messages(user_query), KEYWORD_MAX_TOKENS
+                )).strip() or local_terms
+            except Exception:
+                speculative.cancel()
+                raise
+            self._cache_keywords(user_query, search_terms)
+            local_articles = await speculative
+            if normalize_query(search_terms) == normalize_query(local_terms):
+                articles = local_articles
+            else:
+                articles = await self.aget_news(search_terms) or local_articles
         
-        return {
-            "response": response,
-            "articles": articles[:5]  # Return top 5 articles for reference
-        } 
\ No newline at end of file
+        articles = dedupe_articles(articles)
+        
+        response = None
+        if articles:
+            response = await self._aget_llm_response(self._answer_messages(user_query, articles))
+        
+        return self._answer(search_terms, articles, response)
@@ -18,6 +18,7 @@ from .enhanced_role_playing import (
     OwlGAIARolePlaying,
     run_society,
     arun_society,
+    astream_society,
 )
 from .gaia import GAIABenchmark
 from .document_toolkit import DocumentProcessingToolkit
@@ -28,6 +29,7 @@ __all__ = [
     "OwlGAIARolePlaying",
     "run_society",
     "arun_society",
+    "astream_society",
     "GAIABenchmark",
     "DocumentProcessingToolkit",
 ]
@@ -12,7 +12,7 @@
 # limitations under the License.
 # ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
 
-from typing import Dict, List, Optional, Tuple
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
 
 from camel.agents import ChatAgent
@@ -502,26 +502,34 @@ def run_society(
     return answer, chat_history, token_info
 
 
-async def arun_society(
+async def astream_society(
     society: OwlRolePlaying,
     round_limit: int = 15,
-) -> Tuple[str, List[dict], dict]:
-    overall_completion_token_count = 0
-    overall_prompt_token_count = 0
-
-    chat_history = []
+) -> AsyncIterator[dict]:
+    r"""Run a society asynchronously, yielding each round as soon as it
+    completes.
+
+    Args:
+        society (OwlRolePlaying): The society to run.
+        round_limit (int): Maximum number of rounds. (default: :obj:`15`)
+
+    Yields:
+        dict: The round number, the user and assistant messages, the tool
+            calls made by the assistant and the prompt tokens the round used.
+    """
     init_prompt = """
     Now please give me instructions to solve over overall task step by step. If the task requires some specific knowledge, please instruct me to use tools to complete the task.
         """
     input_msg = society.init_chat(init_prompt)
     for _round in range(round_limit):
         assistant_response, user_response = await society.astep(input_msg)
+        prompt_token_count = 0
         # Check if usage info is available before accessing it
         if assistant_response.info.get("usage") and user_response.info.get("usage"):
-            overall_prompt_token_count += assistant_response.info["usage"].get(
+            prompt_token_count += assistant_response.info["usage"].get(
                 "completion_tokens", 0
             )
-            overall_prompt_token_count += assistant_response.info["usage"].get(
+            prompt_token_count += assistant_response.info["usage"].get(
                 "prompt_tokens", 0
             ) + user_response.info["usage"].get("prompt_tokens", 0)
 
@@ -531,7 +539,15 @@ async def arun_society(
             for tool_call in assistant_response.info["tool_calls"]:
                 tool_call_records.append(tool_call.as_dict())
 
-        _data = {
+        logger.info(
+            f"Round #{_round} user_response:\n {user_response.msgs[0].content if user_response.msgs and len(user_response.msgs) > 0 else ''}"
+        )
+        logger.info(
+            f"Round #{_round} assistant_response:\n {assistant_response.msgs[0].content if assistant_response.msgs and len(assistant_response.msgs) > 0 else ''}"
+        )
+
+        yield {
+            "round": _round,
             "user": user_response.msg.content
             if hasattr(user_response, "msg") and user_response.msg
             else "",
@@ -539,16 +555,9 @@ async def arun_society(
             if hasattr(assistant_response, "msg") and assistant_response.msg
             else "",
             "tool_calls": tool_call_records,
+            "prompt_token_count": prompt_token_count,
         }
 
-        chat_history.append(_data)
-        logger.info(
-            f"Round #{_round} user_response:\n {user_response.msgs[0].content if user_response.msgs and len(user_response.msgs) > 0 else ''}"
-        )
-        logger.info(
-            f"Round #{_round} assistant_response:\n {assistant_response.msgs[0].content if assistant_response.msgs and len(assistant_response.msgs) > 0 else ''}"
-        )
-
         # Check other termination conditions
         if (
             assistant_response.terminated
@@ -560,6 +569,25 @@ async def arun_society(
 
         input_msg = assistant_response.msg
 
+
+async def arun_society(
+    society: OwlRolePlaying,
+    round_limit: int = 15,
+) -> Tuple[str, List[dict], dict]:
+    overall_completion_token_count = 0
+    overall_prompt_token_count = 0
+
+    chat_history = []
+    async for round_data in astream_society(society, round_limit):
+        overall_prompt_token_count += round_data["prompt_token_count"]
+        chat_history.append(
+            {
+                "user": round_data["user"],
+                "assistant": round_data["assistant"],
+                "tool_calls": round_data["tool_calls"],
+            }
+        )
+
     answer = chat_history[-1]["assistant"]
     token_info = {
         "completion_token_count": overall_completion_token_count,
@@ -1,26 +1,110 @@
+import asyncio
+import contextlib
+import json
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from abc import ABC, abstractmethod
-from owl import OWL
+import aiohttp
+from .resources import ResourceRegistry, RetryPolicy, get_resource_registry
 
 class BaseClient(ABC):
     """Base class for all tool clients."""
     
-    def __init__(self):
-        """Initialize the base client."""
+    def __init__(self, resources: Optional[ResourceRegistry] = None, retry_policy: Optional[RetryPolicy] = None,
+                 max_connections: Optional[int] = None, timeout: Optional[float] = None,
+                 headers: Optional[Dict[str, str]] = None):
+        """
+        Initialize the base client.
+        
+        Clients borrow the HTTP session and OWL runtime of a resource
+        registry instead of creating their own, so any number of clients in
+        one process share a connection pool and a single OWL instance.
+        
+        Args:
+            resources: Registry to borrow from (default: the process-wide registry)
+            retry_policy: Retry policy of the client's requests (default: the registry's)
+            max_connections: Maximum number of concurrent requests of this client
+            timeout: Timeout in seconds for a single request
+            headers: Headers sent with every request of this client
+        """
         self.logger = logging.getLogger(self.__class__.__name__)
         self.logger.setLevel(logging.DEBUG)
         self.owl = None
+        self.resources = resources or get_resource_registry()
+        self.retry_policy = retry_policy or self.resources.retry_policy
+        self.max_connections = max_connections
+        self.timeout = aiohttp.ClientTimeout(total=timeout) if timeout else None
+        self.headers = dict(headers or {})
+        self._session_loops = set()
+        self._semaphores: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
     
     async def initialize(self) -> None:
         """Initialize the client and any necessary resources."""
-        self.owl = OWL()
-        await self.owl.initialize()
+        if self.owl is None:
+            self.owl = await self.resources.acquire_owl()
     
     async def cleanup(self) -> None:
         """Clean up any resources used by the client."""
         if self.owl:
-            await self.owl.cleanup()
+            self.owl = None
+            await self.resources.release_owl()
+        loops, self._session_loops = self._session_loops, set()
+        self._semaphores.clear()
+        for loop in loops:
+            await self.resources.release_session(loop)
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session of the running loop, borrowing it on first use."""
+        loop = asyncio.get_running_loop()
+        if loop not in self._session_loops:
+            self._session_loops.add(loop)
+            return self.resources.acquire_session()
+        return self.resources.session()
+    
+    async def _fetch(self, url: str, params: Optional[Dict] = None,
+                     headers: Optional[Dict[str, str]] = None) -> Tuple[bytes, aiohttp.ClientResponse]:
+        """
+        GET a URL with the shared session, applying the client's retry policy
+        and the registry's rate limit for the host.
+        
+        Args:
+            url: The URL to fetch
+            params: Query parameters
+            headers: Headers added to the client's headers
+            
+        Returns:
+            The response body and the response
+        """
+        session = self._get_session()
+        limiter = self.resources.rate_limiter(url)
+        slot = contextlib.nullcontext()
+        if self.max_connections:
+            slot = self._semaphores.setdefault(asyncio.get_running_loop(), asyncio.Semaphore(self.max_connections))
+        headers = {**self.headers, **(headers or {})}
+        policy = self.retry_policy
+        for attempt in range(1, policy.attempts + 1):
+            if limiter is not None:
+                await limiter.acquire()
+            try:
+                async with slot:
+                    async with session.get(url, params=params, headers=headers, timeout=self.timeout) as response:
+                        if response.status not in policy.retry_statuses or attempt == policy.attempts:
+                            response.raise_for_status()
+                            return await response.read(), response
+                        delay = policy.delay(attempt, response.headers.get("Retry-After"))
+                        self.logger.warning(f"{url} returned {response.status}, retrying in {delay:.1f}s")
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt == policy.attempts:
+                    raise
+                delay = policy.delay(attempt)
+                self.logger.warning(f"Request to {url} failed, retrying in {delay:.1f}s: {str(e)}")
+            await asyncio.sleep(delay)
+    
+    async def _fetch_json(self, url: str, params: Optional[Dict] = None,
+                          headers: Optional[Dict[str, str]] = None) -> Any:
+        """GET a URL like _fetch and decode its JSON body."""
+        body, _ = await self._fetch(url, params=params, headers=headers)
+        return json.loads(body)
     
     def _handle_error(self, error: Exception, context: str = "") -> Dict[str, Any]:
         """Handle errors in a consistent way across all clients."""
@@ -37,4 +121,4 @@ class BaseClient(ABC):
             isinstance(response, dict) and
             'status' in response and
             response['status'] in ['success', 'error']
-        ) 
\ No newline at end of file
+        ) 
@@ -0,0 +1,242 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import aiohttp
+from owl import OWL
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Retry schedule for HTTP requests.
+
+    Connection errors, timeouts and the statuses in ``retry_statuses`` are
+    retried with exponential backoff; a Retry-After header from the server
+    takes precedence over the computed delay.
+
+    Args:
+        attempts: Total number of attempts, including the first
+        backoff: Delay in seconds before the first retry
+        max_backoff: Longest delay between attempts
+        jitter: Relative random spread applied to every delay (0.1 = +/-10%)
+        retry_statuses: HTTP statuses worth retrying
+    """
+
+    attempts: int = 3
+    backoff: float = 0.5
+    max_backoff: float = 8.0
+    jitter: float = 0.1
+    retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Seconds to wait after failed attempt number ``attempt`` (1-based)."""
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_backoff)
+            except ValueError:
+                try:
+                    seconds = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+                    return min(max(seconds, 0.0), self.max_backoff)
+                except (TypeError, ValueError):
+                    pass
+        delay = min(self.backoff * (2 ** (attempt - 1)), self.max_backoff)
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+class RateLimiter:
+    """Token bucket usable from any event loop or thread.
+
+    Each caller reserves its token under a thread lock and then sleeps until
+    the token is due, so no asyncio primitive is bound to one loop and the
+    limit holds across every loop of the process.
+
+    Args:
+        rate: Tokens added per second
+        burst: Maximum burst size (default: rate, at least 1)
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take tokens, possibly ahead of time, and return the seconds until they are due."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return max(-self._tokens / self.rate, 0.0)
+
+    async def acquire(self, tokens: float = 1.0):
+        """Wait until tokens are available and take them."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class ResourceRegistry:
+    """Reference-counted resources shared by the tool clients of a process.
+
+    Clients borrow one aiohttp session per event loop and one OWL runtime;
+    each is created for the first borrower and closed when the last one
+    returns it. The registry also holds the default retry policy and the
+    per-host rate limits every client's requests go through.
+
+    Args:
+        max_connections: Connection limit of each shared session
+        max_connections_per_host: Per-host connection limit of each shared session
+        timeout: Default timeout in seconds of a request; clients may set their own
+        retry_policy: Default retry policy of the clients
+    """
+
+    def __init__(self, max_connections: int = 100, max_connections_per_host: int = 20,
+                 timeout: float = 30.0, retry_policy: Optional[RetryPolicy] = None):
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self._sessions: Dict[asyncio.AbstractEventLoop, List[Any]] = {}
+        self._rate_limits: Dict[str, RateLimiter] = {}
+        self._owl: Optional[OWL] = None
+        self._owl_users = 0
+        # asyncio locks belong to one loop, so initialization is serialized per loop
+        self._owl_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def acquire_session(self) -> aiohttp.ClientSession:
+        """Borrow the session of the running event loop; return it with release_session."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entry = self._sessions.setdefault(loop, [None, 0])
+            entry[1] += 1
+        return self.session()
+
+    def session(self) -> aiohttp.ClientSession:
+        """The running loop's session; it must have been borrowed with acquire_session."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entry = self._sessions[loop]
+            if entry[0] is None or entry[0].closed:
+                entry[0] = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(
+                        limit=self.max_connections,
+                        limit_per_host=self.max_connections_per_host,
+                        keepalive_timeout=30
+                    ),
+                    timeout=self.timeout
+                )
+            return entry[0]
+
+    async def release_session(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Return a session borrowed on ``loop``, closing it if nobody else uses it."""
+        with self._lock:
+            entry = self._sessions.get(loop)
+            if entry is None:
+                return
+            entry[1] -= 1
+            if entry[1] > 0:
+                return
+            del self._sessions[loop]
+        session = entry[0]
+        if session is None or session.closed:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if loop is running:
+            await session.close()
+        elif loop.is_running():
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+        # A session of a closed loop has nothing left to close
+
+    async def acquire_owl(self) -> OWL:
+        """Borrow the shared OWL runtime, initializing it on first use."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            owl_lock = self._owl_locks.setdefault(loop, asyncio.Lock())
+        async with owl_lock:
+            with self._lock:
+                if self._owl is not None:
+                    self._owl_users += 1
+                    return self._owl
+            owl = OWL()
+            await owl.initialize()
+            with self._lock:
+                # Another loop may have initialized one meanwhile; keep the first
+                duplicate, self._owl = (owl, self._owl) if self._owl is not None else (None, owl)
+                self._owl_users += 1
+                shared = self._owl
+            if duplicate is not None:
+                await duplicate.cleanup()
+            return shared
+
+    async def release_owl(self) -> None:
+        """Return the OWL runtime, cleaning it up if nobody else uses it."""
+        with self._lock:
+            if self._owl_users == 0:
+                return
+            self._owl_users -= 1
+            if self._owl_users or self._owl is None:
+                return
+            owl, self._owl = self._owl, None
+        await owl.cleanup()
+
+    def set_rate_limit(self, host: str, rate: float, burst: Optional[float] = None) -> None:
+        """
+        Limit the requests of all clients to a host.
+
+        The first limit set for a host is kept, so every client sharing the
+        registry draws from the same bucket.
+
+        Args:
+            host: Host name, e.g. nominatim.openstreetmap.org
+            rate: Requests per second
+            burst: Maximum burst size (default: rate, at least 1)
+        """
+        with self._lock:
+            if host not in self._rate_limits:
+                self._rate_limits[host] = RateLimiter(rate, burst)
+
+    def rate_limiter(self, url: str) -> Optional[RateLimiter]:
+        """The rate limiter of a URL's host, or None if it is not limited."""
+        return self._rate_limits.get(urlparse(url).hostname or "")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of shared sessions and their borrowers."""
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "session_users": sum(entry[1] for entry in self._sessions.values()),
+                "owl_users": self._owl_users,
+                "rate_limited_hosts": sorted(self._rate_limits),
+            }
+
+
+_default_registry: Optional[ResourceRegistry] = None
+
+
+def get_resource_registry() -> ResourceRegistry:
+    """Return the process-wide resource registry shared by the tool clients."""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = ResourceRegistry()
+    return _default_registry
@@ -1,23 +1,76 @@
 import asyncio
 import logging
 import re
-import requests
+import aiohttp
 from bs4 import BeautifulSoup
-from typing import Dict, List, Optional, Any
+from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional, Any, Tuple
 from urllib.parse import quote, urlparse
-import feedparser
-from datetime import datetime, timedelta
 from tools.common.base_client import BaseClient
+from owl.news import ArticleStoreCache, FeedCache, FeedPoller, dedupe_articles, get_feed_cache, google_news_url
+from owl.text import html_to_text
+from tools.news.news_topics import POLL_INTERVAL, get_news_topics
+
+# Number of queries whose discovered topics are remembered
+MAX_REMEMBERED_QUERIES = 256
+
+
+def _parse_search_results(html: str, limit: int) -> List[Dict[str, str]]:
+    """Parse Google search result entries from a results page."""
+    soup = BeautifulSoup(html, 'html.parser')
+    results = []
+    for result in soup.select('div.g')[:limit]:
+        title_elem = result.select_one('h3')
+        link_elem = result.select_one('a')
+        snippet_elem = result.select_one('div.VwiC3b')
+        
+        if title_elem and link_elem:
+            results.append({
+                'title': title_elem.get_text(),
+                'link': link_elem.get('href'),
+                'snippet': snippet_elem.get_text() if snippet_elem else ""
+            })
+    return results
+
 
 class NewsClient(BaseClient):
     """Client for fetching and processing news articles using OWL's search capabilities."""
     
-    def __init__(self):
-        """Initialize the news client."""
-        super().__init__()
+    def __init__(self, max_connections: int = 20, timeout: float = 10.0,
+                 parse_executor: Optional[Executor] = None, feed_cache: Optional[FeedCache] = None):
+        """
+        Initialize the news client.
+        
+        Requests go through the session shared by all clients, and HTML and
+        feed parsing runs in an executor so concurrent queries do not block
+        each other.
+        
+        Args:
+            max_connections: Maximum number of concurrent requests
+            timeout: Timeout in seconds for a single request
+            parse_executor: Executor for parsing (default: a thread pool owned
+                by the client); a ProcessPoolExecutor also works
+            feed_cache: Feed cache for topic feeds (default: the process-wide cache)
+        """
+        super().__init__(
+            max_connections=max_connections,
+            timeout=timeout,
+            headers={'User-Agent': 'Mozilla/5.0 (compatible; OWL NewsClient)'}
+        )
         self.logger = logging.getLogger(__name__)
         self.search_toolkit = None
         self.browser_toolkit = None
+        self.article_stores = ArticleStoreCache()
+        self.feed_cache = feed_cache or get_feed_cache()
+        self.poller: Optional[FeedPoller] = None
+        # Topics discovered per query; reused while their feeds stay fresh
+        self.query_topics: "OrderedDict[str, List[str]]" = OrderedDict()
+        self.owns_executor = parse_executor is None
+        self.parse_executor = parse_executor or ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="news-parse"
+        )
     
     async def initialize(self) -> None:
         """Initialize the news client with required toolkits."""
@@ -25,10 +78,50 @@ class NewsClient(BaseClient):
         self.search_toolkit = self.owl.get_toolkit("SearchToolkit")
         self.browser_toolkit = self.owl.get_toolkit("BrowserToolkit")
     
+    async def _parse(self, func, *args):
+        """Run a parsing function in the parse executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.parse_executor, partial(func, *args))
+    
+    async def start_polling(self, topics: Optional[List[str]] = None,
+                            interval: Optional[float] = POLL_INTERVAL) -> FeedPoller:
+        """
+        Keep the feeds of trending topics warm in the background.
+        
+        Args:
+            topics: Topics to poll (default: the topics in news_topics.py)
+            interval: Seconds between refreshes of a topic
+            
+        Returns:
+            The running poller
+        """
+        if self.poller is None:
+            self.poller = FeedPoller(
+                topics if topics is not None else get_news_topics(),
+                feed_cache=self.feed_cache,
+                interval=interval,
+                session=self._get_session(),
+                executor=self.parse_executor
+            )
+            await self.poller.start()
+        return self.poller
+    
+    async def stop_polling(self) -> None:
+        """Stop the background poller."""
+        if self.poller is not None:
+            await self.poller.stop()
+            self.poller = None
+    
     async def cleanup(self) -> None:
-        """Clean up the client session."""
-        if self.session:
-            self.session.close()
+        """Stop polling and return the client's shared resources."""
+        await self.stop_polling()
+        if self.owns_executor:
+            self.parse_executor.shutdown(wait=False)
+        await super().cleanup()
+    
+    async def _get(self, url: str) -> Tuple[bytes, aiohttp.ClientResponse]:
+        """Fetch a URL with the shared session and return its body and response."""
+        return await self._fetch(url)
     
     async def fetch_url(self, url: str) -> Dict[str, Any]:
         """
@@ -42,30 +135,18 @@ class NewsClient(BaseClient):
         """
         self.logger.debug(f"Fetching URL: {url}")
         try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
+            body, response = await self._get(url)
+            html = body.decode(response.charset or 'utf-8', errors='replace')
             
-            # Extract text content using BeautifulSoup
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.extract()
-            
-            # Get text content
-            text = soup.get_text(separator=' ', strip=True)
-            
-            # Clean up text (remove extra whitespace)
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
+            # Extract the text content, without navigation and other boilerplate
+            text = await self._parse(html_to_text, html, True, ' ')
             
             return {
                 'url': url,
                 'content': text,
                 'status': 'success',
                 'content_type': response.headers.get('content-type', 'text/html'),
-                'status_code': response.status_code
+                'status_code': response.status
             }
         except Exception as e:
             return self._handle_error(e, f"Error fetching URL {url}")
@@ -85,46 +166,22 @@ class NewsClient(BaseClient):
         try:
             # For now, we'll use a simple Google search URL
             search_url = f"https://www.google.com/search?q={quote(query)}"
-            response = await self.fetch_url(search_url)
+            body, response = await self._get(search_url)
+            html = body.decode(response.charset or 'utf-8', errors='replace')
             
-            if response['status'] == 'success':
-                # Extract search results (this is a simplified version)
-                soup = BeautifulSoup(response['content'], 'html.parser')
-                results = []
-                
-                # Find search result elements (this is a simplified approach)
-                for result in soup.select('div.g')[:limit]:
-                    title_elem = result.select_one('h3')
-                    link_elem = result.select_one('a')
-                    snippet_elem = result.select_one('div.VwiC3b')
-                    
-                    if title_elem and link_elem:
-                        title = title_elem.get_text()
-                        link = link_elem.get('href')
-                        snippet = snippet_elem.get_text() if snippet_elem else ""
-                        
-                        results.append({
-                            'title': title,
-                            'link': link,
-                            'snippet': snippet
-                        })
-                
-                return {
-                    'query': query,
-                    'results': results,
-                    'total_results': len(results),
-                    'status': 'success'
-                }
-            else:
-                return {
-                    'query': query,
-                    'results': [],
-                    'total_results': 0,
-                    'status': 'error',
-                    'error': response.get('error', 'Unknown error')
-                }
+            # Extract search results from the page markup (this is a simplified version)
+            results = await self._parse(_parse_search_results, html, limit)
+            
+            return {
+                'query': query,
+                'results': results,
+                'total_results': len(results),
+                'status': 'success'
+            }
         except Exception as e:
-            return self._handle_error(e, "Error searching web")
+            error = self._handle_error(e, "Error searching web")
+            error.update({'query': query, 'results': [], 'total_results': 0})
+            return error
     
     async def extract_content(self, url: str) -> Dict[str, Any]:
         """
@@ -202,24 +259,22 @@ class NewsClient(BaseClient):
                 num_results=limit
             )
             
-            # Extract and analyze topics from search results
-            topics = []
-            for result in search_results.get('results', []):
-                # Extract topic from title and snippet
-                title = result.get('title', '')
-                snippet = result.get('snippet', '')
-                
-                # Use OWL to analyze and extract key topics
-                analysis = await self.owl.analyze_text(
-                    text=f"{title}\n{snippet}",
+            # Use OWL to extract key topics from every title and snippet concurrently
+            analyses = await asyncio.gather(*(
+                self.owl.analyze_text(
+                    text=f"{result.get('title', '')}\n{result.get('snippet', '')}",
                     task="extract_key_topics"
                 )
-                
+                for result in search_results.get('results', [])
+            ))
+            
+            topics = []
+            for analysis in analyses:
                 if analysis and 'topics' in analysis:
                     topics.extend(analysis['topics'])
             
-            # Remove duplicates and limit results
-            unique_topics = list(set(topics))[:limit]
+            # Remove duplicates (keeping the first occurrence) and limit results
+            unique_topics = list(dict.fromkeys(topics))[:limit]
             
             return {
                 'topics': unique_topics,
@@ -235,10 +290,47 @@ class NewsClient(BaseClient):
                 'error': str(e)
             }
     
+    def cached_topics(self, query: str, limit: int = 3) -> List[str]:
+        """
+        Find topics for a query whose feeds are fresh in the feed cache.
+        
+        Topics discovered earlier for the same query are reused while all of
+        their feeds are fresh; otherwise polled topics named in the query are
+        used, since the poller keeps their feeds warm.
+        
+        Args:
+            query: User's search query
+            limit: Maximum number of topics to return
+            
+        Returns:
+            The topics, or an empty list on a miss
+        """
+        key = " ".join(query.lower().split())
+        remembered = self.query_topics.get(key)
+        if remembered and all(self.feed_cache.is_fresh(google_news_url(topic)) for topic in remembered):
+            self.query_topics.move_to_end(key)
+            return remembered[:limit]
+        polled = self.poller.topics if self.poller is not None else []
+        return [
+            topic for topic in polled
+            if re.search(rf"\b{re.escape(topic.lower())}\b", key)
+            and self.feed_cache.is_fresh(google_news_url(topic))
+        ][:limit]
+    
+    def _remember_topics(self, query: str, topics: List[str]) -> None:
+        key = " ".join(query.lower().split())
+        self.query_topics[key] = topics
+        self.query_topics.move_to_end(key)
+        while len(self.query_topics) > MAX_REMEMBERED_QUERIES:
+            self.query_topics.popitem(last=False)
+    
     async def fetch_news(self, query: str, limit: int = 20) -> Dict[str, Any]:
         """
         Fetch news articles based on user query.
         
+        Topics with fresh feeds in the cache are served without discovery;
+        the web search and OWL topic extraction only run on a miss.
+        
         Args:
             query: User's search query
             limit: Maximum number of articles to return
@@ -247,34 +339,37 @@ class NewsClient(BaseClient):
             Dictionary containing articles and metadata
         """
         try:
-            # First discover relevant topics
-            topics = await self.discover_topics(query, limit=3)
+            topic_list = self.cached_topics(query, limit=3)
+            topics_cached = bool(topic_list)
+            if not topics_cached:
+                topics = await self.discover_topics(query, limit=3)
+                topic_list = topics.get('topics', [])
+                if topic_list:
+                    self._remember_topics(query, topic_list)
+            
+            # Fetch the feeds of all topics concurrently
+            per_topic = limit // len(topic_list) if topic_list else 0
+            feeds = await asyncio.gather(
+                *(self._fetch_topic_feed(topic, per_topic) for topic in topic_list),
+                return_exceptions=True
+            )
             
-            # Use discovered topics to fetch news
             articles = []
-            for topic in topics.get('topics', []):
-                # Construct Google News RSS URL
-                encoded_topic = quote(topic)
-                url = f"https://news.google.com/rss/search?q={encoded_topic}&hl=en-US&gl=US&ceid=US:en"
-                
-                # Fetch and parse RSS feed
-                feed = feedparser.parse(url)
-                
-                for entry in feed.entries[:limit//len(topics.get('topics', [topic]))]:
-                    article = {
-                        'title': entry.title,
-                        'link': entry.link,
-                        'published': entry.get('published', ''),
-                        'source': entry.get('source', {}).get('title', ''),
-                        'summary': entry.get('summary', ''),
-                        'topic': topic
-                    }
-                    articles.append(article)
+            for topic, feed_articles in zip(topic_list, feeds):
+                if isinstance(feed_articles, Exception):
+                    self.logger.warning(f"Error fetching news feed for {topic}: {str(feed_articles)}")
+                    continue
+                articles.extend(feed_articles)
+            
+            # Topic feeds overlap and syndicate the same stories; keep one article per story
+            stories = await self._parse(dedupe_articles, articles)
             
             return {
-                'articles': articles[:limit],
-                'total_found': len(articles),
-                'topics': topics.get('topics', []),
+                'articles': stories[:limit],
+                'total_found': len(stories),
+                'duplicates_removed': len(articles) - len(stories),
+                'topics': topic_list,
+                'topics_cached': topics_cached,
                 'query': query
             }
             
@@ -286,12 +381,44 @@ class NewsClient(BaseClient):
                 'query': query
             }
     
+    async def _fetch_topic_feed(self, topic: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Get the Google News RSS feed entries for a topic.
+        
+        Feeds fetched recently are served from the feed cache; stale ones are
+        revalidated with a conditional request.
+        
+        Args:
+            topic: The topic to search for
+            limit: Maximum number of articles to return
+            
+        Returns:
+            The feed's articles
+        """
+        entries = await self.feed_cache.aget(
+            google_news_url(topic), self._get_session(), self.parse_executor
+        )
+        return [
+            {
+                'title': entry['title'],
+                'link': entry['link'],
+                'published': entry['published'],
+                'source': entry['source'],
+                'summary': entry['summary'],
+                'topic': topic
+            }
+            for entry in entries[:limit]
+        ]
+    
     async def filter_news(self, articles: List[Dict], keyword: Optional[str] = None,
                          source: Optional[str] = None, date_from: Optional[str] = None,
                          date_to: Optional[str] = None, limit: int = 10) -> Dict[str, Any]:
         """
         Filter news articles based on various criteria.
         
+        Articles are normalized and indexed once per distinct article list;
+        articles without a parseable publication date fail date filters.
+        
         Args:
             articles: List of articles to filter
             keyword: Keyword to filter by
@@ -304,22 +431,9 @@ class NewsClient(BaseClient):
             Dictionary containing filtered articles and metadata
         """
         try:
-            filtered = articles.copy()
-            
-            if keyword:
-                filtered = [a for a in filtered if keyword.lower() in a['title'].lower() or 
-                          keyword.lower() in a['summary'].lower()]
-            
-            if source:
-                filtered = [a for a in filtered if source.lower() in a['source'].lower()]
-            
-            if date_from:
-                date_from = datetime.strptime(date_from, '%Y-%m-%d')
-                filtered = [a for a in filtered if datetime.strptime(a['published'], '%a, %d %b %Y %H:%M:%S %z') >= date_from]
-            
-            if date_to:
-                date_to = datetime.strptime(date_to, '%Y-%m-%d')
-                filtered = [a for a in filtered if datetime.strptime(a['published'], '%a, %d %b %Y %H:%M:%S %z') <= date_to]
+            # Repeated filtering of the same article list reuses its index
+            store = self.article_stores.get(articles)
+            filtered = store.filter(keyword=keyword, source=source, start=date_from, end=date_to)
             
             return {
                 'articles': filtered[:limit],
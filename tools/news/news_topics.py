@@ -1 +1,39 @@
- 
\ No newline at end of file
+"""Topics kept warm by the background news poller."""
+
+import os
+from typing import List
+
+# Trending topics users ask about most often
+NEWS_TOPICS = [
+    "world news",
+    "business",
+    "technology",
+    "artificial intelligence",
+    "science",
+    "health",
+    "politics",
+    "climate",
+    "sports",
+    "entertainment",
+    "stock market",
+    "cryptocurrency",
+]
+
+# Seconds between refreshes of a topic; None follows the feed cache freshness window
+POLL_INTERVAL = None
+
+
+def get_news_topics() -> List[str]:
+    """
+    Get the topics to poll.
+    
+    The NEWS_TOPICS environment variable (comma separated) overrides the
+    defaults.
+    
+    Returns:
+        List of topics
+    """
+    override = os.getenv("NEWS_TOPICS")
+    if override:
+        return [topic.strip() for topic in override.split(",") if topic.strip()]
+    return list(NEWS_TOPICS)
@@ -0,0 +1,40 @@
+from owl.news import dedupe_articles
+
+# Different stories whose headlines share most of their words
+NEAR_MISSES = [
+    ("Fed holds interest rates steady", "Fed cuts interest rates"),
+    ("Tesla stock rises after earnings beat", "Tesla stock falls after earnings miss"),
+    ("Fed raises interest rates again", "Fed cuts interest rates again"),
+    ("Apple shares climb on strong iPhone sales", "Apple shares slide on weak iPhone sales"),
+    ("Oil prices jump as OPEC cuts output", "Oil prices drop as OPEC boosts output"),
+]
+
+# Copies of one story from different publishers
+DUPLICATES = [
+    ("Tesla stock soars after record quarterly deliveries - Reuters",
+     "Tesla stock soars after record quarterly deliveries - Yahoo Finance"),
+    ("Fed holds interest rates steady, signals cuts later this year - CNBC",
+     "Federal Reserve holds interest rates steady, signals cuts later this year - AP"),
+    ("Microsoft to acquire gaming studio in $2 billion deal, sources say - Bloomberg",
+     "Microsoft to acquire gaming studio in $2 billion deal - The Verge"),
+]
+
+
+def _collapsed(first: str, second: str) -> bool:
+    return len(dedupe_articles([{"title": first}, {"title": second}])) == 1
+
+
+def test_near_misses_stay_apart():
+    for first, second in NEAR_MISSES:
+        assert not _collapsed(first, second), f"merged different stories: {first!r} / {second!r}"
+
+
+def test_duplicates_collapse():
+    for first, second in DUPLICATES:
+        assert _collapsed(first, second), f"kept duplicate stories apart: {first!r} / {second!r}"
+
+
+if __name__ == "__main__":
+    test_near_misses_stay_apart()
+    test_duplicates_collapse()
+    print("Dedupe checks passed")
@@ -0,0 +1,215 @@
+import logging
+import os
+import re
+import tempfile
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "owl", "stock_history")
+
+# Trading days per year, for annualized volatility
+TRADING_DAYS = 252
+
+PRICE_COLUMNS = ("open", "high", "low", "close")
+
+
+def to_epoch_days(dates: Iterable[str]) -> np.ndarray:
+    """Convert ISO dates (YYYY-MM-DD...) to int64 days since 1970-01-01."""
+    return np.array([str(date)[:10] for date in dates], dtype="datetime64[D]").astype(np.int64)
+
+
+def from_epoch_days(days: np.ndarray) -> List[str]:
+    """Convert int64 days since 1970-01-01 to ISO dates."""
+    return np.asarray(days, dtype=np.int64).astype("datetime64[D]").astype(str).tolist()
+
+
+class PriceHistory:
+    """Daily OHLCV series stored as NumPy columns, sorted by date.
+
+    Args:
+        dates: Days since 1970-01-01 (int64)
+        open, high, low, close: Prices (float64)
+        volume: Volumes (int64)
+    """
+
+    def __init__(self, dates: np.ndarray, open: np.ndarray, high: np.ndarray, low: np.ndarray,
+                 close: np.ndarray, volume: np.ndarray):
+        self.dates = np.asarray(dates, dtype=np.int64)
+        self.open = np.asarray(open, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.low = np.asarray(low, dtype=np.float64)
+        self.close = np.asarray(close, dtype=np.float64)
+        self.volume = np.asarray(volume, dtype=np.int64)
+
+    @classmethod
+    def empty(cls) -> "PriceHistory":
+        return cls(*(np.empty(0) for _ in range(6)))
+
+    @classmethod
+    def from_records(cls, records: List[Dict]) -> "PriceHistory":
+        """Build a series from API records with date, open, high, low, close and volume."""
+        if not records:
+            return cls.empty()
+        history = cls(
+            to_epoch_days(record["date"] for record in records),
+            *(np.fromiter((record[column] for record in records), dtype=np.float64, count=len(records))
+              for column in PRICE_COLUMNS),
+            np.fromiter((record["volume"] or 0 for record in records), dtype=np.int64, count=len(records)),
+        )
+        return history._sorted()
+
+    def _columns(self) -> Tuple[np.ndarray, ...]:
+        return self.dates, self.open, self.high, self.low, self.close, self.volume
+
+    def _take(self, index) -> "PriceHistory":
+        return PriceHistory(*(column[index] for column in self._columns()))
+
+    def _sorted(self) -> "PriceHistory":
+        # Keep the last row of each date, so newer data replaces older
+        order = np.argsort(self.dates, kind="stable")
+        dates = self.dates[order]
+        last = np.append(dates[1:] != dates[:-1], True)
+        return self._take(order[last])
+
+    def merge(self, other: "PriceHistory") -> "PriceHistory":
+        """Combine two series; rows of ``other`` win on equal dates."""
+        if not len(other):
+            return self
+        if not len(self):
+            return other
+        merged = PriceHistory(*(np.concatenate(pair) for pair in zip(self._columns(), other._columns())))
+        return merged._sorted()
+
+    def between(self, start: int, end: int) -> "PriceHistory":
+        """Rows from ``start`` to ``end`` (epoch days, inclusive)."""
+        lo, hi = np.searchsorted(self.dates, [start, end + 1])
+        return self._take(slice(lo, hi))
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def to_records(self) -> List[Dict]:
+        """The series as a list of per-day dicts, as returned by the API."""
+        return [
+            {"date": date, "open": open_, "high": high, "low": low, "close": close, "volume": volume}
+            for date, open_, high, low, close, volume in zip(
+                from_epoch_days(self.dates), self.open.tolist(), self.high.tolist(),
+                self.low.tolist(), self.close.tolist(), self.volume.tolist()
+            )
+        ]
+
+    def returns(self, log: bool = False) -> np.ndarray:
+        """Day-over-day returns of the close (one shorter than the series)."""
+        if log:
+            return np.diff(np.log(self.close))
+        return self.close[1:] / self.close[:-1] - 1
+
+    def moving_average(self, window: int) -> np.ndarray:
+        """Simple moving average of the close; element i ends at row ``i + window - 1``."""
+        if len(self) < window:
+            return np.empty(0)
+        return sliding_window_view(self.close, window).mean(axis=1)
+
+    def volatility(self, window: Optional[int] = None, annualize: bool = True) -> np.ndarray:
+        """
+        Standard deviation of log returns.
+
+        Args:
+            window: Rolling window in days, or None for the whole series
+            annualize: Scale to a yearly figure with TRADING_DAYS
+
+        Returns:
+            The rolling volatility, or a single-element array without a window
+        """
+        returns = self.returns(log=True)
+        scale = np.sqrt(TRADING_DAYS) if annualize else 1.0
+        if window is None:
+            return np.array([returns.std(ddof=1) * scale]) if len(returns) > 1 else np.empty(0)
+        if len(returns) < window:
+            return np.empty(0)
+        return sliding_window_view(returns, window).std(axis=1, ddof=1) * scale
+
+    def max_drawdown(self) -> float:
+        """Largest drop of the close from a previous peak, as a negative fraction."""
+        if not len(self):
+            return 0.0
+        return float((self.close / np.maximum.accumulate(self.close) - 1).min())
+
+
+class HistoryCache:
+    """Local store of price histories and the date range each one covers.
+
+    Histories are kept in memory and, when ``path`` is set, saved as one
+    ``.npz`` file per symbol so later processes only need to fetch new days.
+
+    Args:
+        path: Directory for the files, or None for memory only
+            (default: ~/.cache/owl/stock_history)
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_HISTORY_CACHE):
+        self.path = path
+        self._entries: Dict[str, Tuple[PriceHistory, int, int]] = {}
+        self._lock = threading.Lock()
+
+    def _file(self, symbol: str) -> str:
+        return os.path.join(self.path, re.sub(r"[^A-Za-z0-9._-]", "_", symbol) + ".npz")
+
+    def get(self, symbol: str) -> Optional[Tuple[PriceHistory, int, int]]:
+        """
+        Look up a symbol.
+
+        Returns:
+            ``(history, covered_from, covered_to)`` in epoch days, or None
+        """
+        with self._lock:
+            entry = self._entries.get(symbol)
+        if entry is not None or not self.path:
+            return entry
+        try:
+            with np.load(self._file(symbol)) as data:
+                history = PriceHistory(*(data[name] for name in ("dates", *PRICE_COLUMNS, "volume")))
+                covered_from, covered_to = (int(day) for day in data["coverage"])
+        except FileNotFoundError:
+            return None
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable price history for {symbol}: {str(e)}")
+            return None
+        entry = (history, covered_from, covered_to)
+        with self._lock:
+            self._entries[symbol] = entry
+        return entry
+
+    def store(self, symbol: str, history: PriceHistory, covered_from: int, covered_to: int) -> None:
+        """Cache a history covering ``covered_from`` to ``covered_to`` (epoch days)."""
+        with self._lock:
+            self._entries[symbol] = (history, covered_from, covered_to)
+        if not self.path:
+            return
+        tmp = None
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, dates=history.dates, open=history.open, high=history.high, low=history.low,
+                         close=history.close, volume=history.volume,
+                         coverage=np.array([covered_from, covered_to], dtype=np.int64))
+            os.replace(tmp, self._file(symbol))
+        except Exception as e:
+            logger.warning(f"Price history write failed for {symbol}: {str(e)}")
+            if tmp is not None:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of cached symbols and rows."""
+        with self._lock:
+            entries = list(self._entries.values())
+        return {"symbols": len(entries), "rows": sum(len(history) for history, _, _ in entries)}
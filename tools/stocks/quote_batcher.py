@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Fetches quotes for several symbols; symbols missing from the result are unknown
+FetchQuotes = Callable[[List[str]], Awaitable[Dict[str, Dict]]]
+
+
+class QuoteBatcher:
+    """Coalesces quote lookups into batch requests and caches hot symbols.
+
+    Symbols requested within ``window`` seconds of each other, by one call or
+    by many concurrent ones, are fetched with a single upstream request (split
+    into requests of at most ``max_batch`` symbols). Quotes are then served
+    from memory for ``ttl`` seconds.
+
+    Args:
+        fetch: Coroutine function fetching quotes for a list of symbols
+        window: Seconds to wait for more symbols before sending a batch
+        max_batch: Maximum number of symbols per upstream request
+        ttl: Seconds a quote is served from the cache
+    """
+
+    def __init__(self, fetch: FetchQuotes, window: float = 0.01, max_batch: int = 100, ttl: float = 5.0):
+        self.fetch = fetch
+        self.window = window
+        self.max_batch = max_batch
+        self.ttl = ttl
+        self._cache: Dict[str, Tuple[Dict, float]] = {}
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # Referenced until done so running batches are not garbage collected
+        self._tasks: Set[asyncio.Task] = set()
+        self.hits = 0
+        self.misses = 0
+        self.batches = 0
+
+    def _cached(self, symbol: str) -> Optional[Dict]:
+        entry = self._cache.get(symbol)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            del self._cache[symbol]
+            return None
+        return entry[0]
+
+    def _enqueue(self, symbol: str) -> asyncio.Future:
+        future = self._pending.get(symbol) or self._inflight.get(symbol)
+        if future is not None:
+            return future
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending[symbol] = future
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window, self._flush)
+        return future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        self._inflight.update(pending)
+        symbols = list(pending)
+        for i in range(0, len(symbols), self.max_batch):
+            batch = {symbol: pending[symbol] for symbol in symbols[i:i + self.max_batch]}
+            task = asyncio.ensure_future(self._fetch_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _fetch_batch(self, batch: Dict[str, asyncio.Future]):
+        self.batches += 1
+        try:
+            quotes = await self.fetch(list(batch))
+        except Exception as e:
+            for symbol, future in batch.items():
+                self._inflight.pop(symbol, None)
+                if not future.done():
+                    future.set_exception(e)
+                    # Waiters still receive the error; marking it retrieved keeps
+                    # futures whose callers were all cancelled from logging it
+                    future.exception()
+            return
+        expires_at = time.monotonic() + self.ttl
+        for symbol, future in batch.items():
+            quote = quotes.get(symbol)
+            if quote is not None:
+                self._cache[symbol] = (quote, expires_at)
+            self._inflight.pop(symbol, None)
+            if not future.done():
+                future.set_result(quote)
+
+    async def get_many(self, symbols: Iterable[str]) -> Dict[str, Optional[Dict]]:
+        """
+        Get quotes for several symbols.
+
+        Args:
+            symbols: Normalized stock symbols
+
+        Returns:
+            Dict mapping each symbol to its quote, or None for unknown symbols
+
+        Raises:
+            Exception: The error of the upstream request if it failed
+        """
+        results: Dict[str, Optional[Dict]] = {}
+        waiting: Dict[str, asyncio.Future] = {}
+        for symbol in dict.fromkeys(symbols):
+            quote = self._cached(symbol)
+            if quote is not None:
+                self.hits += 1
+                results[symbol] = quote
+            else:
+                self.misses += 1
+                waiting[symbol] = self._enqueue(symbol)
+        if waiting:
+            # Shielded so one cancelled caller does not fail others waiting on the same symbol
+            quotes = await asyncio.gather(*(asyncio.shield(future) for future in waiting.values()))
+            results.update(zip(waiting, quotes))
+        return results
+
+    async def get(self, symbol: str) -> Optional[Dict]:
+        """Get the quote of one symbol, batched with concurrent lookups."""
+        return (await self.get_many([symbol]))[symbol]
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache size, hit counts and the number of upstream batches."""
+        return {"entries": len(self._cache), "hits": self.hits, "misses": self.misses, "batches": self.batches}
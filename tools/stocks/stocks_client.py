@@ -1,41 +1,82 @@
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List
-from datetime import datetime, timedelta
-import requests
+from typing import Dict, Any, Optional, List, Sequence
+from datetime import datetime
 from ..common.base_client import BaseClient
+from .price_history import HistoryCache, PriceHistory, from_epoch_days, to_epoch_days
+from .quote_batcher import QuoteBatcher
 
 class StocksClient(BaseClient):
     """Client for fetching stock market information."""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, max_connections: int = 20, timeout: float = 10.0,
+                 quote_ttl: float = 5.0, batch_window: float = 0.01, max_batch: int = 100,
+                 history_cache: Optional[HistoryCache] = None):
         """
         Initialize the stocks client.
         
         Args:
             api_key: Optional API key for stock market service
+            max_connections: Maximum number of concurrent requests
+            timeout: Timeout in seconds for a single request
+            quote_ttl: Seconds a quote is served from the cache
+            batch_window: Seconds to collect concurrent quote lookups into one request
+            max_batch: Maximum number of symbols per quote request
+            history_cache: Store of price histories (default: the persistent
+                store in ~/.cache/owl/stock_history)
         """
-        super().__init__()
+        super().__init__(
+            max_connections=max_connections,
+            timeout=timeout,
+            headers={'Authorization': f'Bearer {api_key}'} if api_key else None
+        )
         self.api_key = api_key
         self.base_url = "https://api.example.com/v1"  # Replace with actual API endpoint
-        self.session = None
+        self.quotes = QuoteBatcher(self._fetch_quotes, window=batch_window, max_batch=max_batch, ttl=quote_ttl)
+        self.history_cache = history_cache or HistoryCache()
+        self._history_locks: Dict[str, asyncio.Lock] = {}
     
     async def initialize(self) -> None:
-        """Initialize the client session."""
-        self.session = requests.Session()
-        if self.api_key:
-            self.session.headers.update({
-                'Authorization': f'Bearer {self.api_key}'
-            })
+        """Borrow the shared client session."""
+        self._get_session()
     
-    async def cleanup(self) -> None:
-        """Clean up the client session."""
-        if self.session:
-            self.session.close()
+    async def _make_request(self, path: str, params: Optional[Dict] = None) -> Any:
+        """
+        Make a GET request to the stock market API and return the JSON response.
+        
+        Args:
+            path: Path below the API base URL
+            params: Query parameters
+            
+        Returns:
+            The decoded JSON response
+        """
+        return await self._fetch_json(f"{self.base_url}{path}", params=params)
+    
+    async def _fetch_quotes(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Fetch quotes for several symbols with one request."""
+        self.logger.debug(f"Fetching quotes for {len(symbols)} symbols")
+        data = await self._make_request("/quotes", params={'symbols': ",".join(symbols)})
+        quotes = {}
+        for quote in data['quotes']:
+            symbol = quote['symbol'].upper()
+            quotes[symbol] = {
+                'symbol': symbol,
+                'price': quote['price'],
+                'change': quote['change'],
+                'change_percent': quote['change_percent'],
+                'volume': quote['volume'],
+                'last_updated': quote['timestamp']
+            }
+        return quotes
     
     async def get_stock_price(self, symbol: str) -> Dict[str, Any]:
         """
         Get current stock price for a symbol.
         
+        Concurrent calls are combined into one batch request, and quotes are
+        cached for a few seconds.
+        
         Args:
             symbol: Stock symbol (e.g., AAPL, GOOGL)
             
@@ -45,24 +86,91 @@ class StocksClient(BaseClient):
         self.logger.debug(f"Getting stock price for: {symbol}")
         
         try:
-            response = self.session.get(
-                f"{self.base_url}/quote",
-                params={'symbol': symbol}
-            )
-            response.raise_for_status()
+            quote = await self.quotes.get(symbol.strip().upper())
+            if quote is None:
+                raise ValueError(f"Unknown symbol {symbol}")
+            return {**quote, 'status': 'success'}
+        except Exception as e:
+            return self._handle_error(e, f"Error getting stock price for {symbol}")
+    
+    async def get_stock_prices(self, symbols: List[str]) -> Dict[str, Any]:
+        """
+        Get current stock prices for several symbols.
+        
+        Uncached symbols are fetched with as few batch requests as possible,
+        together with any concurrent single-symbol lookups.
+        
+        Args:
+            symbols: Stock symbols (e.g., ["AAPL", "GOOGL"])
             
-            data = response.json()
+        Returns:
+            Dict containing a quote per known symbol and the unknown symbols
+        """
+        self.logger.debug(f"Getting stock prices for: {', '.join(symbols)}")
+        
+        try:
+            quotes = await self.quotes.get_many(symbol.strip().upper() for symbol in symbols)
             return {
-                'symbol': symbol,
-                'price': data['price'],
-                'change': data['change'],
-                'change_percent': data['change_percent'],
-                'volume': data['volume'],
-                'last_updated': data['timestamp'],
+                'quotes': {symbol: quote for symbol, quote in quotes.items() if quote is not None},
+                'unknown': [symbol for symbol, quote in quotes.items() if quote is None],
                 'status': 'success'
             }
         except Exception as e:
-            return self._handle_error(e, f"Error getting stock price for {symbol}")
+            return self._handle_error(e, f"Error getting stock prices for {', '.join(symbols)}")
+    
+    async def _fetch_history(self, symbol: str, start: int, end: int) -> PriceHistory:
+        """Fetch daily prices from ``start`` to ``end`` (epoch days)."""
+        start_date, end_date = from_epoch_days([start, end])
+        data = await self._make_request(
+            "/history",
+            params={
+                'symbol': symbol,
+                'from': start_date,
+                'to': end_date
+            }
+        )
+        return PriceHistory.from_records(data['history'])
+    
+    async def get_price_history(self, symbol: str, days: int = 30) -> PriceHistory:
+        """
+        Get historical stock data for a symbol as NumPy columns.
+        
+        Histories are kept in the history cache; only the days it does not
+        cover yet are fetched, and the last cached day is fetched again in
+        case it was still trading.
+        
+        Args:
+            symbol: Stock symbol (e.g., AAPL, GOOGL)
+            days: Number of days of history to retrieve
+            
+        Returns:
+            The price history of the requested days
+        """
+        symbol = symbol.strip().upper()
+        end = int(to_epoch_days([datetime.now().strftime('%Y-%m-%d')])[0])
+        start = end - days
+        
+        # Cache reads and writes may touch disk, so they run in the default executor
+        loop = asyncio.get_running_loop()
+        async with self._history_locks.setdefault(symbol, asyncio.Lock()):
+            cached = await loop.run_in_executor(None, self.history_cache.get, symbol)
+            if cached is None:
+                history, covered_from, covered_to = PriceHistory.empty(), start, end
+                gaps = [(start, end)]
+            else:
+                history, covered_from, covered_to = cached
+                gaps = []
+                if start < covered_from:
+                    gaps.append((start, covered_from - 1))
+                if covered_to < end:
+                    gaps.append((covered_to, end))
+            if gaps:
+                self.logger.debug(f"Fetching {len(gaps)} missing range(s) of history for: {symbol}")
+                for part in await asyncio.gather(*(self._fetch_history(symbol, a, b) for a, b in gaps)):
+                    history = history.merge(part)
+                await loop.run_in_executor(None, self.history_cache.store, symbol, history,
+                                           min(start, covered_from), max(end, covered_to))
+        return history.between(start, end)
     
     async def get_stock_history(self, symbol: str, days: int = 30) -> Dict[str, Any]:
         """
@@ -78,40 +186,54 @@ class StocksClient(BaseClient):
         self.logger.debug(f"Getting {days} days of history for: {symbol}")
         
         try:
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days)
-            
-            response = self.session.get(
-                f"{self.base_url}/history",
-                params={
-                    'symbol': symbol,
-                    'from': start_date.strftime('%Y-%m-%d'),
-                    'to': end_date.strftime('%Y-%m-%d')
-                }
-            )
-            response.raise_for_status()
-            
-            data = response.json()
-            history = []
-            
-            for day in data['history']:
-                history.append({
-                    'date': day['date'],
-                    'open': day['open'],
-                    'high': day['high'],
-                    'low': day['low'],
-                    'close': day['close'],
-                    'volume': day['volume']
-                })
-            
+            history = await self.get_price_history(symbol, days)
             return {
                 'symbol': symbol,
-                'history': history,
+                'history': history.to_records(),
                 'status': 'success'
             }
         except Exception as e:
             return self._handle_error(e, f"Error getting history for {symbol}")
     
+    async def get_stock_indicators(self, symbol: str, days: int = 365,
+                                   windows: Sequence[int] = (20, 50, 200)) -> Dict[str, Any]:
+        """
+        Get technical indicators computed from a symbol's price history.
+        
+        Args:
+            symbol: Stock symbol (e.g., AAPL, GOOGL)
+            days: Number of days of history to use
+            windows: Moving average windows in trading days
+            
+        Returns:
+            Dict containing the latest close, total return, moving averages,
+            annualized volatility and maximum drawdown
+        """
+        self.logger.debug(f"Getting indicators over {days} days for: {symbol}")
+        
+        try:
+            history = await self.get_price_history(symbol, days)
+            if len(history) < 2:
+                raise ValueError(f"Not enough history for {symbol}")
+            moving_averages = {}
+            for window in windows:
+                average = history.moving_average(window)
+                moving_averages[window] = float(average[-1]) if len(average) else None
+            volatility = history.volatility()
+            return {
+                'symbol': symbol,
+                'from': from_epoch_days(history.dates[:1])[0],
+                'to': from_epoch_days(history.dates[-1:])[0],
+                'last_close': float(history.close[-1]),
+                'total_return': float(history.close[-1] / history.close[0] - 1),
+                'moving_averages': moving_averages,
+                'volatility': float(volatility[0]) if len(volatility) else None,
+                'max_drawdown': history.max_drawdown(),
+                'status': 'success'
+            }
+        except Exception as e:
+            return self._handle_error(e, f"Error getting indicators for {symbol}")
+    
     async def get_market_summary(self) -> Dict[str, Any]:
         """
         Get summary of market indices.
@@ -122,10 +244,7 @@ class StocksClient(BaseClient):
         self.logger.debug("Getting market summary")
         
         try:
-            response = self.session.get(f"{self.base_url}/market/summary")
-            response.raise_for_status()
-            
-            data = response.json()
+            data = await self._make_request("/market/summary")
             indices = []
             
             for index in data['indices']:
@@ -156,13 +275,10 @@ class StocksClient(BaseClient):
         self.logger.debug(f"Searching stocks for: {query}")
         
         try:
-            response = self.session.get(
-                f"{self.base_url}/search",
+            data = await self._make_request(
+                "/search",
                 params={'q': query}
             )
-            response.raise_for_status()
-            
-            data = response.json()
             results = []
             
             for stock in data['results']:
@@ -194,12 +310,7 @@ class StocksClient(BaseClient):
         self.logger.debug(f"Getting company info for: {symbol}")
         
         try:
-            response = self.session.get(
-                f"{self.base_url}/company/{symbol}"
-            )
-            response.raise_for_status()
-            
-            data = response.json()
+            data = await self._make_request(f"/company/{symbol}")
             return {
                 'symbol': symbol,
                 'name': data['name'],
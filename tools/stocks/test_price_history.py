@@ -0,0 +1,98 @@
+import os
+import tempfile
+
+import numpy as np
+
+from tools.stocks import price_history
+from tools.stocks.price_history import HistoryCache, PriceHistory, from_epoch_days, to_epoch_days
+
+
+def _record(date, close, volume=100):
+    return {"date": date, "open": close, "high": close + 1, "low": close - 1, "close": close, "volume": volume}
+
+
+RECORDS = [_record("2025-01-03", 12.0), _record("2025-01-01", 10.0), _record("2025-01-02", 8.0),
+           _record("2025-01-06", 14.0, None)]
+
+
+def test_epoch_day_round_trip():
+    days = to_epoch_days(["2025-01-01", "2025-01-02T16:00:00"])
+    assert days.tolist() == [20089, 20090]
+    assert from_epoch_days(days) == ["2025-01-01", "2025-01-02"]
+
+
+def test_records_are_sorted_and_round_trip():
+    history = PriceHistory.from_records(RECORDS)
+    assert from_epoch_days(history.dates) == ["2025-01-01", "2025-01-02", "2025-01-03", "2025-01-06"]
+    records = history.to_records()
+    assert records[0] == _record("2025-01-01", 10.0)
+    # Missing volumes become 0
+    assert records[-1]["volume"] == 0
+    assert len(PriceHistory.from_records([])) == 0
+
+
+def test_merge_prefers_newer_rows_and_between_is_inclusive():
+    history = PriceHistory.from_records(RECORDS)
+    update = PriceHistory.from_records([_record("2025-01-06", 15.0), _record("2025-01-07", 16.0)])
+    merged = history.merge(update)
+    assert merged.close.tolist() == [10.0, 8.0, 12.0, 15.0, 16.0]
+    assert history.merge(PriceHistory.empty()) is history
+    start, end = to_epoch_days(["2025-01-02", "2025-01-06"])
+    assert merged.between(start, end).close.tolist() == [8.0, 12.0, 15.0]
+    # Duplicate dates within one batch keep the last row
+    duplicated = PriceHistory.from_records([_record("2025-01-01", 1.0), _record("2025-01-01", 2.0)])
+    assert duplicated.close.tolist() == [2.0]
+
+
+def test_analytics():
+    history = PriceHistory.from_records(RECORDS)
+    assert np.allclose(history.returns(), [-0.2, 0.5, 14.0 / 12.0 - 1])
+    assert np.allclose(history.returns(log=True), np.log([0.8, 1.5, 14.0 / 12.0]))
+    assert np.allclose(history.moving_average(2), [9.0, 10.0, 13.0])
+    assert len(history.moving_average(5)) == 0
+    assert len(history.volatility(window=2)) == 2
+    assert np.isclose(history.volatility(annualize=False)[0], np.std(history.returns(log=True), ddof=1))
+    assert np.isclose(history.max_drawdown(), -0.2)
+    assert PriceHistory.empty().max_drawdown() == 0.0
+
+
+def test_cache_persists_histories_with_coverage():
+    with tempfile.TemporaryDirectory() as directory:
+        history = PriceHistory.from_records(RECORDS)
+        HistoryCache(directory).store("BRK.B", history, 20080, 20095)
+        cached, covered_from, covered_to = HistoryCache(directory).get("BRK.B")
+        assert (covered_from, covered_to) == (20080, 20095)
+        assert cached.to_records() == history.to_records()
+        assert HistoryCache(directory).get("AAPL") is None
+        memory = HistoryCache(None)
+        memory.store("AAPL", history, 0, 1)
+        assert memory.get("AAPL")[0] is history
+        assert memory.stats() == {"symbols": 1, "rows": 4}
+
+
+def test_failed_writes_leave_no_temporary_files():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = HistoryCache(directory)
+        savez = price_history.np.savez
+
+        def failing(*args, **kwargs):
+            raise OSError("disk full")
+
+        price_history.np.savez = failing
+        try:
+            cache.store("AAPL", PriceHistory.from_records(RECORDS), 0, 1)
+        finally:
+            price_history.np.savez = savez
+        assert os.listdir(directory) == []
+        # The history is still served from memory
+        assert cache.get("AAPL") is not None
+
+
+if __name__ == "__main__":
+    test_epoch_day_round_trip()
+    test_records_are_sorted_and_round_trip()
+    test_merge_prefers_newer_rows_and_between_is_inclusive()
+    test_analytics()
+    test_cache_persists_histories_with_coverage()
+    test_failed_writes_leave_no_temporary_files()
+    print("Price history checks passed")
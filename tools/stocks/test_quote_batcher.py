@@ -0,0 +1,123 @@
+import asyncio
+import gc
+import time
+
+from tools.stocks.quote_batcher import QuoteBatcher
+
+
+class FakeUpstream:
+    """Returns a quote for every known symbol and records each request."""
+
+    def __init__(self, known=("AAPL", "MSFT", "TSLA", "NVDA"), error=None, delay=0.01):
+        self.known = set(known)
+        self.error = error
+        self.delay = delay
+        self.requests = []
+
+    async def __call__(self, symbols):
+        self.requests.append(list(symbols))
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return {symbol: {"symbol": symbol, "price": 1.0} for symbol in symbols if symbol in self.known}
+
+
+def test_concurrent_lookups_share_one_batch():
+    async def main():
+        upstream = FakeUpstream()
+        batcher = QuoteBatcher(upstream)
+        results = await asyncio.gather(
+            batcher.get("AAPL"), batcher.get("MSFT"), batcher.get_many(["AAPL", "TSLA", "XXXX"]))
+        assert results[0]["symbol"] == "AAPL" and results[1]["symbol"] == "MSFT"
+        assert results[2]["TSLA"]["symbol"] == "TSLA" and results[2]["XXXX"] is None
+        assert len(upstream.requests) == 1
+        assert sorted(upstream.requests[0]) == ["AAPL", "MSFT", "TSLA", "XXXX"]
+
+    asyncio.run(main())
+
+
+def test_batches_are_split_at_max_batch():
+    async def main():
+        upstream = FakeUpstream(known=[f"S{i}" for i in range(7)])
+        batcher = QuoteBatcher(upstream, max_batch=3)
+        quotes = await batcher.get_many([f"S{i}" for i in range(7)])
+        assert all(quote is not None for quote in quotes.values())
+        assert sorted(len(request) for request in upstream.requests) == [1, 3, 3]
+        assert batcher.stats()["batches"] == 3
+
+    asyncio.run(main())
+
+
+def test_quotes_are_cached_until_ttl():
+    async def main():
+        upstream = FakeUpstream()
+        batcher = QuoteBatcher(upstream, ttl=60)
+        await batcher.get("AAPL")
+        await batcher.get("AAPL")
+        assert len(upstream.requests) == 1
+        assert (batcher.hits, batcher.misses) == (1, 1)
+        # Unknown symbols are not cached
+        await batcher.get("XXXX")
+        await batcher.get("XXXX")
+        assert len(upstream.requests) == 3
+        quote, _ = batcher._cache["AAPL"]
+        batcher._cache["AAPL"] = (quote, time.monotonic() - 1)
+        await batcher.get("AAPL")
+        assert len(upstream.requests) == 4
+
+    asyncio.run(main())
+
+
+def test_lookups_join_an_inflight_request():
+    async def main():
+        upstream = FakeUpstream(delay=0.05)
+        batcher = QuoteBatcher(upstream)
+        first = asyncio.ensure_future(batcher.get("AAPL"))
+        await asyncio.sleep(0.02)
+        assert batcher._inflight
+        assert (await batcher.get("AAPL"))["symbol"] == "AAPL"
+        await first
+        assert len(upstream.requests) == 1
+
+    asyncio.run(main())
+
+
+def test_errors_reach_every_waiter():
+    async def main():
+        upstream = FakeUpstream(error=RuntimeError("rate limited"))
+        batcher = QuoteBatcher(upstream)
+        results = await asyncio.gather(
+            batcher.get("AAPL"), batcher.get("MSFT"), batcher.get_many(["AAPL"]), return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert len(upstream.requests) == 1
+        assert not batcher._inflight and not batcher._tasks
+
+    asyncio.run(main())
+
+
+def test_cancelled_callers_do_not_leave_unretrieved_errors():
+    errors = []
+
+    async def main():
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+        batcher = QuoteBatcher(FakeUpstream(error=RuntimeError("rate limited"), delay=0.05))
+        caller = asyncio.ensure_future(batcher.get_many(["AAPL", "MSFT"]))
+        await asyncio.sleep(0.02)
+        caller.cancel()
+        await asyncio.sleep(0.1)
+        assert not batcher._tasks
+        del caller, batcher
+        gc.collect()
+
+    asyncio.run(main())
+    assert errors == []
+
+
+if __name__ == "__main__":
+    test_concurrent_lookups_share_one_batch()
+    test_batches_are_split_at_max_batch()
+    test_quotes_are_cached_until_ttl()
+    test_lookups_join_an_inflight_request()
+    test_errors_reach_every_waiter()
+    test_cancelled_callers_do_not_leave_unretrieved_errors()
+    print("Quote batcher checks passed")
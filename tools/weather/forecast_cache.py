@@ -0,0 +1,79 @@
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from owl.router.response_cache import ResponseCache, SQLiteCacheBackend
+
+DEFAULT_FORECAST_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "owl", "weather.sqlite3")
+
+# Two decimals is about 1 km, well below the resolution of the weather models
+COORDINATE_PRECISION = 2
+
+# How often the provider refreshes each section of a response, in seconds.
+# Entries expire at the next multiple of the period (UTC), when new data can appear.
+UPDATE_PERIODS = {
+    "current": 3600,
+    "hourly": 3600,
+    "daily": 3 * 3600,
+}
+DEFAULT_UPDATE_PERIOD = 3600
+
+
+class ForecastCache:
+    """Cache of weather response sections, bucketed by provider update time.
+
+    Each section of a response ("current", "daily", ...) is cached on its own,
+    keyed by endpoint, rounded coordinates, the requested variables and the
+    update bucket it was fetched in, so a combined request also serves later
+    single-section requests. Entries expire at the end of their bucket.
+
+    Args:
+        max_entries: Maximum number of in-memory entries
+        path: Optional SQLite file shared by processes and kept across restarts,
+            e.g. DEFAULT_FORECAST_CACHE (default: memory only)
+        update_periods: Update period in seconds per section name
+    """
+
+    def __init__(self, max_entries: int = 1024, path: Optional[str] = None,
+                 update_periods: Optional[Dict[str, int]] = None):
+        backend = SQLiteCacheBackend(path) if path else None
+        self.cache = ResponseCache(max_entries=max_entries, ttl=DEFAULT_UPDATE_PERIOD, backend=backend)
+        self.update_periods = {**UPDATE_PERIODS, **(update_periods or {})}
+
+    def _period(self, section: str) -> int:
+        return self.update_periods.get(section, DEFAULT_UPDATE_PERIOD)
+
+    def key(self, endpoint: str, coords: Dict[str, float], section: str, fields: List[str],
+            now: Optional[float] = None) -> str:
+        """Build the cache key of a section for the current update bucket."""
+        bucket = int((time.time() if now is None else now) // self._period(section))
+        return "|".join([
+            endpoint,
+            f"{coords['latitude']:.{COORDINATE_PRECISION}f}",
+            f"{coords['longitude']:.{COORDINATE_PRECISION}f}",
+            section,
+            ",".join(sorted(fields)),
+            str(bucket),
+        ])
+
+    def ttl(self, section: str, now: Optional[float] = None) -> float:
+        """Seconds until the next update boundary of a section."""
+        period = self._period(section)
+        now = time.time() if now is None else now
+        return period - now % period
+
+    def get(self, endpoint: str, coords: Dict[str, float], section: str, fields: List[str]) -> Optional[Any]:
+        """Return a cached section, or None on a miss."""
+        return self.cache.get(self.key(endpoint, coords, section, fields))
+
+    def set(self, endpoint: str, coords: Dict[str, float], section: str, fields: List[str], value: Any) -> None:
+        """Cache a section until the end of its update bucket."""
+        now = time.time()
+        self.cache.set(self.key(endpoint, coords, section, fields, now), value, ttl=self.ttl(section, now))
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current hit rate."""
+        return self.cache.stats()
+
+    def close(self) -> None:
+        self.cache.close()
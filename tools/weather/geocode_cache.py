@@ -0,0 +1,135 @@
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GEOCODE_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "owl", "geocode.sqlite3")
+
+# Locations given as "lat,lon" need no geocoding
+COORDINATES = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$")
+
+
+def normalize_location(location: str) -> str:
+    """Normalize a location name for caching (case, spacing and comma spacing)."""
+    return re.sub(r"\s*,\s*", ",", " ".join(location.split())).casefold()
+
+
+def parse_coordinates(location: str) -> Optional[Dict[str, float]]:
+    """Parse a "lat,lon" location, or return None if it is a place name."""
+    match = COORDINATES.match(location)
+    if not match:
+        return None
+    latitude, longitude = float(match.group(1)), float(match.group(2))
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        return None
+    return {"latitude": latitude, "longitude": longitude}
+
+
+class GeocodeCache:
+    """Persistent cache of location names to coordinates.
+
+    Lookups are served from memory; every entry is also written to SQLite so
+    the cache survives restarts and is shared by processes using the same
+    file. Locations the geocoder could not find are remembered for
+    ``negative_ttl`` seconds so they are not looked up again right away.
+
+    Args:
+        path: Path of the SQLite database file, or None for memory only
+            (default: ~/.cache/owl/geocode.sqlite3)
+        ttl: Seconds an entry stays valid, or None to never expire
+        negative_ttl: Seconds a "not found" result is remembered
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_GEOCODE_CACHE, ttl: Optional[float] = None,
+                 negative_ttl: float = 86400):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries: Dict[str, Tuple[Optional[Dict[str, float]], float]] = {}
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.misses = 0
+        if path:
+            try:
+                self._open(path)
+            except sqlite3.Error as e:
+                logger.warning(f"Geocode cache {path} unavailable, using memory only: {str(e)}")
+                self._conn = None
+
+    def _open(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS geocode_cache ("
+            "location TEXT PRIMARY KEY, latitude REAL, longitude REAL, expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+        now = time.time()
+        rows = self._conn.execute(
+            "SELECT location, latitude, longitude, expires_at FROM geocode_cache WHERE expires_at > ?",
+            (now,),
+        ).fetchall()
+        for location, latitude, longitude, expires_at in rows:
+            coords = None if latitude is None else {"latitude": latitude, "longitude": longitude}
+            self._entries[location] = (coords, expires_at)
+
+    def lookup(self, location: str) -> Tuple[bool, Optional[Dict[str, float]]]:
+        """
+        Look up a location.
+
+        Args:
+            location: Location name
+
+        Returns:
+            ``(found, coordinates)``; coordinates is None for a cached "not found"
+        """
+        key = normalize_location(location)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.time():
+                self.hits += 1
+                return True, entry[0]
+            self.misses += 1
+        return False, None
+
+    def store(self, location: str, coords: Optional[Dict[str, float]]) -> None:
+        """
+        Cache the coordinates of a location (None when it was not found).
+
+        Args:
+            location: Location name
+            coords: Dict with latitude and longitude, or None
+        """
+        key = normalize_location(location)
+        ttl = self.ttl if coords is not None else self.negative_ttl
+        expires_at = float("inf") if ttl is None else time.time() + ttl
+        with self._lock:
+            self._entries[key] = (coords, expires_at)
+            if self._conn is None:
+                return
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO geocode_cache (location, latitude, longitude, expires_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, coords and coords["latitude"], coords and coords["longitude"], expires_at),
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Geocode cache write failed: {str(e)}")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache size and hit counts."""
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -1,18 +1,126 @@
+import asyncio
 import logging
 from typing import Dict, List, Optional, Union
 from datetime import datetime
-import requests
+from urllib.parse import urlparse
 from ..common.base_client import BaseClient
+from .forecast_cache import ForecastCache
+from .geocode_cache import GeocodeCache, normalize_location, parse_coordinates
 
 logger = logging.getLogger(__name__)
 
+GEOCODE_URL = "https://nominatim.openstreetmap.org/search"
+AIR_QUALITY_URL = "https://air-quality-api.open-meteo.com/v1/air-quality"
+
+CURRENT_FIELDS = ["temperature_2m", "relative_humidity_2m", "apparent_temperature", "weather_code", "wind_speed_10m"]
+DAILY_FIELDS = ["temperature_2m_max", "temperature_2m_min", "weather_code", "wind_speed_10m_max"]
+AIR_QUALITY_FIELDS = ["pm10", "pm2_5", "carbon_monoxide", "nitrogen_dioxide", "sulphur_dioxide", "ozone"]
+
+# Nominatim's usage policy allows at most one request per second
+GEOCODE_INTERVAL = 1.0
+
+# Locations per Open-Meteo request in batch fetches
+BATCH_SIZE = 50
+
 class WeatherClient(BaseClient):
     """Client for fetching and processing weather data."""
     
-    def __init__(self):
-        """Initialize the weather client."""
-        super().__init__()
+    def __init__(self, geocode_cache: Optional[GeocodeCache] = None,
+                 forecast_cache: Optional[ForecastCache] = None, timeout: float = 10.0):
+        """
+        Initialize the weather client.
+        
+        Args:
+            geocode_cache: Cache of location coordinates (default: the persistent
+                cache in ~/.cache/owl/geocode.sqlite3)
+            forecast_cache: Cache of forecast and air quality data (default: an
+                in-memory cache; pass ForecastCache(path=...) to share it on disk)
+            timeout: Timeout in seconds for a single request
+        """
+        super().__init__(timeout=timeout, headers={"User-Agent": "OWL-WeatherClient/1.0"})
         self.base_url = "https://api.open-meteo.com/v1"
+        self.air_quality_url = AIR_QUALITY_URL
+        self.owns_geocode_cache = geocode_cache is None
+        self.geocode_cache = geocode_cache or GeocodeCache()
+        self.owns_forecast_cache = forecast_cache is None
+        self.forecast_cache = forecast_cache or ForecastCache()
+        self._geocode_pending: Dict[str, asyncio.Future] = {}
+        # Shared by every client of the registry, so the policy holds process-wide
+        self.resources.set_rate_limit(urlparse(GEOCODE_URL).hostname, 1 / GEOCODE_INTERVAL, 1)
+        
+    async def cleanup(self) -> None:
+        """Clean up the client's caches and return its shared resources."""
+        if self.owns_geocode_cache:
+            self.geocode_cache.close()
+        if self.owns_forecast_cache:
+            self.forecast_cache.close()
+        await super().cleanup()
+        
+    async def _make_request(self, url: str, params: Optional[Dict] = None) -> Union[Dict, List]:
+        """
+        Make a GET request and return the JSON response.
+        
+        Args:
+            url: The URL to request
+            params: Query parameters; list values are sent comma separated
+            
+        Returns:
+            The decoded JSON response
+        """
+        query = {
+            key: ",".join(str(item) for item in value) if isinstance(value, (list, tuple)) else str(value)
+            for key, value in (params or {}).items()
+        }
+        return await self._fetch_json(url, params=query)
+        
+    async def _fetch_sections(self, url: str, coords: List[Dict],
+                              sections: Dict[str, List[str]]) -> List[Dict]:
+        """
+        Fetch Open-Meteo response sections for several coordinates.
+        
+        Sections still in the forecast cache are not requested again; the
+        coordinates missing any section are fetched with one request and their
+        sections cached until the provider's next update.
+        
+        Args:
+            url: The Open-Meteo endpoint
+            coords: Coordinates to fetch
+            sections: Variables to request per section, e.g. {"current": CURRENT_FIELDS}
+            
+        Returns:
+            One dict per coordinate mapping each section to its data
+        """
+        results: List[Dict] = [{} for _ in coords]
+        missing = []
+        for i, c in enumerate(coords):
+            for section, fields in sections.items():
+                cached = self.forecast_cache.get(url, c, section, fields)
+                if cached is None:
+                    missing.append(i)
+                    break
+                results[i][section] = cached
+        if not missing:
+            return results
+        
+        params = {
+            "latitude": [coords[i]["latitude"] for i in missing],
+            "longitude": [coords[i]["longitude"] for i in missing],
+            "timezone": "auto",
+            **sections
+        }
+        response = await self._make_request(url, params=params)
+        # Open-Meteo returns a list for several coordinates and an object for one
+        responses = response if isinstance(response, list) else [response]
+        for i, data in zip(missing, responses):
+            for section, fields in sections.items():
+                if data.get(section) is not None:
+                    self.forecast_cache.set(url, coords[i], section, fields, data[section])
+                    results[i][section] = data[section]
+        return results
+        
+    def cache_stats(self) -> Dict[str, Dict]:
+        """Return hit/miss counters of the geocode and forecast caches."""
+        return {"geocode": self.geocode_cache.stats(), "forecast": self.forecast_cache.stats()}
         
     async def get_current_weather(self, location: str) -> Dict:
         """
@@ -30,28 +138,14 @@ class WeatherClient(BaseClient):
             if not coords:
                 return None
                 
-            params = {
-                "latitude": coords["latitude"],
-                "longitude": coords["longitude"],
-                "current": ["temperature_2m", "relative_humidity_2m", "apparent_temperature", "weather_code", "wind_speed_10m"],
-                "timezone": "auto"
-            }
-            
-            response = await self._make_request(
+            response, = await self._fetch_sections(
                 f"{self.base_url}/forecast",
-                params=params
+                [coords],
+                {"current": CURRENT_FIELDS}
             )
             
             if response:
-                return {
-                    "location": location,
-                    "temperature": response["current"]["temperature_2m"],
-                    "feels_like": response["current"]["apparent_temperature"],
-                    "humidity": response["current"]["relative_humidity_2m"],
-                    "description": self._get_weather_description(response["current"]["weather_code"]),
-                    "wind_speed": response["current"]["wind_speed_10m"],
-                    "timestamp": datetime.now().isoformat()
-                }
+                return self._parse_current(location, response)
             return None
             
         except Exception as e:
@@ -74,29 +168,14 @@ class WeatherClient(BaseClient):
             if not coords:
                 return None
                 
-            params = {
-                "latitude": coords["latitude"],
-                "longitude": coords["longitude"],
-                "daily": ["temperature_2m_max", "temperature_2m_min", "weather_code", "wind_speed_10m_max"],
-                "timezone": "auto"
-            }
-            
-            response = await self._make_request(
+            response, = await self._fetch_sections(
                 f"{self.base_url}/forecast",
-                params=params
+                [coords],
+                {"daily": DAILY_FIELDS}
             )
             
             if response:
-                forecasts = []
-                for i in range(min(days, len(response["daily"]["time"]))):
-                    forecasts.append({
-                        "timestamp": response["daily"]["time"][i],
-                        "temperature_max": response["daily"]["temperature_2m_max"][i],
-                        "temperature_min": response["daily"]["temperature_2m_min"][i],
-                        "description": self._get_weather_description(response["daily"]["weather_code"][i]),
-                        "wind_speed": response["daily"]["wind_speed_10m_max"][i]
-                    })
-                return forecasts
+                return self._parse_daily(response, days)
             return None
             
         except Exception as e:
@@ -118,43 +197,188 @@ class WeatherClient(BaseClient):
             if not coords:
                 return None
                 
-            params = {
-                "latitude": coords["latitude"],
-                "longitude": coords["longitude"],
-                "current": ["pm10", "pm2_5", "carbon_monoxide", "nitrogen_dioxide", "sulphur_dioxide", "ozone"],
-                "timezone": "auto"
-            }
-            
-            response = await self._make_request(
-                f"{self.base_url}/air-quality",
-                params=params
+            response, = await self._fetch_sections(
+                self.air_quality_url,
+                [coords],
+                {"current": AIR_QUALITY_FIELDS}
             )
             
             if response:
-                components = response["current"]
-                aqi = self._calculate_aqi(components)
-                return {
-                    "location": location,
-                    "aqi": aqi,
-                    "aqi_level": self._get_aqi_level(aqi),
-                    "components": {
-                        "pm10": components["pm10"],
-                        "pm2_5": components["pm2_5"],
-                        "co": components["carbon_monoxide"],
-                        "no2": components["nitrogen_dioxide"],
-                        "so2": components["sulphur_dioxide"],
-                        "o3": components["ozone"]
-                    },
-                    "timestamp": datetime.now().isoformat()
-                }
+                return self._parse_air_quality(location, response)
             return None
             
         except Exception as e:
             logger.error(f"Error fetching air quality: {str(e)}")
             return None
             
+    async def get_weather_report(self, location: str, days: int = 5,
+                                 include_air_quality: bool = True) -> Optional[Dict]:
+        """
+        Get current weather, forecast and air quality for a location at once.
+        
+        The location is geocoded once; current and daily data come from a single
+        forecast request that runs concurrently with the air quality request.
+        
+        Args:
+            location: City name or coordinates (lat,lon)
+            days: Number of days to forecast (max 5)
+            include_air_quality: Whether to fetch air quality data
+            
+        Returns:
+            Dict with current, forecast and air_quality entries (None for parts
+            that could not be fetched), or None if the location is unknown
+        """
+        try:
+            coords = await self._get_coordinates(location)
+            if not coords:
+                return None
+            reports = await self._fetch_reports([location], [coords], days, include_air_quality)
+            return reports[0]
+        except Exception as e:
+            logger.error(f"Error fetching weather report: {str(e)}")
+            return None
+            
+    async def get_weather_batch(self, locations: List[str], days: int = 5,
+                                include_air_quality: bool = True) -> Dict[str, Optional[Dict]]:
+        """
+        Get weather reports for many locations.
+        
+        Locations are geocoded concurrently (cached ones without a request), and
+        Open-Meteo is asked for up to BATCH_SIZE locations per request.
+        
+        Args:
+            locations: City names or coordinates (lat,lon)
+            days: Number of days to forecast (max 5)
+            include_air_quality: Whether to fetch air quality data
+            
+        Returns:
+            Dict mapping each location to its report as returned by
+            get_weather_report (None for unknown locations)
+        """
+        locations = list(dict.fromkeys(locations))
+        results: Dict[str, Optional[Dict]] = {location: None for location in locations}
+        try:
+            coords = await asyncio.gather(*(self._get_coordinates(location) for location in locations))
+            found = [(location, c) for location, c in zip(locations, coords) if c]
+            chunks = [found[i:i + BATCH_SIZE] for i in range(0, len(found), BATCH_SIZE)]
+            reports = await asyncio.gather(*(
+                self._fetch_reports(
+                    [location for location, _ in chunk], [c for _, c in chunk], days, include_air_quality
+                )
+                for chunk in chunks
+            ))
+            for chunk, chunk_reports in zip(chunks, reports):
+                for (location, _), report in zip(chunk, chunk_reports):
+                    results[location] = report
+        except Exception as e:
+            logger.error(f"Error fetching weather batch: {str(e)}")
+        return results
+            
+    async def _fetch_reports(self, locations: List[str], coords: List[Dict], days: int,
+                             include_air_quality: bool) -> List[Dict]:
+        """Fetch forecast and air quality data for several coordinates, one request each at most."""
+        calls = [self._fetch_sections(
+            f"{self.base_url}/forecast",
+            coords,
+            {"current": CURRENT_FIELDS, "daily": DAILY_FIELDS}
+        )]
+        if include_air_quality:
+            calls.append(self._fetch_sections(
+                self.air_quality_url,
+                coords,
+                {"current": AIR_QUALITY_FIELDS}
+            ))
+        responses = await asyncio.gather(*calls, return_exceptions=True)
+        
+        def per_location(response, name: str) -> List[Optional[Dict]]:
+            if isinstance(response, Exception):
+                logger.error(f"Error fetching {name}: {str(response)}")
+                return [None] * len(coords)
+            return response
+        
+        forecasts = per_location(responses[0], "forecast")
+        air_quality = per_location(responses[1], "air quality") if include_air_quality else [None] * len(coords)
+        reports = []
+        for location, c, forecast, aq in zip(locations, coords, forecasts, air_quality):
+            reports.append({
+                "location": location,
+                "latitude": c["latitude"],
+                "longitude": c["longitude"],
+                "current": self._parse_current(location, forecast) if forecast else None,
+                "forecast": self._parse_daily(forecast, days) if forecast else None,
+                "air_quality": self._parse_air_quality(location, aq) if aq else None
+            })
+        return reports
+            
+    def _parse_current(self, location: str, response: Dict) -> Dict:
+        """Build the current weather dict from a forecast response."""
+        return {
+            "location": location,
+            "temperature": response["current"]["temperature_2m"],
+            "feels_like": response["current"]["apparent_temperature"],
+            "humidity": response["current"]["relative_humidity_2m"],
+            "description": self._get_weather_description(response["current"]["weather_code"]),
+            "wind_speed": response["current"]["wind_speed_10m"],
+            "timestamp": datetime.now().isoformat()
+        }
+        
+    def _parse_daily(self, response: Dict, days: int) -> List[Dict]:
+        """Build the daily forecast list from a forecast response."""
+        forecasts = []
+        for i in range(min(days, len(response["daily"]["time"]))):
+            forecasts.append({
+                "timestamp": response["daily"]["time"][i],
+                "temperature_max": response["daily"]["temperature_2m_max"][i],
+                "temperature_min": response["daily"]["temperature_2m_min"][i],
+                "description": self._get_weather_description(response["daily"]["weather_code"][i]),
+                "wind_speed": response["daily"]["wind_speed_10m_max"][i]
+            })
+        return forecasts
+        
+    def _parse_air_quality(self, location: str, response: Dict) -> Dict:
+        """Build the air quality dict from an air quality response."""
+        components = response["current"]
+        aqi = self._calculate_aqi(components)
+        return {
+            "location": location,
+            "aqi": aqi,
+            "aqi_level": self._get_aqi_level(aqi),
+            "components": {
+                "pm10": components["pm10"],
+                "pm2_5": components["pm2_5"],
+                "co": components["carbon_monoxide"],
+                "no2": components["nitrogen_dioxide"],
+                "so2": components["sulphur_dioxide"],
+                "o3": components["ozone"]
+            },
+            "timestamp": datetime.now().isoformat()
+        }
+            
     async def _get_coordinates(self, location: str) -> Optional[Dict]:
-        """Get coordinates for a location name."""
+        """
+        Get coordinates for a location name.
+        
+        "lat,lon" locations are parsed directly; names are served from the
+        geocode cache, and concurrent lookups of the same uncached name share
+        one Nominatim request.
+        """
+        coords = parse_coordinates(location)
+        if coords:
+            return coords
+        found, coords = self.geocode_cache.lookup(location)
+        if found:
+            return coords
+        
+        key = normalize_location(location)
+        pending = self._geocode_pending.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._geocode(location))
+            self._geocode_pending[key] = pending
+            pending.add_done_callback(lambda _: self._geocode_pending.pop(key, None))
+        return await asyncio.shield(pending)
+        
+    async def _geocode(self, location: str) -> Optional[Dict]:
+        """Look up a location with Nominatim, at most once per GEOCODE_INTERVAL."""
         try:
             # Use OpenStreetMap Nominatim API for geocoding
             params = {
@@ -162,17 +386,16 @@ class WeatherClient(BaseClient):
                 "format": "json",
                 "limit": 1
             }
-            response = await self._make_request(
-                "https://nominatim.openstreetmap.org/search",
-                params=params
-            )
+            response = await self._make_request(GEOCODE_URL, params=params)
             
+            coords = None
             if response and len(response) > 0:
-                return {
+                coords = {
                     "latitude": float(response[0]["lat"]),
                     "longitude": float(response[0]["lon"])
                 }
-            return None
+            self.geocode_cache.store(location, coords)
+            return coords
             
         except Exception as e:
             logger.error(f"Error getting coordinates: {str(e)}")